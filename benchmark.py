@@ -0,0 +1,359 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Benchmarks the step engines across board sizes, patterns and
+generation counts.
+
+For each case, reports cells/second, generations/second, the peak
+memory of the process running it up to the end of the setup, how much
+the peak grew while running, and the net growth in the number of
+objects the garbage collector tracks (the container objects, such as
+lists and dicts, created minus those freed; ints and strings are not
+tracked, so this is not a count of allocations). Results are written
+as JSON, and can be compared against a baseline file written by
+an earlier run, reporting any case slower than the baseline by more
+than the tolerance.
+
+    python benchmark.py --output results.json
+    python benchmark.py --sizes 80,1024 --engines bit,sparse \\
+            --baseline baseline.json --output results.json
+
+With --startup, only checks that a fresh interpreter imports board and
+steps a board within STARTUP_BUDGET seconds, e.g. to catch a heavy
+import (NumPy, Tkinter) creeping into the headless path:
+
+    python benchmark.py --startup
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import platform
+import random
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import board
+import sparse_board
+
+
+# Engines, each a function taking the initial board and returning
+# functions to advance the board by n generations, and to clean up.
+
+def _board_engine(initial):
+    state = [initial]
+    def run(generations):
+        for i in xrange(generations):
+            state[0] = board.next_board(state[0])
+    return run, lambda: None
+
+def _block_engine(initial):
+    import block_table
+    block_table.get_table()
+    state = [initial]
+    def run(generations):
+        for i in xrange(generations):
+            state[0] = block_table.next_board(state[0])
+    return run, lambda: None
+
+def _numpy_engine(initial):
+    import numpy_board
+    state = [numpy_board.to_array(initial)]
+    def run(generations):
+        for i in xrange(generations):
+            state[0] = numpy_board.next_array(state[0])
+    return run, lambda: None
+
+def _sparse_engine(initial):
+    rows, cols = len(initial), len(initial[0])
+    state = [sparse_board.to_live_set(initial)]
+    def run(generations):
+        for i in xrange(generations):
+            state[0] = sparse_board.next_live(state[0], rows, cols)
+    return run, lambda: None
+
+def _bit_engine(initial):
+    import bit_board
+    state = [bit_board.from_board(initial)]
+    def run(generations):
+        for i in xrange(generations):
+            state[0] = bit_board.next_board(state[0])
+    return run, lambda: None
+
+def _count_engine(initial):
+    import count_board
+    packed = count_board.from_board(initial)
+    def run(generations):
+        for i in xrange(generations):
+            count_board.step_board(packed)
+    return run, lambda: None
+
+def _hashlife_engine(initial):
+    import hashlife
+    state = [initial]
+    def run(generations):
+        state[0] = hashlife.advance(state[0], generations)
+    return run, lambda: None
+
+def _tiled_engine(initial):
+    import tiled_board
+    tiled = tiled_board.TiledBoard(initial)
+    def run(generations):
+        for i in xrange(generations):
+            tiled.step()
+    return run, lambda: None
+
+def _parallel_engine(initial):
+    import parallel_board
+    parallel = parallel_board.ParallelBoard(initial)
+    def run(generations):
+        for i in xrange(generations):
+            parallel.step()
+    return run, parallel.close
+
+ENGINES = {
+        'board': _board_engine,
+        'block': _block_engine,
+        'numpy': _numpy_engine,
+        'sparse': _sparse_engine,
+        'bit': _bit_engine,
+        'count': _count_engine,
+        'hashlife': _hashlife_engine,
+        'tiled': _tiled_engine,
+        'parallel': _parallel_engine,
+        }
+
+
+# Initial patterns, each a function taking the board size and a
+# random.Random, and returning the board.
+
+def soup_pattern(rows, cols, rand):
+    """ Random soup, half the cells alive.
+    """
+    return [[int(rand.random() < 0.5) for j in xrange(cols)]
+            for i in xrange(rows)]
+
+def gliders_pattern(rows, cols, rand):
+    """ Gliders spaced 32 cells apart, in random orientations.
+    """
+    new_board = board.create_board(rows, cols)
+    glider = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+    for top in xrange(8, rows - 8, 32):
+        for left in xrange(8, cols - 8, 32):
+            construct = glider
+            if rand.random() < 0.5:
+                construct = construct[::-1]
+            if rand.random() < 0.5:
+                construct = [row[::-1] for row in construct]
+            board.load_construct(new_board, construct, top, left)
+    return new_board
+
+def ash_pattern(rows, cols, rand):
+    """ Dense still life ash: a block or a beehive in each 6x6 square.
+    """
+    new_board = board.create_board(rows, cols)
+    block = [[1, 1], [1, 1]]
+    beehive = [[0, 1, 1, 0], [1, 0, 0, 1], [0, 1, 1, 0]]
+    for top in xrange(1, rows - 4, 6):
+        for left in xrange(1, cols - 4, 6):
+            construct = block if rand.random() < 0.5 else beehive
+            board.load_construct(new_board, construct, top, left)
+    return new_board
+
+PATTERNS = {
+        'soup': soup_pattern,
+        'gliders': gliders_pattern,
+        'ash': ash_pattern,
+        }
+
+
+def _peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_case(engine, size, pattern, generations, seed=0):
+    """ Time one case in the current process, and return its results.
+    The dense initial board is dropped once the engine has built its own
+    state from it, and the peak memory is taken again after setting up,
+    so that rss_growth_kb is the memory the engine needs while running
+    rather than the input. The peak never goes down, so memory the
+    engine needs below the setup peak does not show up.
+    """
+    run, close = ENGINES[engine](PATTERNS[pattern](size, size,
+                                                   random.Random(seed)))
+    try:
+        gc.collect()
+        setup_rss = _peak_rss_kb()
+        gc.disable()
+        tracked_before = gc.get_count()[0]
+        start = time.time()
+        run(generations)
+        seconds = time.time() - start
+        tracked = gc.get_count()[0] - tracked_before
+        gc.enable()
+        rss_growth = _peak_rss_kb() - setup_rss
+    finally:
+        close()
+
+    seconds = max(seconds, 1e-9)
+    return {
+            'engine': engine,
+            'size': size,
+            'pattern': pattern,
+            'generations': generations,
+            'seconds': seconds,
+            'cells_per_second': size * size * generations / seconds,
+            'generations_per_second': generations / seconds,
+            'setup_peak_rss_kb': setup_rss,
+            'rss_growth_kb': rss_growth,
+            'gc_tracked_growth': tracked,
+            }
+
+
+def _run_case_child(queue, args):
+    try:
+        queue.put(run_case(*args))
+    except Exception as e:
+        queue.put({'error': repr(e),
+                   'import_error': isinstance(e, ImportError),
+                   'message': str(e)})
+
+
+def run_isolated(*args):
+    """ Run a case in a fresh process, so that its peak memory is not
+    mixed up with the other cases. Raises ImportError if the engine
+    cannot be imported there, as run_case would, and RuntimeError for
+    any other error.
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run_case_child,
+                                      args=(queue, args))
+    process.start()
+    result = queue.get()
+    process.join()
+    if 'error' in result:
+        if result['import_error']:
+            raise ImportError(result['message'])
+        raise RuntimeError(result['error'])
+    return result
+
+
+# Headless script timed by measure_startup, from a fresh interpreter, and
+# the time in seconds it should stay within
+STARTUP_CODE = 'import board; board.next_board(board.create_board(80, 80))'
+STARTUP_BUDGET = 0.5
+
+
+def measure_startup(code=STARTUP_CODE, repeat=5):
+    """ Time a fresh interpreter running code from this directory, and
+    return the fastest of repeat runs in seconds.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    for i in xrange(repeat):
+        start = time.time()
+        subprocess.check_call([sys.executable, '-c', code], cwd=directory)
+        times.append(time.time() - start)
+    return min(times)
+
+
+def case_key(result):
+    return (result['engine'], result['size'], result['pattern'],
+            result['generations'])
+
+
+def compare(results, baseline, tolerance=0.2):
+    """ Compare results with the results of a baseline run, returning
+    a list of (case key, baseline generations/second, new
+    generations/second) for every case slower than the baseline by more
+    than tolerance (as a fraction).
+    """
+    old = dict((case_key(result), result['generations_per_second'])
+               for result in baseline['results'])
+    regressions = []
+    for result in results['results']:
+        key = case_key(result)
+        if key in old and \
+                result['generations_per_second'] < old[key] * (1 - tolerance):
+            regressions.append((key, old[key],
+                                result['generations_per_second']))
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+            description="Benchmark the Game of Life step engines.")
+    parser.add_argument('--engines', default=','.join(sorted(ENGINES)))
+    parser.add_argument('--sizes', default='80,256,1024',
+            help="comma separated board sides, e.g. 80,1024,8192")
+    parser.add_argument('--patterns', default=','.join(sorted(PATTERNS)))
+    parser.add_argument('--generations', default='10',
+            help="comma separated generation counts")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--baseline', default=None,
+            help="results file of an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--no-isolate', action='store_true',
+            help="run every case in this process")
+    parser.add_argument('--startup', action='store_true',
+            help="only check the time to import board and take a step")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.startup:
+        seconds = measure_startup()
+        print 'startup: {0:.3f}s (budget {1:.3f}s)'.format(seconds,
+                                                           STARTUP_BUDGET)
+        if seconds > STARTUP_BUDGET:
+            sys.exit(1)
+        return
+    runner = run_case if args.no_isolate else run_isolated
+
+    results = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'results': [],
+            }
+    cases = [(size, pattern, generations)
+             for size in [int(size) for size in args.sizes.split(',')]
+             for pattern in args.patterns.split(',')
+             for generations in [int(generations) for generations
+                                 in args.generations.split(',')]]
+    for engine in args.engines.split(','):
+        for size, pattern, generations in cases:
+            try:
+                result = runner(engine, size, pattern, generations,
+                                args.seed)
+            except ImportError as e:
+                print '{0}: skipped ({1})'.format(engine, e)
+                break
+            results['results'].append(result)
+            print ('{engine:>8} {size:>5} {pattern:>7} '
+                   '{generations:>4} gens: '
+                   '{generations_per_second:10.2f} gens/s '
+                   '{cells_per_second:12.0f} cells/s '
+                   '{setup_peak_rss_kb:8d} KB '
+                   '+{rss_growth_kb:d} KB').format(**result)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for key, old, new in regressions:
+            print 'REGRESSION {0}: {1:.2f} -> {2:.2f} gens/s'.format(
+                    key, old, new)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Compact board representation, holding each row of the board as a
+single integer with one bit per cell (bit j set if column j is alive).
+The next generation is computed with bitwise adders over whole rows, so
+that every cell in a row is updated by the same few integer operations.
+
+Mirrors the functions of board.py, so that it can be used in its place,
+e.g. as the engine of main.App.
+"""
+
+import board
+
+
+class BitBoard(object):
+    """ Board of row_count rows of col_count cells, stored as a list
+    of row_count integers.
+    """
+    __slots__ = ('rows', 'col_count')
+
+    def __init__(self, rows, col_count):
+        self.rows = rows
+        self.col_count = col_count
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def row_count(self):
+        return len(self.rows)
+
+    def __eq__(self, other):
+        return isinstance(other, BitBoard) and \
+               self.col_count == other.col_count and \
+               self.rows == other.rows
+
+    def __ne__(self, other):
+        return not self == other
+
+
+def create_board(row_count, col_count):
+    """ Creates a board representation, row_count x col_count, with
+    each cell initialized to 0.
+    """
+    return BitBoard([0]*row_count, col_count)
+
+
+def from_board(board):
+    """ Converts a list of lists board into a BitBoard.
+    """
+    rows = []
+    for row in board:
+        value = 0
+        for j, cell in enumerate(row):
+            if cell:
+                value |= 1 << j
+        rows.append(value)
+    return BitBoard(rows, len(board[0]))
+
+
+def to_board(bit_board):
+    """ Converts a BitBoard into a list of lists board.
+    """
+    return [[(value >> j) & 1 for j in xrange(bit_board.col_count)]
+            for value in bit_board.rows]
+
+
+def load_construct(bit_board, construct, top_row=0, left_col=0):
+    """ Takes each live cell in construct and loads to board, setting
+    the top left based on the coordinates entered.
+    """
+    max_row, max_col = len(bit_board.rows), bit_board.col_count
+    con_row, con_col = len(construct), len(construct[0])
+    if max_row < con_row + top_row or \
+            max_col < con_col + left_col or \
+            top_row < 0 or \
+            left_col < 0:
+        raise IndexError
+
+    for i, row in enumerate(construct):
+        for j, cell in enumerate(row):
+            if cell:
+                bit_board.rows[i+top_row] |= 1 << (j+left_col)
+
+
+def get_coords(bit_board):
+    """ Takes board and yields the coord of each live cell
+    """
+    for i, value in enumerate(bit_board.rows):
+        j = 0
+        while value:
+            if value & 1:
+                yield (i, j)
+            value >>= 1
+            j += 1
+
+
+def _pad_row(value, col_count, boundary):
+    """ Returns the row shifted up by one bit, with the ghost cells
+    beyond its edges in bits 0 and col_count+1, following the boundary
+    mode (see board.py).
+    """
+    padded = value << 1
+    if boundary == board.TORUS:
+        padded |= (value >> (col_count-1)) & 1
+        padded |= (value & 1) << (col_count+1)
+    elif boundary == board.MIRROR:
+        padded |= value & 1
+        padded |= ((value >> (col_count-1)) & 1) << (col_count+1)
+    elif boundary != board.DEAD:
+        raise ValueError('unknown boundary mode: {0!r}'.format(boundary))
+    return padded
+
+
+def _rule_terms(rule):
+    """ Returns the rule as a list of (count, states), for each neighbor
+    count at which a cell is alive next: states is None if it is alive
+    whatever its state, or else the state (0 or 1) it must be in.
+    """
+    terms = []
+    for count in xrange(9):
+        if count in rule.birth and count in rule.survive:
+            terms.append((count, None))
+        elif count in rule.birth or count in rule.survive:
+            terms.append((count, int(count in rule.survive)))
+    return terms
+
+
+def next_board(bit_board, boundary=board.DEAD, rule=board.CONWAY):
+    """ Takes current board and returns new board with the next generation
+    state, following the same rules as board.next_board.
+    The neighbors of every cell in a row are added up at once as binary
+    numbers, one bit-plane per integer: first across each row (3 cells
+    for the rows above and below, 2 for the row itself), then down the
+    3 rows. With B3/S23, counts are kept modulo 8, as a count of 8 kills
+    a cell the same way a count of 0 does; other rules compare the full
+    count against each of the counts at which a cell is alive next.
+    Rows are padded with a ghost cell on each side, and a ghost row is
+    added above and below, following the boundary mode.
+    """
+    rows = bit_board.rows
+    col_count = bit_board.col_count
+    mask = (1 << col_count) - 1
+    terms = None if rule.table == board.CONWAY.table else _rule_terms(rule)
+
+    padded = [_pad_row(value, col_count, boundary) for value in rows]
+    if boundary == board.TORUS:
+        padded = [padded[-1]] + padded + [padded[0]]
+    elif boundary == board.MIRROR:
+        padded = [padded[0]] + padded + [padded[-1]]
+    else:
+        padded = [0] + padded + [0]
+
+    # Sum of the 3 horizontally adjacent cells of each row, as 2 bits
+    # (h0, h1), and of the 2 neighbors without the cell itself (p0, p1),
+    # shifted back down to drop the ghost cells
+    sums = []
+    for value in padded:
+        left, right = value << 1, value >> 1
+        p0, p1 = left ^ right, left & right
+        sums.append((((p0 ^ value) >> 1) & mask,
+                     ((p1 | (p0 & value)) >> 1) & mask,
+                     (p0 >> 1) & mask, (p1 >> 1) & mask))
+
+    new_rows = []
+    for i, value in enumerate(rows):
+        u0, u1 = sums[i][:2]
+        d0, d1 = sums[i+2][:2]
+        m0, m1 = sums[i+1][2:]
+
+        # Rows above plus rows below
+        x0, c0 = u0 ^ d0, u0 & d0
+        x1, x2 = u1 ^ d1 ^ c0, (u1 & d1) | (c0 & (u1 ^ d1))
+
+        # Plus the two horizontal neighbors
+        s0, k0 = x0 ^ m0, x0 & m0
+        s1, k1 = x1 ^ m1 ^ k0, (x1 & m1) | (k0 & (x1 ^ m1))
+        s2 = x2 ^ k1
+
+        if terms is None:
+            # Alive with 3 neighbors, or with 2 neighbors if already alive
+            new_rows.append(s1 & ~s2 & (s0 | value) & mask)
+            continue
+
+        # Cells whose count matches each count of the rule
+        bits = (s0, s1, s2, x2 & k1)
+        new_value = 0
+        for count, state in terms:
+            matches = mask
+            for k, bit in enumerate(bits):
+                matches &= bit if (count >> k) & 1 else ~bit
+            if state is not None:
+                matches &= value if state else ~value
+            new_value |= matches
+        new_rows.append(new_value & mask)
+
+    return BitBoard(new_rows, bit_board.col_count)
+
+
+def diff_boards(old_board, new_board):
+    """ Takes two boards of the same size and returns a list of coords
+    of the cells that became alive (births) and of those that became
+    dead (deaths), only looking at the bits that differ in each row.
+    """
+    births, deaths = [], []
+    for i, (old, new) in enumerate(zip(old_board.rows, new_board.rows)):
+        changed, j = old ^ new, 0
+        while changed:
+            if changed & 1:
+                if (new >> j) & 1:
+                    births.append((i, j))
+                else:
+                    deaths.append((i, j))
+            changed >>= 1
+            j += 1
+    return births, deaths
+
+
+def get_value(bit_board, row, col):
+    """ Get value of cell
+    """
+    check_inputs(bit_board, row, col)
+    return (bit_board.rows[row] >> col) & 1
+
+def set_alive(bit_board, row, col):
+    """ Set value of cell to alive
+    """
+    check_inputs(bit_board, row, col)
+    bit_board.rows[row] |= 1 << col
+
+def set_dead(bit_board, row, col):
+    """ Set value of cell to dead
+    """
+    check_inputs(bit_board, row, col)
+    bit_board.rows[row] &= ~(1 << col)
+
+def check_inputs(bit_board, row, col):
+    max_row, max_col = len(bit_board.rows), bit_board.col_count
+    if max_row <= row or \
+            max_col <= col or \
+            row < 0 or \
+            col < 0:
+                raise IndexError
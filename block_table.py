@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Board update by table lookup over blocks of cells.
+
+The 16 cells of a 4x4 block hold every neighbor of its central 2x2
+cells, so the next state of those 4 cells depends on the block alone.
+There are 2**16 blocks, so the next center of every block is computed
+once into a 65536 entry table (cached to a file in the user's cache
+directory, as building it takes a moment), and a board is then stepped
+one 2x2 square at a time, each by a single lookup of the 4x4 block
+around it, instead of adding up the neighbors of each cell.
+
+A block's cells are numbered column by column, bit col*4 + row of the
+table index, so that the 4 rows of a band of the board pack into one
+byte per 2 columns, and the index of each block is 2 bytes in a row.
+The center cells are bits 0, 1 (top row) and 2, 3 (bottom row) of the
+table entry.
+"""
+
+import array
+import binascii
+import hashlib
+import os
+import sys
+import tempfile
+
+import board
+
+# Directory the tables are cached in, one file per rule: private to the
+# user, so that no one else can plant a table there
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or
+                         os.path.join(os.path.expanduser('~'), '.cache'),
+                         'game_of_life')
+
+# First line of a cache file, followed by the table
+HEADER = 'block_table {0} {1}\n'
+
+# Translation tables from a table entry to each of its center cells
+CENTER_CELLS = [''.join(chr((value >> bit) & 1) for value in xrange(256))
+                for bit in xrange(4)]
+
+# Translation table from cells to hex digits, each cell taking 4 bits
+DIGITS = '01' + '\0' * 254
+
+# Tables already loaded or built, by rule notation
+_tables = {}
+
+
+def build_table(rule=board.CONWAY):
+    """ Returns the table of the next 2x2 center of every 4x4 block, as a
+    bytearray indexed by the bits of the block.
+    """
+    centers = []
+    for row, col in ((1, 1), (1, 2), (2, 1), (2, 2)):
+        mask = 0
+        for i in xrange(row-1, row+2):
+            for j in xrange(col-1, col+2):
+                if (i, j) != (row, col):
+                    mask |= 1 << (j*4 + i)
+        centers.append((col*4 + row, mask))
+
+    table = bytearray(1 << 16)
+    next_state = rule.table
+    for index in xrange(1 << 16):
+        value = 0
+        for bit, (position, mask) in enumerate(centers):
+            state = (index >> position) & 1
+            if next_state[state*9 + bin(index & mask).count('1')]:
+                value |= 1 << bit
+        table[index] = value
+    return table
+
+
+def cache_path(rule=board.CONWAY):
+    """ Path of the cache file of the table of rule.
+    """
+    name = rule.notation.replace('/', '_')
+    return os.path.join(CACHE_DIR, 'block_table_{0}.bin'.format(name))
+
+
+def _checksum(rule, table):
+    return hashlib.sha256(rule.notation + '\0' + str(table)).hexdigest()
+
+
+def _read_cache(rule, path):
+    """ Returns the table in the cache file at path, or None if there is
+    none, or it is not a whole table of rule with the right checksum.
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = f.readline()
+            table = bytearray(f.read())
+    except (IOError, OSError):
+        return None
+    if len(table) != 1 << 16 or \
+            header != HEADER.format(rule.notation, _checksum(rule, table)):
+        return None
+    return table
+
+
+def _write_cache(rule, table, path):
+    """ Write the table to the cache file at path, through a new private
+    file in the same directory, so that another process never reads a
+    partly written table. The cache is only a speed up, so failing to
+    write it is ignored.
+    """
+    directory = os.path.dirname(path)
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory, 0700)
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(HEADER.format(rule.notation, _checksum(rule, table)))
+                f.write(table)
+            os.rename(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except (IOError, OSError):
+        pass
+
+
+def get_table(rule=board.CONWAY, path=None):
+    """ Returns the table of rule, loading it from the cache file at path
+    (by default cache_path(rule)), or building it and writing the cache
+    file if there is none, or it is not a whole table of rule with the
+    checksum in its header.
+    """
+    if rule.notation in _tables:
+        return _tables[rule.notation]
+    path = path or cache_path(rule)
+
+    table = _read_cache(rule, path)
+    if table is None:
+        table = build_table(rule)
+        _write_cache(rule, table, path)
+
+    _tables[rule.notation] = table
+    return table
+
+
+def _row_value(row):
+    """ Returns a row of cells as an integer, cell j in bits 4j to 4j+3.
+    """
+    return int(str(bytearray(reversed(row)).translate(DIGITS)), 16)
+
+
+def _block_indices(band, byte_count):
+    """ Returns the table index of each block of a band of 4 rows, given
+    as an integer with cell row, col in bit col*4 + row: the 2 bytes from
+    each byte, read as little endian 16 bit integers.
+    """
+    packed = bytearray(binascii.unhexlify('{0:0{1}x}'.format(
+            band, 2 * (byte_count + byte_count % 2))))
+    packed.reverse()
+    indices = []
+    for start in (0, 1):
+        words = array.array('H', str(packed[start:] + '\0' * start))
+        if sys.byteorder == 'big':
+            words.byteswap()
+        indices.append(words)
+    return indices
+
+
+def next_board(current_board, boundary=board.DEAD, rule=board.CONWAY):
+    """ Drop-in replacement for board.next_board. The board is padded
+    with ghost cells following the boundary mode (see board.pad_board),
+    plus a row and a column of dead cells if needed to make whole blocks;
+    the cells of the board they step are dropped.
+    """
+    table = get_table(rule)
+    lookup = table.__getitem__
+    max_row, max_col = len(current_board), len(current_board[0])
+    block_cols = (max_col + 1) // 2
+
+    values = [_row_value(row) for row in board.pad_board(current_board,
+                                                         boundary)]
+    if max_row % 2:
+        values.append(0)
+
+    new_board = []
+    centers = bytearray(block_cols)
+    cells = bytearray(2 * block_cols)
+    for i in xrange(0, max_row, 2):
+        band = values[i] | (values[i+1] << 1) | (values[i+2] << 2) | \
+               (values[i+3] << 3)
+        even, odd = _block_indices(band, block_cols + 1)
+        centers[0::2] = bytearray(map(lookup, even[:(block_cols + 1) // 2]))
+        centers[1::2] = bytearray(map(lookup, odd[:block_cols // 2]))
+
+        for top in (0, 2):
+            cells[0::2] = centers.translate(CENTER_CELLS[top])
+            cells[1::2] = centers.translate(CENTER_CELLS[top + 1])
+            new_board.append(list(cells[:max_col]))
+    return new_board[:max_row]
@@ -5,8 +5,59 @@
 of the game board.
 """
 
+import collections
+import imp
+import importlib
 import itertools
 
+# Boundary modes, setting what lies beyond the edges of the board:
+# dead cells, the cells on the opposite edge (wrapping around as on a
+# torus), or the edge cells themselves (as if mirrored along the edge)
+DEAD = 'dead'
+TORUS = 'torus'
+MIRROR = 'mirror'
+BOUNDARIES = (DEAD, TORUS, MIRROR)
+
+# Life-like rule: the neighbor counts at which a dead cell is born and a
+# live cell survives, and the next state of a cell compiled into a table
+# indexed by state * 9 + alive neighbors
+Rule = collections.namedtuple('Rule', 'notation birth survive table')
+
+def parse_rule(notation):
+    """ Takes a rule in B/S notation, e.g. 'B3/S23' for Conway's Life,
+    'B36/S23' for HighLife or 'B2/S' for Seeds, and returns it as a Rule.
+    The S/B form used by some pattern files ('23/3') is accepted too.
+    Raises ValueError if notation is not a valid rule.
+    """
+    parts = notation.strip().upper().split('/')
+    if len(parts) != 2:
+        raise ValueError('invalid rule: {0!r}'.format(notation))
+    if parts[0].startswith('S') and parts[1].startswith('B'):
+        parts.reverse()
+    if parts[0].startswith('B') and parts[1].startswith('S'):
+        birth, survive = parts[0][1:], parts[1][1:]
+    else:
+        survive, birth = parts
+    digits = birth + survive
+    if digits and not digits.isdigit() or '9' in digits:
+        raise ValueError('invalid rule: {0!r}'.format(notation))
+
+    birth = frozenset(int(count) for count in birth)
+    survive = frozenset(int(count) for count in survive)
+    table = tuple(int(count in birth) for count in xrange(9)) + \
+            tuple(int(count in survive) for count in xrange(9))
+    notation = 'B{0}/S{1}'.format(''.join(map(str, sorted(birth))),
+                                  ''.join(map(str, sorted(survive))))
+    return Rule(notation, birth, survive, table)
+
+CONWAY = parse_rule('B3/S23')
+
+# One generation yielded by generations(): its number, the board (only
+# valid until the next generation is asked for), its population, and the
+# coords of the cells born and died since the last generation yielded
+Generation = collections.namedtuple('Generation',
+                                    'generation board population births deaths')
+
 def create_board(row_count, col_count):
     """ Creates a board representation, row_count x col_count, with 
     each cell initialized to 0.
@@ -38,34 +89,164 @@ def get_coords(construct):
             if cell:
                 yield (i, j)
 
-def next_board(board):
+def pad_board(board, boundary=DEAD):
+    """ Returns a copy of board with a border of one extra cell on each
+    side (ghost cells), set following the boundary mode.
+    """
+    max_col = len(board[0])
+    padded = [[0]*(max_col+2)]
+    padded.extend([0] + row + [0] for row in board)
+    padded.append([0]*(max_col+2))
+    fill_border(padded, boundary)
+    return padded
+
+def fill_border(padded, boundary=DEAD):
+    """ Sets the border cells of a padded board from the cells inside
+    it, following the boundary mode. Raises ValueError for an unknown
+    boundary mode.
+    """
+    if boundary == DEAD:
+        for row in padded:
+            row[0] = row[-1] = 0
+        padded[0][:] = padded[-1][:] = [0] * len(padded[0])
+    elif boundary == TORUS:
+        for row in padded[1:-1]:
+            row[0], row[-1] = row[-2], row[1]
+        padded[0][:], padded[-1][:] = padded[-2], padded[1]
+    elif boundary == MIRROR:
+        for row in padded[1:-1]:
+            row[0], row[-1] = row[1], row[-2]
+        padded[0][:], padded[-1][:] = padded[1], padded[-2]
+    else:
+        raise ValueError('unknown boundary mode: {0!r}'.format(boundary))
+
+def next_board(board, boundary=DEAD, rule=CONWAY):
     """ Takes current board and returns new board with the next generation
-    state, based on the following rules:
+    state, based on the following rules by default (see parse_rule for
+    others):
     1) If cell is alive, remains alive if 2 or 3 surrounding cells are alive,
     else the cell dies.
     2) If cell is dead, becomes alive if 3 surrounding cells are alive
     Surrounding cells are defined as the 8 cells horizontally, vertically 
     and diagonally adjacent.
-    Edges of the board are treated as "dead".
+    Cells beyond the edges of the board are set by the boundary mode,
+    "dead" by default. They are held in a padded copy of the board, so
+    that the neighbors of every cell can be added up without checking
+    the bounds.
     """
-    max_row, max_col = len(board), len(board[0])
-    new_board = create_board(max_row, max_col)
-
-    coords = itertools.product(xrange(max_row), xrange(max_col))
-    for cell_row, cell_col in coords:
-        surrounding_alive = sum_neighbors(cell_row, cell_col, board)
-        if board[cell_row][cell_col]:
-            if surrounding_alive in (2, 3):
-                new_board[cell_row][cell_col] = 1
-        else:
-            if surrounding_alive == 3:
-                new_board[cell_row][cell_col] = 1
+    new_board = create_board(len(board), len(board[0]))
+    return next_board_into(board, new_board, boundary, rule)
+
+def next_board_into(board, new_board, boundary=DEAD, rule=CONWAY,
+                    padded=None):
+    """ Same as next_board, but writes the next generation into new_board,
+    a board of the same size, and returns it. If given, padded is used
+    for the padded copy of board, instead of a new one (it must come from
+    pad_board on a board of the same size).
+    """
+    max_col = len(board[0])
+    if padded is None:
+        padded = pad_board(board, boundary)
+    else:
+        for row, padded_row in itertools.izip(board, padded[1:-1]):
+            padded_row[1:-1] = row
+        fill_border(padded, boundary)
+    table = rule.table
+
+    for i, new_row in enumerate(new_board):
+        above, current, below = padded[i], padded[i+1], padded[i+2]
+        for j in xrange(max_col):
+            new_row[j] = table[current[j+1] * 9 +
+                               above[j] + above[j+1] + above[j+2] +
+                               current[j] + current[j+2] +
+                               below[j] + below[j+1] + below[j+2]]
 
     return new_board
 
+def generations(initial, engine=None, every=1, boundary=DEAD, rule=CONWAY):
+    """ Lazily yields a Generation for the initial board and then for
+    every every-th generation after it, with the births and deaths since
+    the last one yielded.
+    Without an engine, two boards are kept and written into in turn, so
+    the board yielded is overwritten two steps later: copy it to keep it.
+    With an engine (a module mirroring this one, or with next_board over
+    list of lists boards), the boards are its own; an engine with
+    step_board (count_board.py) is stepped in place.
+    Nothing is computed until the next generation is asked for, so a slow
+    consumer just holds the stepping back rather than piling up boards.
+    Raises ValueError if every is less than 1.
+    """
+    if every < 1:
+        raise ValueError('every must be at least 1')
+    diff = getattr(engine, 'diff_boards', diff_boards)
+    coords = getattr(engine, 'get_coords', get_coords)
+    value = getattr(engine, 'get_value', get_value)
+
+    if engine is None:
+        front = [row[:] for row in initial]
+        back = create_board(len(initial), len(initial[0]))
+        padded = pad_board(initial, boundary)
+    else:
+        front = initial
+
+    population = sum(1 for coord in coords(front))
+    generation = 0
+    yield Generation(generation, front, population, [], [])
+
+    while True:
+        changed = set()
+        for step in xrange(every):
+            if engine is None:
+                next_board_into(front, back, boundary, rule, padded)
+                births, deaths = diff_boards(front, back)
+                front, back = back, front
+            elif hasattr(engine, 'step_board'):
+                births, deaths = engine.step_board(front, boundary=boundary,
+                                                   rule=rule)
+            else:
+                new_board = engine.next_board(front, boundary=boundary,
+                                              rule=rule)
+                births, deaths = diff(front, new_board)
+                front = new_board
+
+            population += len(births) - len(deaths)
+            if every > 1:
+                # A cell changed twice since the last yield is back as
+                # it was, so only cells changed an odd number of times
+                # are kept
+                changed.symmetric_difference_update(births)
+                changed.symmetric_difference_update(deaths)
+
+        if every > 1:
+            births = sorted(coord for coord in changed
+                            if value(front, *coord))
+            deaths = sorted(changed.difference(births))
+
+        generation += every
+        yield Generation(generation, front, population, births, deaths)
+
+def diff_boards(old_board, new_board):
+    """ Takes two boards of the same size, usually two consecutive
+    generations, and returns a list of coords of the cells that became
+    alive (births) and of those that became dead (deaths).
+    """
+    births, deaths = [], []
+    for i, (old_row, new_row) in enumerate(itertools.izip(old_board,
+                                                          new_board)):
+        if old_row == new_row:
+            continue
+        for j, (old, new) in enumerate(itertools.izip(old_row, new_row)):
+            if old != new:
+                if new:
+                    births.append((i, j))
+                else:
+                    deaths.append((i, j))
+    return births, deaths
+
 def sum_neighbors(cell_row, cell_col, board):
     """ Return sum of values of the 8 surrounding neighbors of a cell.
-    Same as the number of alive neighbors of the cell.
+    Same as the number of alive neighbors of the cell, with the edges of
+    the board treated as "dead".
     """
     max_row, max_col = len(board), len(board[0])
 
@@ -110,6 +291,62 @@ def check_inputs(board, row, col):
                 raise IndexError
 
 
+# Engine registry: the modules whose next_board is a drop-in replacement
+# for next_board (taking and returning list of lists boards), by name,
+# with the modules each needs beyond the standard library. Engines are
+# looked up without being imported, and only imported when first used,
+# so that e.g. NumPy is not loaded by a run which does not use it.
+ENGINES = {
+        'board': ('board', ()),
+        'block': ('block_table', ()),
+        'numpy': ('numpy_board', ('numpy',)),
+        'sparse': ('sparse_board', ()),
+        'tiled': ('tiled_board', ()),
+        'hashlife': ('hashlife', ()),
+        }
+
+# Engine names from fastest to slowest for a next_board call on a busy
+# board, as measured by benchmark.py
+FASTEST = ('block', 'numpy', 'board', 'tiled', 'sparse', 'hashlife')
+
+_available = {}
+
+def engine_available(name):
+    """ Whether the engine and the modules it needs can be found, without
+    importing them. Raises ValueError for an unknown engine.
+    """
+    if name not in ENGINES:
+        raise ValueError('unknown engine: {0!r}'.format(name))
+    if name not in _available:
+        module, requires = ENGINES[name]
+        try:
+            for module_name in (module,) + requires:
+                fileobj = imp.find_module(module_name)[0]
+                if fileobj is not None:
+                    fileobj.close()
+        except ImportError:
+            _available[name] = False
+        else:
+            _available[name] = True
+    return _available[name]
+
+def available_engines():
+    """ Names of the engines which can be used, fastest first.
+    """
+    return [name for name in FASTEST if engine_available(name)]
+
+def get_engine(name=None):
+    """ Returns the module of the named engine, importing it on first
+    use, or of the fastest engine available if name is None. Raises
+    ImportError if the engine cannot be used here.
+    """
+    if name is None:
+        name = available_engines()[0]
+    if not engine_available(name):
+        raise ImportError('engine {0!r} is not available'.format(name))
+    return importlib.import_module(ENGINES[name][0])
+
+
 def main():
     pass
 
@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Census of the objects left by random soups.
+
+Each soup is a square of random cells, seeded so that it can be
+generated again, run on an unbounded plane (see plane.py) until its
+population repeats itself with a period of at most max_period for a
+while. The final ash is split into objects, the groups of cells which
+touch each other at some point over max_period more generations, and
+each object is run on its own to find whether it is a still life, an
+oscillator or a spaceship, and with what period.
+Objects are counted under a code which is the same for every phase,
+rotation and reflection of the object, e.g. 'still:1:OO/OO' for a block.
+
+Soups are run across a pool of processes. Results are written as JSON,
+and results from several runs (e.g. over different seeds, or different
+machines) can be merged:
+
+    python census.py --soups 1000 --output census.json
+    python census.py --soups 1000 --seed 1000 --merge census.json \\
+            --output census.json
+"""
+
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import board
+import plane
+
+NEIGHBOR_OFFSETS = tuple((i, j) for i in (-1, 0, 1) for j in (-1, 0, 1)
+                         if (i, j) != (0, 0))
+
+# The 8 rotations and reflections of a coord
+TRANSFORMS = (lambda row, col: (row, col),
+              lambda row, col: (row, -col),
+              lambda row, col: (-row, col),
+              lambda row, col: (-row, -col),
+              lambda row, col: (col, row),
+              lambda row, col: (col, -row),
+              lambda row, col: (-col, row),
+              lambda row, col: (-col, -row))
+
+# Common objects, named in the census output
+KNOWN_OBJECTS = {
+        'block': 'OO/OO',
+        'beehive': '.OO./O..O/.OO.',
+        'loaf': '.OO./O..O/.O.O/..O.',
+        'boat': 'OO./O.O/.O.',
+        'ship': 'OO./O.O/.OO',
+        'tub': '.O./O.O/.O.',
+        'pond': '.OO./O..O/O..O/.OO.',
+        'long boat': 'OO../O.O./.O.O/..O.',
+        'barge': '.O../O.O./.O.O/..O.',
+        'mango': '.OO../O..O./.O..O/..OO.',
+        'blinker': 'OOO',
+        'toad': '.OOO/OOO.',
+        'beacon': 'OO../OO../..OO/..OO',
+        'glider': '.O./..O/OOO',
+        'lightweight spaceship': '.O..O/O..../O...O/OOOO.',
+        }
+
+def make_soup(seed, size=16, density=0.5):
+    """ Return the size x size soup of the given seed, as a list of lists
+    board with each cell alive with probability density.
+    """
+    rand = random.Random(seed)
+    return [[int(rand.random() < density) for j in xrange(size)]
+            for i in xrange(size)]
+
+
+def normalize(coords):
+    """ Return the coords translated so that the smallest row and col
+    are 0, as a sorted tuple, and the translation (top, left).
+    """
+    top = min(row for row, col in coords)
+    left = min(col for row, col in coords)
+    return tuple(sorted((row - top, col - left) for row, col in coords)), \
+           (top, left)
+
+
+def canonical(coords):
+    """ Return the smallest of the normalized coords of the 8 rotations
+    and reflections of coords, so that every orientation of an object
+    gives the same result.
+    """
+    return min(normalize([transform(row, col) for row, col in coords])[0]
+               for transform in TRANSFORMS)
+
+
+def to_text(coords):
+    """ Return normalized coords as plaintext rows joined by '/'.
+    """
+    rows = max(row for row, col in coords) + 1
+    cols = max(col for row, col in coords) + 1
+    cells = [['.'] * cols for i in xrange(rows)]
+    for row, col in coords:
+        cells[row][col] = 'O'
+    return '/'.join(''.join(row) for row in cells)
+
+
+def components(coords):
+    """ Split coords into groups of coords connected through neighbors.
+    Returns a list of lists of coords.
+    """
+    remaining = set(coords)
+    groups = []
+    while remaining:
+        stack = [remaining.pop()]
+        group = []
+        while stack:
+            row, col = stack.pop()
+            group.append((row, col))
+            for d_row, d_col in NEIGHBOR_OFFSETS:
+                coord = (row + d_row, col + d_col)
+                if coord in remaining:
+                    remaining.remove(coord)
+                    stack.append(coord)
+        groups.append(group)
+    return groups
+
+
+def split_objects(current, max_period=30, rule=board.CONWAY):
+    """ Split the live cells of a stable plane into objects. Cells of
+    different phases of an oscillator or spaceship need not touch, so
+    the cells are grouped by the components of every cell alive over the
+    next max_period generations. Returns a list of lists of coords.
+    """
+    live = set(plane.get_coords(current))
+    seen = set(live)
+    for generation in xrange(max_period):
+        current = plane.next_plane(current, rule)
+        seen.update(plane.get_coords(current))
+    return [objects for objects in
+            ([coord for coord in group if coord in live]
+             for group in components(seen))
+            if objects]
+
+
+def classify(coords, max_period=30, rule=board.CONWAY):
+    """ Run an object on its own until it repeats, up to a translation,
+    and return (kind, period, code). The code is kind:period:pattern,
+    with the pattern being the canonical form of the phase of the object
+    which sorts first, so that it is the same whatever the phase and
+    orientation of the object.
+    """
+    start, (top, left) = normalize(coords)
+    phases = [start]
+    current = plane.from_coords(coords)
+    for generation in xrange(1, max_period+1):
+        current = plane.next_plane(current, rule)
+        new_coords = list(plane.get_coords(current))
+        if not new_coords:
+            break
+        cells, offset = normalize(new_coords)
+        if cells == start:
+            if offset == (top, left):
+                kind = 'still' if generation == 1 else 'oscillator'
+            else:
+                kind = 'spaceship'
+            pattern = min(canonical(phase) for phase in phases)
+            return kind, generation, '{0}:{1}:{2}'.format(
+                    kind, generation, to_text(pattern))
+        phases.append(cells)
+    return 'unknown', 0, 'unknown:0:' + to_text(canonical(start))
+
+
+def _is_periodic(populations, max_period, window):
+    """ Whether the last window populations repeat with a period of at
+    most max_period.
+    """
+    if len(populations) < window + max_period:
+        return False
+    for period in xrange(1, max_period+1):
+        if all(populations[-i] == populations[-i-period]
+               for i in xrange(1, window+1)):
+            return True
+    return False
+
+
+def run_soup(seed, size=16, density=0.5, rule=board.CONWAY, max_period=30,
+             max_generations=5000, cache=None):
+    """ Run the soup of the given seed until it stabilizes, and return
+    (Counter of object codes, generations run, whether it stabilized).
+    Soups which never stabilize (e.g. growing forever) have no objects
+    counted. cache maps canonical object patterns to their codes, to skip
+    classifying objects already seen.
+    """
+    if cache is None:
+        cache = {}
+    current = plane.create_board(size, size)
+    plane.load_construct(current, make_soup(seed, size, density))
+
+    window = 2 * max_period
+    populations = [plane.population(current)]
+    stabilized = False
+    generation = 0
+    while generation < max_generations:
+        current = plane.next_plane(current, rule)
+        generation += 1
+        populations.append(plane.population(current))
+        if generation % 10 == 0 and \
+                _is_periodic(populations, max_period, window):
+            stabilized = True
+            break
+
+    counts = collections.Counter()
+    if not stabilized:
+        return counts, generation, stabilized
+    for group in split_objects(current, max_period, rule):
+        key = canonical(group)
+        if key not in cache:
+            cache[key] = classify(group, max_period, rule)[2]
+        counts[cache[key]] += 1
+    return counts, generation, stabilized
+
+
+# Classification cache of each worker process
+_cache = {}
+
+
+def _run_task(task):
+    seed, options = task
+    return run_soup(seed, options['size'], options['density'],
+                    board.parse_rule(options['rule']),
+                    options['max_period'], options['max_generations'],
+                    _cache)
+
+
+def census(seeds, size=16, density=0.5, rule=board.CONWAY, max_period=30,
+           max_generations=5000, jobs=None):
+    """ Run the soups of the given seeds across a pool of jobs processes
+    (all cores by default, or in this process if jobs is 1), and return
+    the result as a dict, ready to be written as JSON. The seeds of the
+    soups which did not stabilize are listed, to look into separately.
+    """
+    options = {'size': size, 'density': density, 'rule': rule.notation,
+               'max_period': max_period, 'max_generations': max_generations}
+    tasks = [(seed, options) for seed in seeds]
+
+    start = time.time()
+    if jobs == 1:
+        results = map(_run_task, tasks)
+    else:
+        pool = multiprocessing.Pool(jobs)
+        try:
+            results = pool.map(_run_task, tasks, chunksize=8)
+        finally:
+            pool.close()
+            pool.join()
+
+    counts = collections.Counter()
+    generations, unstabilized = 0, []
+    for (seed, options), (soup_counts, soup_generations, stabilized) in \
+            zip(tasks, results):
+        counts.update(soup_counts)
+        generations += soup_generations
+        if not stabilized:
+            unstabilized.append(seed)
+
+    return {
+            'rule': rule.notation,
+            'size': size,
+            'density': density,
+            'soups': len(tasks),
+            'seeds': [list(seed_range) for seed_range in _ranges(seeds)],
+            'seconds': time.time() - start,
+            'generations': generations,
+            'unstabilized': unstabilized,
+            'counts': dict(counts),
+            }
+
+
+def _ranges(seeds):
+    """ Return sorted integer seeds as a list of [start, end) ranges.
+    """
+    ranges = []
+    for seed in sorted(seeds):
+        if ranges and ranges[-1][1] == seed:
+            ranges[-1][1] = seed + 1
+        else:
+            ranges.append([seed, seed + 1])
+    return ranges
+
+
+def merge(first, second):
+    """ Return the result of both censuses, which must be of soups of the
+    same rule, size and density, and of different seeds (so that no soup
+    is counted twice), raising ValueError otherwise.
+    """
+    for key in ('rule', 'size', 'density'):
+        if first[key] != second[key]:
+            raise ValueError('cannot merge censuses of different {0}'.format(
+                    key))
+    first_seeds = set(seed for seed_range in first['seeds']
+                      for seed in xrange(*seed_range))
+    second_seeds = set(seed for seed_range in second['seeds']
+                       for seed in xrange(*seed_range))
+    if first_seeds & second_seeds:
+        raise ValueError('cannot merge censuses sharing seeds {0}'.format(
+                _ranges(first_seeds & second_seeds)))
+    counts = collections.Counter(first['counts'])
+    counts.update(second['counts'])
+
+    merged = dict(first)
+    merged.update({
+            'soups': first['soups'] + second['soups'],
+            'seeds': _ranges(first_seeds | second_seeds),
+            'seconds': first['seconds'] + second['seconds'],
+            'generations': first['generations'] + second['generations'],
+            'unstabilized': sorted(first['unstabilized'] +
+                                   second['unstabilized']),
+            'counts': dict(counts),
+            })
+    return merged
+
+
+def object_names(rule=board.CONWAY, max_period=30):
+    """ Return a dict of object code -> name for the known objects.
+    """
+    names = {}
+    for name, text in KNOWN_OBJECTS.iteritems():
+        coords = [(i, j) for i, row in enumerate(text.split('/'))
+                  for j, cell in enumerate(row) if cell == 'O']
+        names[classify(coords, max_period, rule)[2]] = name
+    return names
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+            description="Count the objects left by random soups.")
+    parser.add_argument('--soups', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0,
+            help="seed of the first soup; soups use consecutive seeds")
+    parser.add_argument('--size', type=int, default=16)
+    parser.add_argument('--density', type=float, default=0.5)
+    parser.add_argument('--rule', type=board.parse_rule, default='B3/S23')
+    parser.add_argument('--max-period', type=int, default=30)
+    parser.add_argument('--max-generations', type=int, default=5000)
+    parser.add_argument('--jobs', type=int, default=None,
+            help="processes to run soups in (default: cores)")
+    parser.add_argument('--output', default='census.json')
+    parser.add_argument('--merge', default=None,
+            help="results file of an earlier census to add to")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    result = census(xrange(args.seed, args.seed + args.soups), args.size,
+                    args.density, args.rule, args.max_period,
+                    args.max_generations, args.jobs)
+    print '{0} soups in {1:.1f}s ({2:.1f} soups/s)'.format(
+            result['soups'], result['seconds'],
+            result['soups'] / max(result['seconds'], 1e-9))
+
+    if args.merge and os.path.exists(args.merge):
+        with open(args.merge) as f:
+            result = merge(json.load(f), result)
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+
+    names = object_names(args.rule, args.max_period)
+    for code, count in sorted(result['counts'].iteritems(),
+                              key=lambda item: -item[1])[:20]:
+        print '{0:8d}  {1}'.format(count, names.get(code, code))
+
+if __name__ == '__main__':
+    main()
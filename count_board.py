@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Board keeping the number of alive neighbors of every cell alongside
+the cells, updated incrementally across generations.
+
+Only the cells next to a birth or a death can have a different count,
+and only those cells, or the cells that changed themselves, can change
+in the next generation. So each step only looks at the cells touched by
+the changes of the last step, and then updates the counts around the
+cells it changed.
+
+Cells and counts are held in flat lists with a border of 2 extra cells
+on each side, so that the neighbors of any cell (or of the ghost copy
+of an edge cell beyond the board, see sparse_board.ghost_cells) can be
+reached by fixed offsets without checking bounds.
+
+Mirrors the functions of board.py, so that it can be used in its place,
+e.g. as the engine of main.App; step_board advances a board in place.
+"""
+
+import board
+import sparse_board
+
+
+class CountBoard(object):
+    """ Board of row_count x col_count cells with their neighbor counts,
+    following the boundary mode (see board.py).
+    """
+    def __init__(self, row_count, col_count, boundary=board.DEAD):
+        if boundary not in board.BOUNDARIES:
+            raise ValueError('unknown boundary mode: {0!r}'.format(boundary))
+        self.row_count, self.col_count = row_count, col_count
+        self.boundary = boundary
+
+        width = self._width = col_count + 4
+        size = (row_count + 4) * width
+        self._offsets = (-width-1, -width, -width+1, -1, 1,
+                         width-1, width, width+1)
+        self._cells = [0] * size
+        self._counts = [0] * size
+
+        # Whether each index is a cell of the board, and whether it is on
+        # an edge of the board (so has ghost copies beyond the board)
+        self._inside = bytearray(size)
+        self._edge = bytearray(size)
+        for row in xrange(row_count):
+            for col in xrange(col_count):
+                i = self._index(row, col)
+                self._inside[i] = 1
+                self._edge[i] = row in (0, row_count-1) or \
+                                col in (0, col_count-1)
+
+        # Indices whose cell or count changed since the last step; every
+        # cell has to be computed on the first step
+        self._touched = set(i for i in xrange(size) if self._inside[i])
+
+        # Number of cells whose next state the last step computed
+        self.cells_evaluated = 0
+
+    def __len__(self):
+        return self.row_count
+
+    def __eq__(self, other):
+        return isinstance(other, CountBoard) and \
+               (self.row_count, self.col_count) == \
+               (other.row_count, other.col_count) and \
+               self._cells == other._cells
+
+    def __ne__(self, other):
+        return not self == other
+
+    # Private methods
+
+    def _index(self, row, col):
+        return (row + 2) * self._width + col + 2
+
+    def _coord(self, i):
+        row, col = divmod(i, self._width)
+        return row - 2, col - 2
+
+    def _toggle(self, i):
+        """ Flip the cell at index i, and update the counts of its
+        neighbors and of the neighbors of its ghost copies.
+        """
+        cells, counts, touched = self._cells, self._counts, self._touched
+        cells[i] ^= 1
+        delta = 1 if cells[i] else -1
+
+        sources = [i]
+        if self._edge[i] and self.boundary != board.DEAD:
+            sources.extend(self._index(row, col) for row, col in
+                           sparse_board.ghost_cells([self._coord(i)],
+                                   self.row_count, self.col_count,
+                                   self.boundary))
+        for source in sources:
+            for offset in self._offsets:
+                counts[source + offset] += delta
+                touched.add(source + offset)
+        touched.add(i)
+
+    # Public methods
+
+    def copy(self):
+        new_board = CountBoard.__new__(CountBoard)
+        for name in ('row_count', 'col_count', 'boundary', '_width',
+                     '_offsets', '_inside', '_edge', 'cells_evaluated'):
+            setattr(new_board, name, getattr(self, name))
+        new_board._cells = self._cells[:]
+        new_board._counts = self._counts[:]
+        new_board._touched = set(self._touched)
+        return new_board
+
+    def set_boundary(self, boundary):
+        """ Change the boundary mode, recounting every neighbor.
+        """
+        coords = list(get_coords(self))
+        self.__init__(self.row_count, self.col_count, boundary)
+        for row, col in coords:
+            self._toggle(self._index(row, col))
+
+    def get(self, row, col):
+        check_inputs(self, row, col)
+        return self._cells[self._index(row, col)]
+
+    def set(self, row, col, value):
+        check_inputs(self, row, col)
+        i = self._index(row, col)
+        if self._cells[i] != value:
+            self._toggle(i)
+
+    def count(self, row, col):
+        """ Number of alive neighbors of a cell.
+        """
+        check_inputs(self, row, col)
+        return self._counts[self._index(row, col)]
+
+    def step(self, rule=board.CONWAY):
+        """ Advance the board by one generation in place, and return the
+        lists of coords of the cells born and died. The number of cells
+        looked at is kept in cells_evaluated.
+        """
+        table, cells, counts = rule.table, self._cells, self._counts
+        inside = self._inside
+
+        touched = [i for i in self._touched if inside[i]]
+        self.cells_evaluated = len(touched)
+        changed = [i for i in touched
+                   if table[cells[i]*9 + counts[i]] != cells[i]]
+        self._touched = set()
+        for i in changed:
+            self._toggle(i)
+
+        births = sorted(self._coord(i) for i in changed if cells[i])
+        deaths = sorted(self._coord(i) for i in changed if not cells[i])
+        return births, deaths
+
+
+def create_board(row_count, col_count):
+    """ Creates a board representation, row_count x col_count, with
+    each cell initialized to 0.
+    """
+    return CountBoard(row_count, col_count)
+
+
+def from_board(current_board, boundary=board.DEAD):
+    """ Converts a list of lists board into a CountBoard.
+    """
+    count_board = CountBoard(len(current_board), len(current_board[0]),
+                             boundary)
+    for row, col in board.get_coords(current_board):
+        count_board.set(row, col, 1)
+    return count_board
+
+
+def to_board(count_board):
+    """ Converts a CountBoard into a list of lists board.
+    """
+    new_board = board.create_board(count_board.row_count,
+                                   count_board.col_count)
+    for row, col in get_coords(count_board):
+        new_board[row][col] = 1
+    return new_board
+
+
+def load_construct(count_board, construct, top_row=0, left_col=0):
+    """ Takes each live cell in construct and loads to board, setting
+    the top left based on the coordinates entered.
+    """
+    max_row, max_col = count_board.row_count, count_board.col_count
+    con_row, con_col = len(construct), len(construct[0])
+    if max_row < con_row + top_row or \
+            max_col < con_col + left_col or \
+            top_row < 0 or \
+            left_col < 0:
+        raise IndexError
+
+    for row, col in board.get_coords(construct):
+        count_board.set(row+top_row, col+left_col, 1)
+
+
+def get_coords(count_board):
+    """ Takes board and yields the coord of each live cell
+    """
+    for row in xrange(count_board.row_count):
+        start = count_board._index(row, 0)
+        cells = count_board._cells[start:start+count_board.col_count]
+        for col, cell in enumerate(cells):
+            if cell:
+                yield (row, col)
+
+
+def step_board(count_board, boundary=board.DEAD, rule=board.CONWAY):
+    """ Advance board by one generation in place, following the same
+    rules as board.next_board, and return the lists of coords of the
+    cells born and died. The board's counts are redone first if it was
+    set up for another boundary mode.
+    """
+    if count_board.boundary != boundary:
+        count_board.set_boundary(boundary)
+    return count_board.step(rule)
+
+
+def next_board(count_board, boundary=board.DEAD, rule=board.CONWAY):
+    """ Takes current board and returns new board with the next generation
+    state, leaving the current board as it is. Copying the board costs
+    more than stepping it once few cells change; use step_board where the
+    current board is not needed anymore.
+    """
+    new_board = count_board.copy()
+    step_board(new_board, boundary, rule)
+    return new_board
+
+
+def diff_boards(old_board, new_board):
+    """ Takes two boards of the same size and returns a list of coords
+    of the cells that became alive (births) and of those that became
+    dead (deaths).
+    """
+    old, new = set(get_coords(old_board)), set(get_coords(new_board))
+    return sorted(new - old), sorted(old - new)
+
+
+def get_value(count_board, row, col):
+    """ Get value of cell
+    """
+    return count_board.get(row, col)
+
+def set_alive(count_board, row, col):
+    """ Set value of cell to alive, updating the counts around it
+    """
+    count_board.set(row, col, 1)
+
+def set_dead(count_board, row, col):
+    """ Set value of cell to dead, updating the counts around it
+    """
+    count_board.set(row, col, 0)
+
+def check_inputs(count_board, row, col):
+    max_row, max_col = count_board.row_count, count_board.col_count
+    if max_row <= row or \
+            max_col <= col or \
+            row < 0 or \
+            col < 0:
+                raise IndexError
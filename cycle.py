@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Detects when a board has died out, stopped changing, or started
+repeating itself.
+
+Each board state is summarised by a 64 bit hash: the XOR of a
+pseudo-random key for each live cell (Zobrist hashing). A birth or a
+death flips one key in or out, so the hash of the next generation is
+updated from the births and deaths alone, e.g. as returned by
+board.diff_boards, without going over the whole board again.
+Hashes of the most recent generations are kept, so a state that repeats
+within that window is found along with its period. Two different states
+sharing a hash is possible but vanishingly unlikely with 64 bits.
+"""
+
+import collections
+
+import board
+
+MASK = (1 << 64) - 1
+
+# Result of a detection: kind is 'extinct', 'still' or 'oscillator';
+# the state at generation start repeats every period generations.
+Cycle = collections.namedtuple('Cycle', 'kind period start')
+
+
+def cell_key(row, col, seed=0):
+    """ Return the pseudo-random 64 bit key of a cell, mixing its
+    coords with the splitmix64 finalizer.
+    """
+    x = (((row & 0xFFFFFFFF) << 32) | (col & 0xFFFFFFFF)) ^ seed
+    x = (x + 0x9E3779B97F4A7C15) & MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK
+    return x ^ (x >> 31)
+
+
+def board_hash(coords, seed=0):
+    """ Return the hash of a board state from the coords of its live
+    cells.
+    """
+    value = 0
+    for row, col in coords:
+        value ^= cell_key(row, col, seed)
+    return value
+
+
+class CycleDetector(object):
+    """ Keeps the hashes of the last history generations, and reports
+    the first cycle once the current generation repeats one of them.
+    """
+    def __init__(self, current_board, history=256, seed=0):
+        self._history = history
+        self._seed = seed
+        self.reset(board.get_coords(current_board))
+
+    def reset(self, coords, generation=0):
+        """ Start again from the board with the given live coords, e.g.
+        after it was edited.
+        """
+        coords = list(coords)
+        self.generation = generation
+        self.population = len(coords)
+        self.hash = board_hash(coords, self._seed)
+        self.cycle = None
+
+        self._order = collections.deque([(self.hash, generation)])
+        self._seen = {self.hash: generation}
+        self._check()
+
+    def update(self, births, deaths):
+        """ Move on to the next generation, given the coords of the cells
+        born and died. Returns the cycle found, if any.
+        """
+        for row, col in births:
+            self.hash ^= cell_key(row, col, self._seed)
+        for row, col in deaths:
+            self.hash ^= cell_key(row, col, self._seed)
+        self.population += len(births) - len(deaths)
+        self.generation += 1
+
+        if self.cycle is None:
+            if self.hash in self._seen:
+                start = self._seen[self.hash]
+                period = self.generation - start
+                self.cycle = Cycle('still' if period == 1 else 'oscillator',
+                                   period, start)
+
+            self._seen[self.hash] = self.generation
+            self._order.append((self.hash, self.generation))
+            if len(self._order) > self._history:
+                old_hash, old_generation = self._order.popleft()
+                if self._seen.get(old_hash) == old_generation:
+                    del self._seen[old_hash]
+            self._check()
+        return self.cycle
+
+    def _check(self):
+        if self.cycle is None and self.population == 0:
+            self.cycle = Cycle('extinct', 1, self.generation)
+
+    def remaining(self, target_generation):
+        """ Once a cycle is found, return how many more generations have
+        to be computed from the current one to reach the same state as
+        target_generation, which is fewer than the period.
+        """
+        if self.cycle is None:
+            raise ValueError('no cycle found yet')
+        return (target_generation - self.generation) % self.cycle.period
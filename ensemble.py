@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Runs many independent boards of the same size at once, e.g. for
+sweeps over thousands of random soups.
+
+The boards are stacked into one 3D array (board, row, col), and every
+board is advanced by the same few whole-array NumPy operations, so the
+Python overhead of a step is paid once for the whole batch rather than
+once per board. The population of each board is tracked every
+generation, and boards which die out, stop changing or start repeating
+themselves (within max_period generations) are taken out of the batch.
+"""
+
+import collections
+
+import numpy
+
+import board
+import cycle
+import numpy_board
+
+# Outcome of a board of the ensemble: its index in the boards given, the
+# cycle.Cycle it ended in (None if still running when the run stopped),
+# the generation it was taken out of the batch (or the run stopped), the
+# population of each generation up to then, and its final board.
+Outcome = collections.namedtuple('Outcome',
+                                 'index cycle generation populations board')
+
+
+def next_batch(batch, boundary=board.DEAD, rule=board.CONWAY):
+    """ Takes a 3D uint8 array of boards and returns a new array with the
+    next generation of every board, following the same rules as
+    board.next_board.
+    """
+    if boundary not in numpy_board.PAD_MODES:
+        raise ValueError('unknown boundary mode: {0!r}'.format(boundary))
+    count, max_row, max_col = batch.shape
+    padded = numpy.pad(batch, ((0, 0), (1, 1), (1, 1)),
+                       mode=numpy_board.PAD_MODES[boundary])
+
+    counts = numpy.zeros(batch.shape, dtype=numpy.uint8)
+    for i in xrange(3):
+        for j in xrange(3):
+            if (i, j) != (1, 1):
+                counts += padded[:, i:i+max_row, j:j+max_col]
+    table = numpy.array(rule.table, dtype=numpy.uint8)
+    return table[(batch != 0) * 9 + counts]
+
+
+class Ensemble(object):
+    """ Batch of boards advanced together, keeping the populations of
+    the boards still running and the outcomes of those taken out.
+    """
+    def __init__(self, boards, boundary=board.DEAD, rule=board.CONWAY,
+                 max_period=8):
+        self._boundary = boundary
+        self._rule = rule
+        self.batch = numpy.array(boards, dtype=numpy.uint8)
+        self.indices = numpy.arange(len(boards))
+        self.generation = 0
+        self.outcomes = {}
+
+        # Population of each generation of each board still running, and
+        # the last max_period generations, packed 8 cells per byte
+        self._populations = [[population] for population in
+                             self.batch.sum(axis=(1, 2)).tolist()]
+        self._past = collections.deque(maxlen=max_period)
+
+        self._finish(self.batch.sum(axis=(1, 2)) == 0,
+                     [cycle.Cycle('extinct', 1, 0)] * len(boards))
+        self._past.appendleft(numpy.packbits(self.batch, axis=2))
+
+    def __len__(self):
+        """ Number of boards still running.
+        """
+        return len(self.indices)
+
+    def _finish(self, finished, cycles):
+        """ Record the outcome of the boards flagged in finished, with
+        their cycles, and take them out of the batch.
+        """
+        if not finished.any():
+            return
+        for i in numpy.flatnonzero(finished):
+            index = int(self.indices[i])
+            self.outcomes[index] = Outcome(index, cycles[i], self.generation,
+                                           self._populations[i],
+                                           numpy_board.to_board(self.batch[i]))
+
+        running = ~finished
+        self.batch = self.batch[running]
+        self.indices = self.indices[running]
+        self._populations = [populations for populations, done
+                             in zip(self._populations, finished) if not done]
+        for k in xrange(len(self._past)):
+            self._past[k] = self._past[k][running]
+
+    def step(self):
+        """ Advance every board still running by one generation, and take
+        out those which died out or repeat one of the last max_period
+        generations.
+        """
+        if not len(self):
+            return
+        self.batch = next_batch(self.batch, self._boundary, self._rule)
+        self.generation += 1
+
+        populations = self.batch.sum(axis=(1, 2))
+        for history, population in zip(self._populations,
+                                       populations.tolist()):
+            history.append(population)
+
+        # The shortest period found for each board, 0 if none
+        packed = numpy.packbits(self.batch, axis=2)
+        periods = numpy.zeros(len(self), dtype=int)
+        for k, past in enumerate(self._past):
+            repeats = (packed == past).all(axis=(1, 2)) & (periods == 0)
+            periods[repeats] = k + 1
+
+        extinct = populations == 0
+        cycles = []
+        for period, dead in zip(periods.tolist(), extinct.tolist()):
+            if dead:
+                cycles.append(cycle.Cycle('extinct', 1, self.generation))
+            elif period:
+                cycles.append(cycle.Cycle(
+                        'still' if period == 1 else 'oscillator',
+                        period, self.generation - period))
+            else:
+                cycles.append(None)
+
+        finished = extinct | (periods > 0)
+        self._past.appendleft(packed)
+        self._finish(finished, cycles)
+
+    def run(self, generations):
+        """ Step until every board has finished, or for the given number
+        of generations, then record the boards still running as outcomes
+        without a cycle. Returns the list of outcomes, in the order of
+        the boards given.
+        """
+        for generation in xrange(generations):
+            if not len(self):
+                break
+            self.step()
+        self._finish(numpy.ones(len(self), dtype=bool), [None] * len(self))
+        return [self.outcomes[index] for index in sorted(self.outcomes)]
+
+
+def run_boards(boards, generations, boundary=board.DEAD, rule=board.CONWAY,
+               max_period=8):
+    """ Run each board for up to the given number of generations, as an
+    Ensemble, returning the list of outcomes.
+    """
+    return Ensemble(boards, boundary, rule, max_period).run(generations)
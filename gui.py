@@ -12,14 +12,23 @@ class GuiApp(ttk.Frame):
     """ Main GUI class that inherits from ttk.Frame
     """
     def __init__(self, app,
-                canvas_rows, canvas_cols, speed, generation):
+                canvas_rows, canvas_cols, speed, generation,
+                renderer='grid', threaded=False,
+                generations_per_second=0, frames_per_second=25,
+                stats=None, unbounded=False):
         ttk.Frame.__init__(self, app.root)
 
         self._app = app
-
-        # Create canvas to display game state and allow interactive edits
-        self.canvas = BoardCanvas(self, self._app, 
-                canvas_rows, canvas_cols)
+        self._stats = stats
+
+        # Create canvas to display game state and allow interactive edits;
+        # the image renderer is needed for boards much bigger than 80x80.
+        # If the board is unbounded, the canvas shows a window onto it
+        canvas_class = {'grid': BoardCanvas,
+                        'image': ImageBoardCanvas}[renderer]
+        self.canvas = canvas_class(self, self._app, 
+                canvas_rows, canvas_cols, unbounded)
+        self.canvas.stats = stats
         self.canvas.grid(row=0, column=0, rowspan=20, 
                 sticky=(N, W, S, E))
 
@@ -40,6 +49,33 @@ class GuiApp(ttk.Frame):
         self.speed_entry.configure(textvariable=self.speed_text)
         self.speed_entry.grid(row=1, column=2, sticky=(N, W))
 
+        # When the game runs in a background thread, computing and
+        # drawing have separate rates, replacing the tick length
+        if threaded:
+            self.speed_label.configure(text="Generations/s (0 = max):")
+            self.speed_text.set(generations_per_second)
+
+            self.fps_label = ttk.Label(self)
+            self.fps_label.configure(text="Frames/s:")
+            self.fps_label.grid(row=3, column=1, sticky=(N, W))
+
+            self.fps_text = StringVar()
+            self.fps_text.set(frames_per_second)
+
+            self.fps_entry = ttk.Entry(self)
+            self.fps_entry.configure(textvariable=self.fps_text)
+            self.fps_entry.grid(row=3, column=2, sticky=(N, W))
+
+            # Display measured rates
+            self.rate_str = 'Gen/s {0:7.1f}  Frames/s {1:5.1f}'
+            self.rate_text = StringVar()
+            self.update_rate_display(0, 0)
+
+            self.rate_label = ttk.Label(self)
+            self.rate_label.configure(textvariable=self.rate_text)
+            self.rate_label.grid(row=4, column=1, columnspan=2,
+                    sticky=(N, W))
+
         # Display current generation count
         self.gen_str = 'Generation #{0:6d}'
         self.gen_text = StringVar()
@@ -50,22 +86,84 @@ class GuiApp(ttk.Frame):
         self.gen_label.grid(row=2, column=1, columnspan=2,
                 sticky=(N, W))
 
+        # Create button and slider to go back through the generations
+        # kept in the history, while the game is not active
+        self.back_button = ttk.Button(self)
+        self.back_button.configure(text="Step Back",
+                command=self._app.step_back)
+        self.back_button.grid(row=5, column=1, columnspan=2,
+                sticky=(W, E))
+
+        self.scrub_scale = Scale(self, orient=HORIZONTAL,
+                from_=generation, to=generation,
+                command=lambda value: self._app.scrub_to(int(value)))
+        self.scrub_scale.grid(row=6, column=1, columnspan=2,
+                sticky=(W, E))
+
+        # If instrumented, display the stats of the simulation loop, and
+        # create button to save them to a file
+        if stats is not None:
+            self.stats_text = StringVar()
+            self.update_stats_display()
+
+            self.stats_label = ttk.Label(self)
+            self.stats_label.configure(textvariable=self.stats_text)
+            self.stats_label.grid(row=7, column=1, columnspan=2,
+                    sticky=(N, W))
+
+            self.dump_button = ttk.Button(self)
+            self.dump_button.configure(text="Save Stats",
+                    command=self._app.dump_stats)
+            self.dump_button.grid(row=8, column=1, columnspan=2,
+                    sticky=(W, E))
+
     def update_generation_display(self, generation):
         self.gen_text.set(self.gen_str.format(generation))
 
+    def update_history_display(self, first, last, generation):
+        self.scrub_scale.configure(from_=first, to=last)
+        self.scrub_scale.set(generation)
+
+    def update_stats_display(self):
+        self.stats_text.set('{0}\ncells {1}  items {2}/{3}/{4}'.format(
+                self._stats.summary(),
+                self._stats.counters['cells_evaluated'],
+                self._stats.counters['canvas_items_created'],
+                self._stats.counters['canvas_items_shown'],
+                self._stats.counters['canvas_items_hidden']))
+
+    def update_rate_display(self, generations_per_second, frames_per_second):
+        self.rate_text.set(self.rate_str.format(generations_per_second,
+                                                frames_per_second))
+
 
 
 class BoardCanvas(Canvas):
     """ Canvas widget to represent the game board graphically,
     and capture clicks to allow users to edit the state of the board
     if the game state is currently inactive.
+    If unbounded, the grid is a window of rows x cols cells onto a board
+    without edges, which the arrow keys move around.
     """
-    def __init__(self, parent, app, rows, cols):
+    # instrument.Stats counting the canvas items created, shown and
+    # hidden, if instrumented
+    stats = None
+
+    def __init__(self, parent, app, rows, cols, unbounded=False):
         Canvas.__init__(self, parent)
         self._app = app
         self._rows = rows
         self._cols = cols
 
+        # Rectangle item of each square of the grid, created the first
+        # time a cell in it becomes alive and then only shown or hidden,
+        # and the set of cells currently alive (shown or not)
+        self._items = [[None]*cols for x in xrange(rows)]
+        self._live = set()
+
+        # Board coords of the top left square of the grid
+        self._top, self._left = 0, 0
+
         # Set canvas size
         self._size = 820
         self.configure(width=self._size, height=self._size)
@@ -88,9 +186,18 @@ class BoardCanvas(Canvas):
 
 
         self.bind("<Button-1>", self._update_clicked_cell)
+        if unbounded:
+            self._bind_pan_keys()
 
     # Private methods
 
+    def _bind_pan_keys(self):
+        self.bind("<Button-1>", lambda event: self.focus_set(), add='+')
+        for key, rows, cols in (('<Up>', -1, 0), ('<Down>', 1, 0),
+                                ('<Left>', 0, -1), ('<Right>', 0, 1)):
+            self.bind(key, lambda event, rows=rows, cols=cols:
+                              self.pan(rows, cols))
+
     def _update_clicked_cell(self, event):
         """If the user clicked within the grid when the game state is
         inactive, 'flip' both the canvas representation and the data 
@@ -103,7 +210,7 @@ class BoardCanvas(Canvas):
             return
 
         row, col = self._get_coord(event)
-        if self.coords((row, col)):     # coords method inherited from Canvas
+        if (row, col) in self._live:
             self.display_cell_as_dead(row, col)
         else:
             self.display_cell_as_alive(row, col)
@@ -121,32 +228,255 @@ class BoardCanvas(Canvas):
         """ Convert the event's x,y to the row/col of the board
         """
         col, row = (event.x - 10) / self._block, (event.y - 10) / self._block
-        return row, col
+        return row + self._top, col + self._left
 
 
-    # Public methods
-
-    def display_cell_as_alive(self, row, col):
-        """ Color the specified square in the grid to red
+    def _show_square(self, row, col):
+        """ Color the square of the grid at row, col (counted from the top
+        left square) to red, if it is within the grid.
         """
-        self.create_rectangle(11 + self._block*col,
+        if not (0 <= row < self._rows and 0 <= col < self._cols):
+            return
+        item = self._items[row][col]
+        if item is None:
+            self._items[row][col] = self.create_rectangle(
+                              11 + self._block*col,
                               11 + self._block*row,
                               9  + self._block*(col+1),
                               9  + self._block*(row+1),
                               fill='red',
-                              tag=((row, col),'live'))
+                              tag='live')
+            if self.stats is not None:
+                self.stats.count('canvas_items_created')
+        else:
+            self.itemconfigure(item, state=NORMAL)
+            if self.stats is not None:
+                self.stats.count('canvas_items_shown')
+
+
+    def _hide_square(self, row, col):
+        """ Uncolor the square of the grid at row, col, if it is within
+        the grid.
+        """
+        if not (0 <= row < self._rows and 0 <= col < self._cols):
+            return
+        self.itemconfigure(self._items[row][col], state=HIDDEN)
+        if self.stats is not None:
+            self.stats.count('canvas_items_hidden')
+
+
+    # Public methods
+
+    def display_cell_as_alive(self, row, col):
+        """ Color the specified cell in the grid to red
+        """
+        if (row, col) in self._live:
+            return
+        self._live.add((row, col))
+        self._show_square(row - self._top, col - self._left)
 
 
     def display_cell_as_dead(self, row, col):
-        """ Uncolor the specified square in the grid
+        """ Uncolor the specified cell in the grid
+        """
+        if (row, col) not in self._live:
+            return
+        self._live.remove((row, col))
+        self._hide_square(row - self._top, col - self._left)
+
+
+    def pan(self, rows, cols):
+        """ Move the window shown by rows and cols cells.
         """
-        self.delete((row, col))
+        self.itemconfigure('live', state=HIDDEN)
+        self._top += rows
+        self._left += cols
+        for row, col in self._live:
+            self._show_square(row - self._top, col - self._left)
+
+
+    def apply_diff(self, births, deaths):
+        """ Update the grid from the lists of coords of cells which
+        became alive and dead since the last update.
+        """
+        for row, col in deaths:
+            self.display_cell_as_dead(row, col)
+        for row, col in births:
+            self.display_cell_as_alive(row, col)
 
 
     def clear_live(self):
         """ Clear all live cells on grid
         """
-        self.delete('live')
+        self.itemconfigure('live', state=HIDDEN)
+        if self.stats is not None:
+            self.stats.count('canvas_items_hidden', len(self._live))
+        self._live.clear()
+
+
+
+class ImageBoardCanvas(BoardCanvas):
+    """ Canvas widget showing the game board as a single image, with one
+    square of zoom x zoom pixels per cell, rather than one canvas item
+    per cell. Only the part of the board that fits in the canvas is
+    shown; the arrow keys pan across the board, and +/- zoom in and out.
+    Clicks edit the board as with BoardCanvas.
+    The pixels of the rows of cells that changed are built in Python and
+    written into the image with one put per run of consecutive rows, so
+    an update costs a few Tk calls however many cells changed.
+    """
+    LIVE_COLOR = '#ff0000'
+    DEAD_COLOR = '#ffffff'
+
+    def __init__(self, parent, app, rows, cols, unbounded=False):
+        Canvas.__init__(self, parent)
+        self._app = app
+        self._rows = rows
+        self._cols = cols
+        self._unbounded = unbounded
+
+        # Live cells, as a set of coords and as a dict of row -> set of
+        # cols, to build the pixels of a row
+        self._live = set()
+        self._live_rows = {}
+
+        # Set canvas size
+        self._size = 820
+        self.configure(width=self._size, height=self._size)
+
+        # Top left cell of the board shown, and pixels per side of a cell
+        self._top, self._left = 0, 0
+        self._zoom = max(1, (self._size - 20) // max(self._rows, self._cols))
+
+        self._image = PhotoImage(width=self._size-20, height=self._size-20)
+        self.create_image(10, 10, image=self._image, anchor=NW)
+        self._redraw()
+
+        self.bind("<Button-1>", self._update_clicked_cell)
+        self._bind_pan_keys()
+        self.bind('<plus>', lambda event: self.set_zoom(self._zoom+1))
+        self.bind('<minus>', lambda event: self.set_zoom(self._zoom-1))
+
+    # Private methods
+
+    def _visible_rows(self):
+        if self._unbounded:
+            return (self._size - 20) // self._zoom
+        return min(self._rows - self._top,
+                   (self._size - 20) // self._zoom)
+
+    def _visible_cols(self):
+        if self._unbounded:
+            return (self._size - 20) // self._zoom
+        return min(self._cols - self._left,
+                   (self._size - 20) // self._zoom)
+
+    def _row_data(self, row, col_count):
+        """ Pixel data of a row of cells shown, col_count cells wide:
+        zoom lines of pixels, each a {...} list of colors.
+        """
+        live = ' '.join([self.LIVE_COLOR] * self._zoom)
+        cells = [' '.join([self.DEAD_COLOR] * self._zoom)] * col_count
+        for col in self._live_rows.get(row, ()):
+            col -= self._left
+            if 0 <= col < col_count:
+                cells[col] = live
+        line = '{' + ' '.join(cells) + '}'
+        return ' '.join([line] * self._zoom)
+
+    def _put_rows(self, rows):
+        """ Repaint the given rows of cells of the board, those shown, with
+        one put per run of consecutive rows.
+        """
+        row_count, col_count = self._visible_rows(), self._visible_cols()
+        shown = sorted(row - self._top for row in rows
+                       if 0 <= row - self._top < row_count)
+        if not shown or col_count <= 0:
+            return
+
+        runs = [[shown[0], shown[0]]]
+        for row in shown[1:]:
+            if row == runs[-1][1] + 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        for first, last in runs:
+            data = ' '.join(self._row_data(self._top + row, col_count)
+                            for row in xrange(first, last+1))
+            self._image.put(data, to=(0, self._zoom * first))
+
+    def _redraw(self):
+        """ Repaint the whole image, after a pan or zoom.
+        """
+        self._image.blank()
+        self._put_rows(xrange(self._top, self._top + self._visible_rows()))
+
+    def _inside_range(self, event):
+        """ Determine if the event occurred within the part of the board
+        shown.
+        """
+        return 10 <= event.x < 10 + self._zoom * self._visible_cols() and \
+               10 <= event.y < 10 + self._zoom * self._visible_rows()
+
+    def _get_coord(self, event):
+        """ Convert the event's x,y to the row/col of the board
+        """
+        return (self._top + (event.y - 10) // self._zoom,
+                self._left + (event.x - 10) // self._zoom)
+
+    # Public methods
+
+    def pan(self, rows, cols):
+        """ Move the part of the board shown by rows and cols cells,
+        staying within the board unless it is unbounded.
+        """
+        self._top += rows
+        self._left += cols
+        if not self._unbounded:
+            self._top = max(0, min(self._top, self._rows - 1))
+            self._left = max(0, min(self._left, self._cols - 1))
+        self._redraw()
+
+    def set_zoom(self, zoom):
+        """ Set the number of pixels per side of a cell.
+        """
+        self._zoom = max(1, min(zoom, self._size - 20))
+        self._redraw()
+
+    def apply_diff(self, births, deaths):
+        """ Update the image from the lists of coords of cells which
+        became alive and dead since the last update, repainting the rows
+        they are in.
+        """
+        for row, col in deaths:
+            self._live.discard((row, col))
+            cols = self._live_rows.get(row)
+            if cols is not None:
+                cols.discard(col)
+                if not cols:
+                    del self._live_rows[row]
+        for row, col in births:
+            self._live.add((row, col))
+            self._live_rows.setdefault(row, set()).add(col)
+        self._put_rows(set(row for row, col in births) |
+                       set(row for row, col in deaths))
+
+    def display_cell_as_alive(self, row, col):
+        """ Color the specified cell in the image to red
+        """
+        self.apply_diff([(row, col)], [])
+
+    def display_cell_as_dead(self, row, col):
+        """ Uncolor the specified cell in the image
+        """
+        self.apply_diff([], [(row, col)])
+
+    def clear_live(self):
+        """ Clear all live cells in the image
+        """
+        self._live.clear()
+        self._live_rows.clear()
+        self._redraw()
 
 
 
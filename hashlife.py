@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" HashLife engine, able to jump a board many generations ahead in
+one call.
+
+The board is held as a quadtree of canonical nodes: a node of level k
+covers a 2^k x 2^k square and is made of 4 nodes of level k-1, with
+the single cells at level 0. Identical squares share a single node
+(hash-consing), and the future of each node's center is memoized, so
+repeated structure in space and in time is only computed once.
+"""
+
+import collections
+import weakref
+
+import board
+
+
+class Node(object):
+    """ A 2^level x 2^level square of cells, made of the four quadrants
+    nw, ne, sw and se. Nodes are never modified once created; always
+    create them with HashLife.join so that they stay canonical.
+    """
+    __slots__ = ('level', 'nw', 'ne', 'sw', 'se', 'population',
+                 '__weakref__')
+
+    def __init__(self, level, nw, ne, sw, se, population):
+        self.level = level
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.population = population
+
+
+DEAD = Node(0, None, None, None, None, 0)
+ALIVE = Node(0, None, None, None, None, 1)
+
+
+class HashLife(object):
+    """ Holds the canonical node table and the memoized result cache.
+    The node table only keeps weak references, so nodes that are not
+    used anymore are freed, while the result cache keeps at most
+    cache_size entries, evicting the least recently used.
+    Results depend on the rule, so each rule needs its own HashLife;
+    rules with B0 raise ValueError, as empty space would not stay empty.
+    """
+    def __init__(self, cache_size=500000, rule=board.CONWAY):
+        if 0 in rule.birth:
+            raise ValueError('rules with B0 are not supported')
+        self._table = rule.table
+        self._cache_size = cache_size
+        self._nodes = weakref.WeakValueDictionary()
+        self._results = collections.OrderedDict()
+        self._zeros = [DEAD]
+
+    # Node construction
+
+    def join(self, nw, ne, sw, se):
+        """ Return the canonical node made of the four quadrants.
+        """
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(nw.level+1, nw, ne, sw, se,
+                        nw.population + ne.population +
+                        sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+    def zero(self, level):
+        """ Return the empty node of the given level.
+        """
+        while len(self._zeros) <= level:
+            z = self._zeros[-1]
+            self._zeros.append(self.join(z, z, z, z))
+        return self._zeros[level]
+
+    def centre(self, node):
+        """ Return a node one level up with node at its center, and
+        empty space around it.
+        """
+        z = self.zero(node.level-1)
+        return self.join(self.join(z, z, z, node.nw),
+                         self.join(z, z, node.ne, z),
+                         self.join(z, node.sw, z, z),
+                         self.join(node.se, z, z, z))
+
+    def from_coords(self, coords, level, top=0, left=0):
+        """ Build the node of the given level whose top left cell is at
+        (top, left), from a list of the coords of its live cells.
+        """
+        if not coords:
+            return self.zero(level)
+        if level == 0:
+            return ALIVE
+
+        half = 1 << (level-1)
+        quadrants = ([], [], [], [])
+        for row, col in coords:
+            quadrants[(row >= top+half)*2 + (col >= left+half)].append(
+                    (row, col))
+        return self.join(
+                self.from_coords(quadrants[0], level-1, top, left),
+                self.from_coords(quadrants[1], level-1, top, left+half),
+                self.from_coords(quadrants[2], level-1, top+half, left),
+                self.from_coords(quadrants[3], level-1, top+half,
+                                 left+half))
+
+    def get_coords(self, node, top=0, left=0):
+        """ Yield the coords of each live cell in node, with its top
+        left cell at (top, left).
+        """
+        if node.population == 0:
+            return
+        if node.level == 0:
+            yield (top, left)
+            return
+
+        half = 1 << (node.level-1)
+        for quadrant, row, col in ((node.nw, top, left),
+                                   (node.ne, top, left+half),
+                                   (node.sw, top+half, left),
+                                   (node.se, top+half, left+half)):
+            for coord in self.get_coords(quadrant, row, col):
+                yield coord
+
+    # Evolution
+
+    def _life_4x4(self, node):
+        """ Return the level 1 center of a level 2 node, one generation
+        later.
+        """
+        cells = [[0]*4 for x in xrange(4)]
+        for row, col in self.get_coords(node):
+            cells[row][col] = 1
+
+        result = []
+        for row, col in ((1, 1), (1, 2), (2, 1), (2, 2)):
+            surrounding_alive = board.sum_neighbors(row, col, cells)
+            if self._table[cells[row][col] * 9 + surrounding_alive]:
+                result.append(ALIVE)
+            else:
+                result.append(DEAD)
+        return self.join(*result)
+
+    def successor(self, node, j):
+        """ Return the level-1 center of node after 2^j generations,
+        with j at most node.level-2.
+        """
+        if node.population == 0:
+            return node.nw
+
+        key = (node, j)
+        result = self._results.pop(key, None)
+        if result is None:
+            result = self._successor(node, j)
+            if len(self._results) >= self._cache_size:
+                self._results.popitem(last=False)
+        self._results[key] = result
+        return result
+
+    def _successor(self, node, j):
+        if node.level == 2:
+            return self._life_4x4(node)
+
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        join, successor = self.join, self.successor
+
+        # 9 overlapping sub-squares of half the size of node
+        c1 = successor(nw, j)
+        c2 = successor(join(nw.ne, ne.nw, nw.se, ne.sw), j)
+        c3 = successor(ne, j)
+        c4 = successor(join(nw.sw, nw.se, sw.nw, sw.ne), j)
+        c5 = successor(join(nw.se, ne.sw, sw.ne, se.nw), j)
+        c6 = successor(join(ne.sw, ne.se, se.nw, se.ne), j)
+        c7 = successor(sw, j)
+        c8 = successor(join(sw.ne, se.nw, sw.se, se.sw), j)
+        c9 = successor(se, j)
+
+        if j < node.level-2:
+            # The 9 results already hold the full 2^j generations, so
+            # only pick out their centers.
+            return join(join(c1.se, c2.sw, c4.ne, c5.nw),
+                        join(c2.se, c3.sw, c5.ne, c6.nw),
+                        join(c4.se, c5.sw, c7.ne, c8.nw),
+                        join(c5.se, c6.sw, c8.ne, c9.nw))
+
+        # Otherwise each half of the generations is done separately.
+        return join(successor(join(c1, c2, c4, c5), j),
+                    successor(join(c2, c3, c5, c6), j),
+                    successor(join(c4, c5, c7, c8), j),
+                    successor(join(c5, c6, c8, c9), j))
+
+    def _inner_population(self, node):
+        """ Population of the central 2^(level-2) square of node.
+        """
+        return (node.nw.se.se.population + node.ne.sw.sw.population +
+                node.sw.ne.ne.population + node.se.nw.nw.population)
+
+    def advance(self, node, top, left, generations):
+        """ Advance node, whose top left cell is at (top, left), by the
+        given number of generations on an unbounded plane.
+        Returns the resulting (node, top, left).
+        """
+        j = 0
+        while generations:
+            if generations & (1 << j):
+                # Pad until the pattern sits in the central quarter of a
+                # node big enough to hold its growth over 2^j generations
+                while node.level < j+3 or \
+                        self._inner_population(node) != node.population:
+                    shift = 1 << (node.level-1)
+                    node, top, left = self.centre(node), top-shift, left-shift
+
+                shift = 1 << (node.level-2)
+                node, top, left = self.successor(node, j), top+shift, left+shift
+                generations -= 1 << j
+            j += 1
+        return node, top, left
+
+
+# HashLife of each rule used through the module functions
+_engines = {}
+
+
+def get_engine(rule=board.CONWAY):
+    """ Return the shared HashLife of rule, creating it on first use.
+    """
+    if rule.notation not in _engines:
+        _engines[rule.notation] = HashLife(rule=rule)
+    return _engines[rule.notation]
+
+
+# Shortest jump worth rebuilding the quadtree for when the board has dead
+# edges: building it from the live cells and reading them back costs
+# about as much as stepping a small busy board ten times
+MIN_JUMP = 16
+
+
+def advance(current_board, generations, bounded=True, engine=None,
+            rule=board.CONWAY):
+    """ Takes current board and returns new board, generations later,
+    using engine if given, or else the shared HashLife of rule.
+    If bounded, the edges of the board are treated as "dead", giving the
+    same result as calling board.next_board generations times. While live
+    cells near the edges only allow jumps of less than MIN_JUMP
+    generations, the board is stepped with board.next_board instead, so
+    a board busy up to its edges runs about as fast as board.next_board
+    rather than gaining anything from HashLife.
+    Otherwise the board is treated as a window onto an unbounded plane,
+    and cells moving out of the window are kept in the simulation but
+    left out of the returned board.
+    """
+    if generations < 0:
+        raise ValueError
+    engine = engine or get_engine(rule)
+    max_row, max_col = len(current_board), len(current_board[0])
+    level = 3
+    while (1 << level) < max(max_row, max_col):
+        level += 1
+
+    if not bounded:
+        node = engine.from_coords(list(board.get_coords(current_board)),
+                                  level)
+        node, top, left = engine.advance(node, 0, 0, generations)
+        return _to_board(engine, node, top, left, max_row, max_col)
+
+    current = [row[:] for row in current_board]
+    while generations:
+        live_rows = [i for i, row in enumerate(current) if 1 in row]
+        if not live_rows:
+            break
+        # As long as no live cell can reach past the edges, the unbounded
+        # plane matches the board with dead edges. Cells spread by at
+        # most one cell per generation, so jump as far as the gap
+        # between the live cells and the edges allows.
+        gap = min(live_rows[0], max_row-1 - live_rows[-1],
+                  min(current[i].index(1) for i in live_rows),
+                  min(current[i][::-1].index(1) for i in live_rows))
+        if gap+1 < min(generations, MIN_JUMP):
+            current = board.next_board(current, rule=rule)
+            generations -= 1
+            continue
+
+        step = min(generations, gap+1)
+        coords = list(board.get_coords(current))
+        node, top, left = engine.advance(engine.from_coords(coords, level),
+                                         0, 0, step)
+        current = _to_board(engine, node, top, left, max_row, max_col)
+        generations -= step
+    return current
+
+
+def _to_board(engine, node, top, left, max_row, max_col):
+    """ Returns the max_row x max_col board of the cells of node, with
+    its top left cell at (top, left), which fall within the board.
+    """
+    new_board = board.create_board(max_row, max_col)
+    for row, col in engine.get_coords(node, top, left):
+        if 0 <= row < max_row and 0 <= col < max_col:
+            new_board[row][col] = 1
+    return new_board
+
+
+def next_board(current_board, boundary=board.DEAD, rule=board.CONWAY):
+    """ Drop-in replacement for board.next_board. Only dead edges are
+    supported, raising ValueError for the other boundary modes.
+    """
+    if boundary != board.DEAD:
+        raise ValueError('hashlife only supports dead edges')
+    return advance(current_board, 1, rule=rule)
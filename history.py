@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Keeps the recent generations of a game, so that it can be stepped
+back or scrubbed through.
+
+Generations are stored in segments: a segment starts with a full copy
+of the board (a keyframe, packed as one integer per row with live cells,
+from the leftmost live column, so that unbounded boards with negative
+coords such as plane.py can be kept too), followed by
+the births and deaths of each following generation. Going back to a
+generation rebuilds its segment's keyframe and replays the deltas up to
+it, so it never costs more than keyframe_interval generations of deltas.
+Once the history goes over its memory budget, the oldest segments are
+dropped.
+"""
+
+import bisect
+import collections
+
+import board
+
+# Rough memory use of the parts of a segment, in bytes
+KEYFRAME_ROW_BYTES = 40
+DELTA_BYTES = 150
+DELTA_CELL_BYTES = 80
+
+
+class _Segment(object):
+    __slots__ = ('start', 'rows', 'left', 'row_count', 'col_count',
+                 'deltas', 'size')
+
+    def __init__(self, start, rows, left, row_count, col_count):
+        self.start = start
+        self.rows = rows
+        self.left = left
+        self.row_count = row_count
+        self.col_count = col_count
+        self.deltas = []
+        width = max(value.bit_length() for value in rows.itervalues()) \
+                if rows else 0
+        self.size = (len(rows) + 1) * (KEYFRAME_ROW_BYTES + width // 8)
+
+    def end(self):
+        return self.start + len(self.deltas)
+
+
+class History(object):
+    """ Bounded history of the generations of a board, using about
+    max_bytes of memory at most (the newest segment is always kept).
+    """
+    def __init__(self, keyframe_interval=64, max_bytes=32*1024*1024,
+                 engine=board):
+        self._keyframe_interval = keyframe_interval
+        self._max_bytes = max_bytes
+        self._engine = engine
+        self._segments = collections.deque()
+        self._size = 0
+
+    def __len__(self):
+        return sum(len(segment.deltas) + 1 for segment in self._segments)
+
+    def first(self):
+        """ Oldest generation kept, or None if empty.
+        """
+        return self._segments[0].start if self._segments else None
+
+    def last(self):
+        """ Newest generation kept, or None if empty.
+        """
+        return self._segments[-1].end() if self._segments else None
+
+    def record(self, generation, current_board, births=None, deaths=None):
+        """ Add a generation, given its board and, if it directly follows
+        the last generation recorded, the births and deaths since then.
+        Any generations from this one on recorded earlier (e.g. before
+        stepping back and editing the board) are dropped.
+        """
+        self.truncate(generation - 1)
+
+        segment = self._segments[-1] if self._segments else None
+        if births is None or segment is None or \
+                segment.end() != generation - 1 or \
+                len(segment.deltas) + 1 >= self._keyframe_interval:
+            self._add_keyframe(generation, current_board)
+        else:
+            segment.deltas.append((tuple(births), tuple(deaths)))
+            size = DELTA_BYTES + DELTA_CELL_BYTES * (len(births) + len(deaths))
+            segment.size += size
+            self._size += size
+
+        while self._size > self._max_bytes and len(self._segments) > 1:
+            self._size -= self._segments.popleft().size
+
+    def _add_keyframe(self, generation, current_board):
+        coords = list(self._engine.get_coords(current_board))
+        left = min(col for row, col in coords) if coords else 0
+        rows = {}
+        for row, col in coords:
+            rows[row] = rows.get(row, 0) | 1 << (col - left)
+        if isinstance(current_board, list):
+            row_count, col_count = len(current_board), len(current_board[0])
+        else:
+            row_count = current_board.row_count
+            col_count = current_board.col_count
+
+        segment = _Segment(generation, rows, left, row_count, col_count)
+        self._segments.append(segment)
+        self._size += segment.size
+
+    def truncate(self, generation):
+        """ Drop every generation after the given one.
+        """
+        while self._segments and self._segments[-1].start > generation:
+            self._size -= self._segments.pop().size
+        if self._segments and self._segments[-1].end() > generation:
+            segment = self._segments[-1]
+            for births, deaths in segment.deltas[generation-segment.start:]:
+                size = DELTA_BYTES + \
+                       DELTA_CELL_BYTES * (len(births) + len(deaths))
+                segment.size -= size
+                self._size -= size
+            del segment.deltas[generation-segment.start:]
+
+    def floor(self, generation):
+        """ Newest generation kept up to the given one, or None if there
+        is none. Generations skipped when recording are not kept.
+        """
+        starts = [segment.start for segment in self._segments]
+        index = bisect.bisect_right(starts, generation) - 1
+        if index < 0:
+            return None
+        return min(generation, self._segments[index].end())
+
+    def nearest(self, generation):
+        """ Generation kept closest to the given one (the older one if
+        two are as close), or None if empty.
+        """
+        if not self._segments:
+            return None
+        before = self.floor(generation)
+        if before == generation:
+            return generation
+        starts = [segment.start for segment in self._segments]
+        index = bisect.bisect_right(starts, generation)
+        after = starts[index] if index < len(starts) else None
+        if before is None or \
+                after is not None and after - generation < generation - before:
+            return after
+        return before
+
+    def seek(self, generation):
+        """ Return a new board with the state of the given generation,
+        raising IndexError if it is not kept.
+        """
+        if not self._segments or \
+                not self.first() <= generation <= self.last():
+            raise IndexError
+
+        starts = [segment.start for segment in self._segments]
+        segment = self._segments[bisect.bisect_right(starts, generation) - 1]
+        if generation > segment.end():
+            # Skipped over when recording (e.g. by the threaded loop)
+            raise IndexError
+
+        engine = self._engine
+        new_board = engine.create_board(segment.row_count, segment.col_count)
+        for i, value in segment.rows.iteritems():
+            j = segment.left
+            while value:
+                if value & 1:
+                    engine.set_alive(new_board, i, j)
+                value >>= 1
+                j += 1
+
+        for births, deaths in segment.deltas[:generation-segment.start]:
+            for row, col in births:
+                engine.set_alive(new_board, row, col)
+            for row, col in deaths:
+                engine.set_dead(new_board, row, col)
+        return new_board
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Opt-in instrumentation of the simulation loop.
+
+A Stats object keeps the time taken by each phase of the recent steps
+(compute, diff and render), the total latency of the recent steps, and
+counters such as the number of cells evaluated or canvas items created.
+The code being measured only holds a Stats object when instrumentation
+is enabled, and checks it against None otherwise, so that it costs
+close to nothing when disabled.
+"""
+
+import bisect
+import collections
+import json
+import time
+
+PHASES = ('compute', 'diff', 'render')
+
+# Upper bounds of the latency histogram buckets, in milliseconds; the
+# last bucket holds anything slower
+BUCKETS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class Stats(object):
+    """ Rolling timings of the last window steps, and counters since
+    the start.
+    """
+    def __init__(self, window=256):
+        self.window = window
+        self.phases = dict((phase, collections.deque(maxlen=window))
+                           for phase in PHASES)
+        self.latencies = collections.deque(maxlen=window)
+        self.counters = collections.Counter()
+
+    clock = staticmethod(time.time)
+
+    def lap(self, phase, start):
+        """ Record the time since start as taken by phase, and return
+        the current time, to start the next phase from.
+        """
+        now = time.time()
+        self.phases[phase].append(now - start)
+        return now
+
+    def step(self, start):
+        """ Record the time since start as the latency of a whole step.
+        """
+        self.latencies.append(time.time() - start)
+        self.counters['steps'] += 1
+
+    def count(self, counter, n=1):
+        self.counters[counter] += n
+
+    def mean(self, phase):
+        """ Mean time of phase over the window, in seconds.
+        """
+        times = self.phases[phase]
+        return sum(times) / len(times) if times else 0.0
+
+    def percentile(self, percent):
+        """ Step latency below which percent of the steps in the window
+        fall, in seconds.
+        """
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        index = int(round(percent / 100.0 * (len(latencies) - 1)))
+        return latencies[index]
+
+    def histogram(self):
+        """ Return [(bucket upper bound in ms, number of steps)] for the
+        step latencies in the window, with None as the last bound.
+        """
+        counts = [0] * (len(BUCKETS) + 1)
+        for latency in self.latencies:
+            counts[bisect.bisect_left(BUCKETS, latency * 1000)] += 1
+        return zip(BUCKETS + (None,), counts)
+
+    def summary(self):
+        """ One line summary for display, times in milliseconds.
+        """
+        return '{0}  p50 {1:.1f}  p95 {2:.1f} ms'.format(
+                '  '.join('{0} {1:.1f}'.format(phase, self.mean(phase) * 1000)
+                          for phase in PHASES),
+                self.percentile(50) * 1000, self.percentile(95) * 1000)
+
+    def to_dict(self):
+        return {
+                'window': self.window,
+                'mean_seconds': dict((phase, self.mean(phase))
+                                     for phase in PHASES),
+                'latency_seconds': dict(('p{0}'.format(percent),
+                                         self.percentile(percent))
+                                        for percent in (50, 95, 99)),
+                'histogram_ms': self.histogram(),
+                'counters': dict(self.counters),
+                }
+
+    def dump(self, path):
+        """ Write the stats to path as JSON.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
@@ -6,9 +6,10 @@ logic held under the board.py module and the display
 and loop logic held under gui.py module
 """
 
-import Tkinter
 import board
-import gui
+import history
+import instrument
+import simulation
 
 
 
@@ -16,55 +17,222 @@ class App(object):
     """ Main application handling event loop and
     gluing together the board logic and GUI display.
     """
-    def __init__(self, rows, cols, speed):
+    def __init__(self, rows, cols, speed, engine=board, renderer='grid',
+                 threaded=False, generations_per_second=0,
+                 frames_per_second=25, instrumented=False,
+                 stats_path='stats.json', boundary=board.DEAD,
+                 rule=board.CONWAY):
+        # Imported here rather than with the module, so that scripts using
+        # main without a display do not pay for loading Tkinter
+        import Tkinter
+        import gui
         self.root = Tkinter.Tk()
 
+        # Module holding the board functions, board.py or one mirroring it
+        # such as bit_board.py; if it has step_board (count_board.py), the
+        # board is stepped in place, returning the births and deaths
+        self._engine = engine
+
+        # What lies beyond the edges of the board, one of board.BOUNDARIES,
+        # and the board.Rule of births and survivals
+        self._boundary = boundary
+        self._rule = rule
+
         self._rows = rows
         self._cols = cols
 
         self._speed = speed 
+        self._frames_per_second = frames_per_second
 
         self._generation = 0
         self._active = False
 
+        # Timings and counters of the simulation loop, only kept if
+        # instrumented; otherwise None, and skipped by the loop
+        self._stats = instrument.Stats() if instrumented else None
+        self._stats_path = stats_path
 
-        self._game_board = board.create_board(self._rows, self._cols)
+        self._game_board = self._engine.create_board(self._rows, self._cols)
         self._gui = gui.GuiApp(self,
                 canvas_rows=self._rows, canvas_cols=self._cols, 
-                speed=self._speed, generation=self._generation)
+                speed=self._speed, generation=self._generation,
+                renderer=renderer, threaded=threaded,
+                generations_per_second=generations_per_second,
+                frames_per_second=frames_per_second,
+                stats=self._stats,
+                unbounded=getattr(engine, 'UNBOUNDED', False))
         self._gui.pack()
 
+        # Recent generations, to step back or scrub through when paused
+        self._history = history.History(engine=self._engine)
+        self._history.record(self._generation, self._game_board)
+
+        # If threaded, generations are computed by a background thread,
+        # and the display only shows the newest one on each frame
+        self._simulation = None
+        if threaded:
+            self._simulation = simulation.Simulation(self._game_board,
+                    self._engine, generations_per_second, self._stats,
+                    self._boundary, self._rule)
+            self._simulation.start()
+            self._frames = simulation.RateCounter()
+
 
     def _tick(self):
         """ If game state is active:
         1) update data by one generation,
-        2) represent that on gui canvas,
+        2) represent the cells born and died on gui canvas,
         3) update generation count and display, and
         4) schedule another run of this function in the future
         If game state is not active, do nothing
+        If instrumented, the time taken by each of 1) and 2) is recorded.
         """
         if self._active:
-            self._game_board = board.next_board(self._game_board)
-
+            stats = self._stats
+            if stats is not None:
+                start = lap = stats.clock()
 
-            self._gui.canvas.clear_live()
-            for row, col in board.get_coords(self._game_board):
-                self._gui.canvas.display_cell_as_alive(row, col)
+            if hasattr(self._engine, 'step_board'):
+                births, deaths = self._engine.step_board(self._game_board,
+                        boundary=self._boundary, rule=self._rule)
+                if stats is not None:
+                    lap = stats.lap('compute', lap)
+                    stats.count('cells_evaluated', getattr(self._game_board,
+                            'cells_evaluated', self._rows * self._cols))
+            else:
+                old_board = self._game_board
+                self._game_board = self._engine.next_board(old_board,
+                        boundary=self._boundary, rule=self._rule)
+                if stats is not None:
+                    lap = stats.lap('compute', lap)
+                    stats.count('cells_evaluated', self._rows * self._cols)
 
+                births, deaths = self._engine.diff_boards(old_board,
+                                                          self._game_board)
+                if stats is not None:
+                    lap = stats.lap('diff', lap)
+            self._gui.canvas.apply_diff(births, deaths)
+            if stats is not None:
+                stats.lap('render', lap)
 
             self._generation += 1
             self._gui.update_generation_display(self._generation)
+            self._record_history(births, deaths)
+            if stats is not None:
+                stats.step(start)
+                self._gui.update_stats_display()
 
             self.root.after(self._speed, self._tick)
 
 
+    def _render(self):
+        """ If game state is active:
+        1) show the newest generation computed by the simulation thread,
+        2) schedule another run of this function after one frame
+        If game state is not active, do nothing
+        """
+        if self._active:
+            self._show_latest()
+            self.root.after(1000 // self._frames_per_second, self._render)
+
+
+    def _show_latest(self):
+        """ Represent the cells born and died between the generation on
+        display and the newest one on gui canvas, skipping the generations
+        in between, and update generation count and rate displays.
+        """
+        stats = self._stats
+        generation, latest = self._simulation.latest()
+        if generation != self._generation:
+            if stats is not None:
+                start = stats.clock()
+                stats.count('cells_evaluated', self._rows * self._cols *
+                            abs(generation - self._generation))
+
+            births, deaths = self._engine.diff_boards(self._game_board,
+                                                      latest)
+            if stats is not None:
+                lap = stats.lap('diff', start)
+            self._gui.canvas.apply_diff(births, deaths)
+            if stats is not None:
+                stats.lap('render', lap)
+                stats.step(start)
+                self._gui.update_stats_display()
+
+            self._game_board, self._generation = latest, generation
+            self._gui.update_generation_display(self._generation)
+            self._record_history(births, deaths)
+            self._frames.tick()
+
+        self._gui.update_rate_display(self._simulation.counter.rate(),
+                                      self._frames.rate())
+
+
+    def _record_history(self, births=None, deaths=None):
+        """ Add the current generation to the history, as a delta from
+        the previous one if given, and update the history display.
+        """
+        self._history.record(self._generation, self._game_board,
+                             births, deaths)
+        self._gui.update_history_display(self._history.first(),
+                                         self._history.last(),
+                                         self._generation)
+
+
+    def _show_generation(self, generation):
+        """ Replace the board with a generation kept in the history, and
+        represent the cells changed on gui canvas.
+        If the generation is not kept anymore, do nothing.
+        """
+        try:
+            new_board = self._history.seek(generation)
+        except IndexError:
+            return
+
+        births, deaths = self._engine.diff_boards(self._game_board, new_board)
+        self._gui.canvas.apply_diff(births, deaths)
+        self._game_board, self._generation = new_board, generation
+        self._gui.update_generation_display(self._generation)
+        self._gui.update_history_display(self._history.first(),
+                                         self._history.last(),
+                                         self._generation)
+
+
     def update_cell_in_board_data(self, row, col):
-        """ 'Flip' the value in cell on the board data
+        """ 'Flip' the value in cell on the board data, and keep the
+        edited board in the history in place of the current generation,
+        dropping any later generations.
         """
-        if board.get_value(self._game_board, row, col):
-            board.set_dead(self._game_board, row, col)
+        if self._engine.get_value(self._game_board, row, col):
+            self._engine.set_dead(self._game_board, row, col)
         else:
-            board.set_alive(self._game_board, row, col)
+            self._engine.set_alive(self._game_board, row, col)
+        self._record_history()
+
+    def step_back(self):
+        """ If game state is not active, go back to the previous generation
+        kept in the history.
+        """
+        if not self._active:
+            generation = self._history.floor(self._generation - 1)
+            if generation is not None:
+                self._show_generation(generation)
+
+    def scrub_to(self, generation):
+        """ If game state is not active, go to the generation kept in the
+        history closest to the given one; the slider snaps to it.
+        """
+        if self._active:
+            return
+        generation = self._history.nearest(generation)
+        if generation is None:
+            return
+        if generation != self._generation:
+            self._show_generation(generation)
+        else:
+            self._gui.update_history_display(self._history.first(),
+                                             self._history.last(),
+                                             self._generation)
 
     def activate_game(self):
         """ 1) Set the game speed to match the entry,
@@ -72,7 +240,23 @@ class App(object):
         3) run the next tick (which will then schedule the 
         next tick by itself.
         If inputted game speed is not valid, raise an Error
+        If threaded, the speed entries are the generations and frames
+        per second instead, and the simulation thread is resumed with
+        the (possibly edited) board.
         """
+        if self._simulation is not None:
+            try:
+                self._simulation.set_rate(float(self._gui.speed_text.get()))
+                self._frames_per_second = int(self._gui.fps_text.get())
+            except ValueError:
+                raise ValueError
+            if self._frames_per_second <= 0:
+                raise ValueError
+            self._active = True
+            self._simulation.resume(self._game_board, self._generation)
+            self._render()
+            return
+
         try:
             self._speed = int(self._gui.speed_text.get())
         except ValueError:
@@ -82,10 +266,20 @@ class App(object):
 
     def deactivate_game(self):
         self._active = False
+        if self._simulation is not None:
+            self._simulation.pause()
+            self._show_latest()
 
     def is_active(self):
         return self._active
 
+    def dump_stats(self, path=None):
+        """ If instrumented, write the stats to path (by default the
+        stats_path given to the app) as JSON.
+        """
+        if self._stats is not None:
+            self._stats.dump(path or self._stats_path)
+
 
     def run(self):
         """ Run the first tick (which will schedule further ticks if game
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Array-backed version of the board update, using NumPy to count
+the neighbors of every cell at once instead of cell by cell.
+Boards are converted to and from the list of lists representation
+used by board.py with to_array and to_board.
+"""
+
+import numpy
+
+import board
+
+# numpy.pad mode filling the border of each boundary mode
+PAD_MODES = {
+        board.DEAD: 'constant',
+        board.TORUS: 'wrap',
+        board.MIRROR: 'symmetric',
+        }
+
+
+def to_array(board):
+    """ Convert a list of lists board into a 2D uint8 array.
+    """
+    return numpy.array(board, dtype=numpy.uint8)
+
+
+def to_board(array):
+    """ Convert a 2D array back into a list of lists board of 0/1 ints.
+    """
+    return [[int(cell) for cell in row] for row in array]
+
+
+def neighbor_counts(array, boundary=board.DEAD):
+    """ Return an array with the number of alive neighbors of each cell.
+    The array is padded with a border of cells set following the
+    boundary mode (see board.py), and the 8 shifted views of the padded
+    array are summed.
+    """
+    if boundary not in PAD_MODES:
+        raise ValueError('unknown boundary mode: {0!r}'.format(boundary))
+    max_row, max_col = array.shape
+    padded = numpy.pad(array, 1, mode=PAD_MODES[boundary])
+
+    counts = numpy.zeros((max_row, max_col), dtype=numpy.uint8)
+    for i in xrange(3):
+        for j in xrange(3):
+            if (i, j) != (1, 1):
+                counts += padded[i:i+max_row, j:j+max_col]
+    return counts
+
+
+def next_array(array, boundary=board.DEAD, rule=board.CONWAY):
+    """ Takes current board as an array and returns a new array with the
+    next generation state, following the same rules as board.next_board:
+    the next state of every cell is looked up at once in the rule's table.
+    """
+    counts = neighbor_counts(array, boundary)
+    table = numpy.array(rule.table, dtype=numpy.uint8)
+    return table[(array != 0) * 9 + counts]
+
+
+def next_board(current_board, boundary=board.DEAD, rule=board.CONWAY):
+    """ Drop-in replacement for board.next_board, converting to and from
+    an array around a single call to next_array.
+    """
+    return to_board(next_array(to_array(current_board), boundary, rule))
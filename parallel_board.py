@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Parallel version of the board update for very large boards.
+
+The board is held in two shared memory buffers (current and next
+generation), which every process of a persistent pool can see, so the
+board is never pickled between processes. Each generation the board is
+split into horizontal strips, one per task; a worker reads its strip
+plus one row above and below it (the halo) from the current buffer, and
+writes its rows of the next generation into the other buffer. Buffers
+have a border of ghost cells, which the parent refreshes before each
+step following the boundary mode (see board.py).
+"""
+
+import ctypes
+import multiprocessing
+import multiprocessing.sharedctypes
+
+import board
+
+
+# State of each worker process, set once by _init_worker
+_worker = {}
+
+
+def _init_worker(buffers, rows, cols, table):
+    _worker['buffers'] = buffers
+    _worker['rows'] = rows
+    _worker['cols'] = cols
+    _worker['table'] = table
+
+
+def _step_strip(task):
+    """ Compute rows start to end (excluding) of the next generation,
+    reading from buffer src and writing to the other buffer.
+    Buffers hold (rows+2) x (cols+2) cells, with a border of ghost cells
+    so that the neighbors of the edge cells need no bounds checks.
+    """
+    src_index, start, end = task
+    src = _worker['buffers'][src_index]
+    dst = _worker['buffers'][1 - src_index]
+    width = _worker['cols'] + 2
+    table = _worker['table']
+
+    above = src[start*width:(start+1)*width]
+    current = src[(start+1)*width:(start+2)*width]
+    for row in xrange(start+1, end+1):
+        below = src[(row+1)*width:(row+2)*width]
+        new_row = [0] * width
+        for col in xrange(1, width-1):
+            new_row[col] = table[current[col] * 9 +
+                                 above[col-1] + above[col] +
+                                 above[col+1] + current[col-1] +
+                                 current[col+1] + below[col-1] +
+                                 below[col] + below[col+1]]
+        dst[row*width:(row+1)*width] = new_row
+        above, current = current, below
+
+
+class ParallelBoard(object):
+    """ Board state held in shared memory, stepped by a pool of
+    worker processes which is kept alive across generations.
+    Call close() (or use as a context manager) to stop the pool.
+    """
+    def __init__(self, initial_board, workers=None, strips=None,
+                 boundary=board.DEAD, rule=board.CONWAY):
+        self._rows, self._cols = len(initial_board), len(initial_board[0])
+        self._workers = workers or multiprocessing.cpu_count()
+        if boundary not in board.BOUNDARIES:
+            raise ValueError('unknown boundary mode: {0!r}'.format(boundary))
+        self._boundary = boundary
+
+        size = (self._rows+2) * (self._cols+2)
+        self._buffers = (multiprocessing.sharedctypes.RawArray('B', size),
+                         multiprocessing.sharedctypes.RawArray('B', size))
+        self._current = 0
+        # RawArray memory starts zeroed, so only the live cells are set
+        self._set_cells(initial_board)
+
+        # A few strips per worker evens out the work between them
+        strip_count = min(self._rows, strips or self._workers * 4)
+        bounds = [self._rows * i // strip_count
+                  for i in xrange(strip_count+1)]
+        self._strips = zip(bounds[:-1], bounds[1:])
+
+        self._pool = multiprocessing.Pool(self._workers,
+                initializer=_init_worker,
+                initargs=(self._buffers, self._rows, self._cols,
+                          rule.table))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def load(self, new_board):
+        """ Replace the current state with a list of lists board.
+        """
+        buf = self._buffers[self._current]
+        ctypes.memset(buf, 0, len(buf))
+        self._set_cells(new_board)
+
+    def _set_cells(self, new_board):
+        """ Set the live cells of a list of lists board in the current
+        buffer, which has to be cleared already.
+        """
+        width = self._cols + 2
+        buf = self._buffers[self._current]
+        for row, col in board.get_coords(new_board):
+            buf[(row+1)*width + col+1] = 1
+
+    def _fill_border(self):
+        """ Set the ghost cells of the current buffer from the cells on
+        the edges, following the boundary mode. Dead borders never
+        change, as the workers only write inside them.
+        """
+        if self._boundary == board.DEAD:
+            return
+        width = self._cols + 2
+        buf = self._buffers[self._current]
+        torus = self._boundary == board.TORUS
+        for row in xrange(1, self._rows+1):
+            first, last = row*width + 1, (row+1)*width - 2
+            buf[first-1] = buf[last] if torus else buf[first]
+            buf[last+1] = buf[first] if torus else buf[last]
+        last_row = self._rows * width
+        top, bottom = (last_row, width) if torus else (width, last_row)
+        buf[0:width] = buf[top:top+width]
+        buf[last_row+width:last_row+2*width] = buf[bottom:bottom+width]
+
+    def step(self):
+        """ Advance the board by one generation across the pool.
+        """
+        self._fill_border()
+        self._pool.map(_step_strip,
+                [(self._current, start, end) for start, end in self._strips])
+        self._current = 1 - self._current
+
+    def to_board(self):
+        """ Return the current state as a list of lists board.
+        """
+        width = self._cols + 2
+        buf = self._buffers[self._current]
+        return [buf[row*width+1:(row+1)*width-1]
+                for row in xrange(1, self._rows+1)]
+
+    def close(self):
+        """ Stop the worker processes.
+        """
+        self._pool.close()
+        self._pool.join()
+
+
+def next_board(current_board, workers=None, boundary=board.DEAD,
+               rule=board.CONWAY):
+    """ Drop-in replacement for board.next_board. Starting the pool costs
+    far more than a single step, so keep a ParallelBoard across
+    generations instead outside of tests.
+    """
+    with ParallelBoard(current_board, workers,
+                       boundary=boundary, rule=rule) as parallel:
+        parallel.step()
+        return parallel.to_board()
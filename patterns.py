@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Readers for the common pattern file formats: RLE (.rle), Life 1.06
+(.lif, .life) and plaintext (.cells).
+
+Each reader takes an iterable of lines, such as an open file, and
+returns a Pattern: the size of the pattern, and the coords of its live
+cells relative to its top left corner. No dense matrix is ever built,
+so memory stays proportional to the number of live cells; for RLE,
+whose header gives the size, the coords are even decoded lazily while
+they are loaded.
+"""
+
+import collections
+import os
+import re
+
+import board
+
+# rule is the rule string given in the file, or None
+Pattern = collections.namedtuple('Pattern', 'rows cols coords rule')
+
+EXTENSIONS = {
+        '.rle': 'rle',
+        '.lif': 'life106',
+        '.life': 'life106',
+        '.cells': 'cells',
+        }
+
+
+def read_cells(lines):
+    """ Read a plaintext pattern, with 'O' (or '*') for live cells, '.'
+    for dead ones and '!' starting comment lines.
+    """
+    coords, rows, cols, last_row = [], 0, 0, 0
+    for line in lines:
+        if line.startswith('!'):
+            continue
+        line = line.rstrip('\r\n')
+        for col, cell in enumerate(line):
+            if cell in 'O*':
+                coords.append((rows, col))
+        rows += 1
+        if line.strip():
+            cols = max(cols, len(line))
+            last_row = rows
+
+    if not cols:
+        raise ValueError('empty pattern')
+    return Pattern(last_row, cols, coords, None)
+
+
+def read_life106(lines):
+    """ Read a Life 1.06 pattern: a '#Life 1.06' line, then one 'x y'
+    line per live cell, with x the column and y the row, both of which
+    may be negative.
+    """
+    coords = []
+    for line in lines:
+        if line.startswith('#') or not line.strip():
+            continue
+        x, y = line.split()
+        coords.append((int(y), int(x)))
+
+    if not coords:
+        raise ValueError('empty pattern')
+    top = min(row for row, col in coords)
+    left = min(col for row, col in coords)
+    coords = [(row - top, col - left) for row, col in coords]
+    return Pattern(max(row for row, col in coords) + 1,
+                   max(col for row, col in coords) + 1, coords, None)
+
+
+def _iter_rle_coords(chars):
+    """ Decode the RLE cell data from an iterator of characters, yielding
+    the coords of each live cell.
+    """
+    row, col, count = 0, 0, ''
+    for char in chars:
+        if char.isdigit():
+            count += char
+            continue
+        run = int(count or 1)
+        count = ''
+        if char in 'b.':
+            col += run
+        elif char == '$':
+            row, col = row + run, 0
+        elif char == '!':
+            return
+        elif char.isalpha():
+            for i in xrange(run):
+                yield (row, col + i)
+            col += run
+        elif not char.isspace():
+            raise ValueError('unexpected {0!r} in RLE pattern'.format(char))
+
+
+def read_rle(lines):
+    """ Read an RLE pattern: '#' comment lines, a header line giving the
+    size as 'x = cols, y = rows' and optionally a rule (the rest of the
+    line after 'rule =', which may hold commas, e.g. 'B3/S23:T20,20'),
+    then runs of cells where 'b' is dead, 'o' alive and '$' ends a row,
+    up to '!'. The coords are decoded as they are iterated over.
+    """
+    lines = iter(lines)
+    for line in lines:
+        if not line.startswith('#') and line.strip():
+            break
+    else:
+        raise ValueError('missing RLE header')
+
+    size, rule = line, None
+    match = re.search(r',\s*rule\s*=', line, re.IGNORECASE)
+    if match:
+        size, rule = line[:match.start()], line[match.end():].strip()
+
+    header = {}
+    for item in size.split(','):
+        if '=' not in item:
+            raise ValueError('bad RLE header: {0!r}'.format(line))
+        key, value = item.split('=', 1)
+        header[key.strip().lower()] = value.strip()
+    try:
+        rows, cols = int(header['y']), int(header['x'])
+    except (KeyError, ValueError):
+        raise ValueError('bad RLE header: {0!r}'.format(line))
+
+    chars = (char for line in lines for char in line)
+    return Pattern(rows, cols, _iter_rle_coords(chars), rule)
+
+
+READERS = {
+        'rle': read_rle,
+        'life106': read_life106,
+        'cells': read_cells,
+        }
+
+
+def read_pattern(path, format=None):
+    """ Read the pattern file at path, in the given format, or the format
+    given by its extension.
+    The file is read lazily for RLE, so it is kept open until the coords
+    have been iterated over.
+    """
+    if format is None:
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in EXTENSIONS:
+            raise ValueError('unknown pattern format: {0}'.format(path))
+        format = EXTENSIONS[extension]
+    if format != 'rle':
+        with open(path) as fileobj:
+            return READERS[format](fileobj)
+
+    fileobj = open(path)
+    pattern = read_rle(fileobj)
+    return pattern._replace(coords=_closing(fileobj, pattern.coords))
+
+
+def _closing(fileobj, coords):
+    """ Yield from coords, closing fileobj once done.
+    """
+    try:
+        for coord in coords:
+            yield coord
+    finally:
+        fileobj.close()
+
+
+def load_pattern(target_board, pattern, top_row=0, left_col=0):
+    """ Takes each live cell in pattern and loads to board, setting
+    the top left based on the coordinates entered, as load_construct
+    does for a construct.
+    """
+    max_row, max_col = len(target_board), len(target_board[0])
+    if max_row < pattern.rows + top_row or \
+            max_col < pattern.cols + left_col or \
+            top_row < 0 or \
+            left_col < 0:
+        raise IndexError
+
+    for row, col in pattern.coords:
+        if not (0 <= row < pattern.rows and 0 <= col < pattern.cols):
+            raise ValueError('cell outside of the pattern size')
+        target_board[row+top_row][col+left_col] = 1
+
+
+def to_construct(pattern):
+    """ Return pattern as a construct (list of lists) for
+    board.load_construct, for small patterns.
+    """
+    construct = board.create_board(pattern.rows, pattern.cols)
+    load_pattern(construct, pattern)
+    return construct
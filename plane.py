@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Unbounded board, with no edges: an infinite plane of cells with
+signed coordinates.
+
+The plane is split into square chunks of chunk_size x chunk_size cells,
+each held as a list of chunk_size integers with one bit per cell (as in
+bit_board.py), and only the chunks holding live cells are kept. Chunks
+are allocated when a cell in them becomes alive, and freed once all of
+their cells are dead, so memory grows with the area in use rather than
+with the distance between patterns.
+
+Mirrors the functions of board.py, so that it can be used in its place,
+e.g. as the engine of main.App, where the canvas then shows a window
+onto the plane which the arrow keys move around.
+"""
+
+import itertools
+
+import bit_board
+import board
+
+# Tells main.App that the board has no edges, so the canvas can be moved
+# anywhere on it
+UNBOUNDED = True
+
+
+class Plane(object):
+    """ Dict of (chunk row, chunk col) -> chunk, for every chunk with
+    live cells. row_count x col_count is only the size of the window
+    shown by default; cells can be set anywhere.
+    """
+    def __init__(self, chunk_size=16, row_count=0, col_count=0):
+        self.chunk_size = chunk_size
+        self.row_count = row_count
+        self.col_count = col_count
+        self.chunks = {}
+
+    def __eq__(self, other):
+        return isinstance(other, Plane) and \
+               self.chunk_size == other.chunk_size and \
+               self.chunks == other.chunks
+
+    def __ne__(self, other):
+        return not self == other
+
+
+def create_board(row_count, col_count, chunk_size=16):
+    """ Creates an empty plane, with a default window of row_count x
+    col_count cells.
+    """
+    return Plane(chunk_size, row_count, col_count)
+
+
+def from_coords(coords, chunk_size=16):
+    """ Creates a plane with the given coords alive.
+    """
+    plane = Plane(chunk_size)
+    for row, col in coords:
+        set_alive(plane, row, col)
+    return plane
+
+
+def to_board(plane, top_row=0, left_col=0, row_count=None, col_count=None):
+    """ Returns the window of row_count x col_count cells (by default the
+    plane's window size) with top_row, left_col at its top left, as a
+    list of lists board.
+    """
+    row_count = plane.row_count if row_count is None else row_count
+    col_count = plane.col_count if col_count is None else col_count
+    window = board.create_board(row_count, col_count)
+    for row, col in get_coords(plane):
+        if 0 <= row - top_row < row_count and 0 <= col - left_col < col_count:
+            window[row-top_row][col-left_col] = 1
+    return window
+
+
+def load_construct(plane, construct, top_row=0, left_col=0):
+    """ Takes each live cell in construct and loads to the plane, setting
+    the top left based on the coordinates entered, which may be negative.
+    """
+    for row, col in board.get_coords(construct):
+        set_alive(plane, row+top_row, col+left_col)
+
+
+def get_coords(plane):
+    """ Takes plane and yields the coord of each live cell, chunk by chunk
+    """
+    size = plane.chunk_size
+    for (chunk_row, chunk_col), rows in sorted(plane.chunks.iteritems()):
+        for i, value in enumerate(rows):
+            j = 0
+            while value:
+                if value & 1:
+                    yield (chunk_row*size + i, chunk_col*size + j)
+                value >>= 1
+                j += 1
+
+
+def population(plane):
+    """ Number of live cells on the plane.
+    """
+    return sum(bin(value).count('1')
+               for rows in plane.chunks.itervalues() for value in rows)
+
+
+def bounds(plane):
+    """ Returns (top, left, bottom, right), the smallest rectangle holding
+    every live cell (inclusive), or None if the plane is empty.
+    """
+    coords = list(get_coords(plane))
+    if not coords:
+        return None
+    rows = [row for row, col in coords]
+    cols = [col for row, col in coords]
+    return min(rows), min(cols), max(rows), max(cols)
+
+
+def _join(left, middle, right, size):
+    """ Returns a row of a chunk shifted up by one bit, with the cells
+    next to it from the chunks on the left and right in bits 0 and size+1.
+    """
+    return ((left >> (size-1)) & 1) | (middle << 1) | ((right & 1) << (size+1))
+
+
+def next_plane(plane, rule=board.CONWAY):
+    """ Takes current plane and returns new plane with the next generation
+    state, following the same rules as board.next_board (with no edges).
+    Each chunk with live cells, and each chunk next to one, is stepped
+    with bit_board.next_board, padded with the rows and columns next to
+    it from the neighboring chunks. Rules with births on 0 neighbors
+    would fill the whole plane, so they raise ValueError.
+    """
+    if 0 in rule.birth:
+        raise ValueError('rules with B0 are not supported')
+    size = plane.chunk_size
+    mask = (1 << size) - 1
+    chunks, empty = plane.chunks, [0] * size
+
+    candidates = set()
+    for chunk_row, chunk_col in chunks:
+        for d_row in (-1, 0, 1):
+            for d_col in (-1, 0, 1):
+                candidates.add((chunk_row + d_row, chunk_col + d_col))
+
+    new_plane = Plane(size, plane.row_count, plane.col_count)
+    for chunk_row, chunk_col in candidates:
+        def get(d_row, d_col):
+            return chunks.get((chunk_row + d_row, chunk_col + d_col), empty)
+
+        rows = [_join(get(-1, -1)[-1], get(-1, 0)[-1], get(-1, 1)[-1], size)]
+        rows.extend(_join(left, middle, right, size)
+                    for left, middle, right
+                    in itertools.izip(get(0, -1), get(0, 0), get(0, 1)))
+        rows.append(_join(get(1, -1)[0], get(1, 0)[0], get(1, 1)[0], size))
+        if not any(rows):
+            continue
+
+        # Only the inner cells of the padded chunk see all their neighbors
+        padded = bit_board.next_board(bit_board.BitBoard(rows, size+2),
+                                      rule=rule)
+        new_rows = [(value >> 1) & mask for value in padded.rows[1:-1]]
+        if any(new_rows):
+            new_plane.chunks[(chunk_row, chunk_col)] = new_rows
+    return new_plane
+
+
+def next_board(plane, boundary=board.DEAD, rule=board.CONWAY):
+    """ Drop-in replacement for board.next_board. The plane has no edges,
+    so the boundary mode can only be the default, raising ValueError
+    otherwise.
+    """
+    if boundary != board.DEAD:
+        raise ValueError('the plane has no edges')
+    return next_plane(plane, rule)
+
+
+def diff_boards(old_plane, new_plane):
+    """ Takes two planes and returns a list of coords of the cells that
+    became alive (births) and of those that became dead (deaths), only
+    looking at the chunks of either plane.
+    """
+    size, empty = old_plane.chunk_size, [0] * old_plane.chunk_size
+    births, deaths = [], []
+    for key in sorted(set(old_plane.chunks) | set(new_plane.chunks)):
+        old_rows = old_plane.chunks.get(key, empty)
+        new_rows = new_plane.chunks.get(key, empty)
+        for i, (old, new) in enumerate(itertools.izip(old_rows, new_rows)):
+            changed, j = old ^ new, 0
+            while changed:
+                if changed & 1:
+                    coord = (key[0]*size + i, key[1]*size + j)
+                    if (new >> j) & 1:
+                        births.append(coord)
+                    else:
+                        deaths.append(coord)
+                changed >>= 1
+                j += 1
+    return births, deaths
+
+
+def get_value(plane, row, col):
+    """ Get value of cell
+    """
+    chunk_row, i = divmod(row, plane.chunk_size)
+    chunk_col, j = divmod(col, plane.chunk_size)
+    rows = plane.chunks.get((chunk_row, chunk_col))
+    return (rows[i] >> j) & 1 if rows else 0
+
+def set_alive(plane, row, col):
+    """ Set value of cell to alive, allocating its chunk if needed
+    """
+    chunk_row, i = divmod(row, plane.chunk_size)
+    chunk_col, j = divmod(col, plane.chunk_size)
+    rows = plane.chunks.setdefault((chunk_row, chunk_col),
+                                   [0] * plane.chunk_size)
+    rows[i] |= 1 << j
+
+def set_dead(plane, row, col):
+    """ Set value of cell to dead, freeing its chunk if it is now empty
+    """
+    chunk_row, i = divmod(row, plane.chunk_size)
+    chunk_col, j = divmod(col, plane.chunk_size)
+    rows = plane.chunks.get((chunk_row, chunk_col))
+    if rows:
+        rows[i] &= ~(1 << j)
+        if not any(rows):
+            del plane.chunks[(chunk_row, chunk_col)]
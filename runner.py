@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Runs the game without a display, for batch runs on machines
+without Tkinter.
+
+Loads an initial pattern (.rle, .lif/.life or .cells file) onto a board,
+runs it for a number of generations or until a stop condition is
+reached, and writes the final state and the population of each
+generation.
+Given a directory, every pattern in it is run, in parallel across cores.
+
+    python runner.py glider.cells --generations 1000 --output-dir out
+    python runner.py patterns/ --stop still --jobs 8 --output-dir out
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+import board
+import cycle
+import patterns
+
+
+# Engines which step a list of lists board with next_board (see the
+# registry in board.py), and 'fastest' for the fastest one available
+ENGINES = sorted(board.ENGINES) + ['fastest']
+
+# Stop conditions, besides running out of generations
+STOP_CONDITIONS = ('none', 'extinct', 'still', 'cycle')
+
+
+def write_cells(current_board, fileobj):
+    """ Write board as a plaintext pattern.
+    """
+    for row in current_board:
+        fileobj.write(''.join('O' if cell else '.' for cell in row) + '\n')
+
+
+def run_board(current_board, generations, engine=board, stop='none',
+              fast_forward=False, boundary=board.DEAD, rule=board.CONWAY):
+    """ Advance board by up to the given number of generations with
+    engine.next_board, the boundary mode and the rule (see board.py),
+    stopping early once the stop condition is met:
+    'extinct' when no cell is alive, 'still' when a generation is the
+    same as the one before it (which includes extinction), 'cycle' when
+    a generation repeats an earlier one (which includes both).
+    With fast_forward, once the board repeats itself only the few
+    generations needed to reach the same state as the last generation
+    are computed, and the populations of the rest are filled in from
+    the cycle.
+    Returns the final board, a list of the population of each generation
+    starting with the initial one, and the reason the run stopped.
+    """
+    if stop not in STOP_CONDITIONS:
+        raise ValueError('unknown stop condition: {0}'.format(stop))
+
+    detector = None
+    if stop == 'cycle' or fast_forward:
+        detector = cycle.CycleDetector(current_board)
+
+    population = sum(map(sum, current_board))
+    populations = [population]
+    generation = 0
+    while generation < generations:
+        if stop != 'none' and population == 0:
+            return current_board, populations, 'extinct'
+        if detector is not None and detector.cycle is not None:
+            if stop == 'cycle':
+                return current_board, populations, detector.cycle.kind
+            break
+
+        new_board = engine.next_board(current_board, boundary=boundary,
+                                      rule=rule)
+        births, deaths = board.diff_boards(current_board, new_board)
+        current_board = new_board
+        generation += 1
+
+        population += len(births) - len(deaths)
+        populations.append(population)
+        if stop == 'still' and not births and not deaths:
+            return current_board, populations, 'still'
+        if detector is not None:
+            detector.update(births, deaths)
+
+    if generation < generations:
+        # Fast forward through the cycle
+        found = detector.cycle
+        for i in xrange(detector.remaining(generations)):
+            current_board = engine.next_board(current_board,
+                                              boundary=boundary, rule=rule)
+        for i in xrange(generation+1, generations+1):
+            populations.append(populations[found.start +
+                                           (i - found.start) % found.period])
+        return current_board, populations, found.kind
+
+    if stop != 'none' and population == 0:
+        return current_board, populations, 'extinct'
+    return current_board, populations, 'generations'
+
+
+def load_board(path, rows, cols, top_row=None, left_col=None):
+    """ Create a rows x cols board with the pattern in path loaded onto
+    it, centered unless top_row/left_col are given.
+    """
+    pattern = patterns.read_pattern(path)
+    if top_row is None:
+        top_row = (rows - pattern.rows) // 2
+    if left_col is None:
+        left_col = (cols - pattern.cols) // 2
+
+    new_board = board.create_board(rows, cols)
+    patterns.load_pattern(new_board, pattern, top_row, left_col)
+    return new_board
+
+
+def run_file(task):
+    """ Run the pattern in one file and write its results to the output
+    directory, returning a one line summary. An error running the file
+    (e.g. a pattern that cannot be parsed, or is larger than the board)
+    is reported in its summary instead of stopping the other files.
+    """
+    path, options = task
+    name = os.path.splitext(os.path.basename(path))[0]
+    try:
+        return _run_file(path, name, options)
+    except Exception as e:
+        error = type(e).__name__
+        if str(e):
+            error += ': ' + str(e)
+        return '{0}\t-\t-\terror: {1}'.format(name, error)
+
+
+def _run_file(path, name, options):
+    engine_name = options['engine']
+    engine = board.get_engine(None if engine_name == 'fastest'
+                              else engine_name)
+    initial = load_board(path, options['rows'], options['cols'],
+                         options['top'], options['left'])
+    final, populations, reason = run_board(initial, options['generations'],
+                                           engine, options['stop'],
+                                           options['fast_forward'],
+                                           options['boundary'],
+                                           options['rule'])
+
+    output_dir = options['output_dir']
+    with open(os.path.join(output_dir, name + '.final.cells'), 'w') as f:
+        write_cells(final, f)
+    with open(os.path.join(output_dir, name + '.population.csv'), 'w') as f:
+        f.write('generation,population\n')
+        for generation, population in enumerate(populations):
+            f.write('{0},{1}\n'.format(generation, population))
+
+    return '{0}\t{1}\t{2}\t{3}'.format(name, len(populations) - 1,
+                                       populations[-1], reason)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+            description="Run Game of Life patterns without a display.")
+    parser.add_argument('pattern',
+            help="pattern file (.rle, .lif, .life or .cells), "
+                 "or directory of pattern files")
+    parser.add_argument('--rows', type=int, default=80)
+    parser.add_argument('--cols', type=int, default=80)
+    parser.add_argument('--top', type=int, default=None,
+            help="top row of the pattern (default: centered)")
+    parser.add_argument('--left', type=int, default=None,
+            help="left column of the pattern (default: centered)")
+    parser.add_argument('--generations', type=int, default=1000)
+    parser.add_argument('--stop', choices=STOP_CONDITIONS, default='none')
+    parser.add_argument('--fast-forward', action='store_true',
+            help="skip to the last generation once the board repeats")
+    parser.add_argument('--engine', choices=ENGINES,
+            default='board')
+    parser.add_argument('--boundary', choices=board.BOUNDARIES,
+            default=board.DEAD,
+            help="what lies beyond the edges of the board")
+    parser.add_argument('--rule', type=board.parse_rule, default='B3/S23',
+            help="rule in B/S notation, e.g. B36/S23")
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--jobs', type=int, default=None,
+            help="processes for a directory of patterns (default: cores)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    options = {
+            'rows': args.rows, 'cols': args.cols,
+            'top': args.top, 'left': args.left,
+            'generations': args.generations, 'stop': args.stop,
+            'engine': args.engine, 'output_dir': args.output_dir,
+            'fast_forward': args.fast_forward,
+            'boundary': args.boundary, 'rule': args.rule,
+            }
+    if not os.path.isdir(args.output_dir):
+        os.makedirs(args.output_dir)
+
+    if os.path.isdir(args.pattern):
+        paths = sorted(os.path.join(args.pattern, name)
+                       for name in os.listdir(args.pattern)
+                       if os.path.splitext(name)[1].lower()
+                       in patterns.EXTENSIONS)
+        pool = multiprocessing.Pool(args.jobs)
+        try:
+            summaries = pool.map(run_file, [(path, options)
+                                            for path in paths])
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        summaries = [run_file((args.pattern, options))]
+
+    for summary in summaries:
+        print summary
+
+if __name__ == '__main__':
+    main()
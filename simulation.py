@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Runs the game in a background thread, separately from the display.
+The thread keeps advancing the board at the requested number of
+generations per second, and the display picks up the newest generation
+whenever it is ready to draw, skipping any generations in between.
+"""
+
+import collections
+import threading
+import time
+
+import board
+
+
+class RateCounter(object):
+    """ Counts events (generations, frames) and reports how many
+    happened per second over the last window seconds.
+    """
+    def __init__(self, window=1.0):
+        self._window = window
+        self._times = collections.deque()
+
+    clock = staticmethod(time.time)
+
+    def tick(self):
+        now = self.clock()
+        self._times.append(now)
+        while self._times[0] < now - self._window:
+            self._times.popleft()
+
+    def rate(self):
+        now = self.clock()
+        while self._times and self._times[0] < now - self._window:
+            self._times.popleft()
+        return len(self._times) / self._window
+
+
+class Simulation(threading.Thread):
+    """ Thread advancing a board with engine.next_board while running.
+    Boards are never modified once published, so the newest one can be
+    handed to the display without copying.
+    If given an instrument.Stats, the time of each step is recorded in it.
+    """
+    def __init__(self, current_board, engine=board, generations_per_second=0,
+                 stats=None, boundary=board.DEAD, rule=board.CONWAY):
+        threading.Thread.__init__(self)
+        self.daemon = True
+
+        self._engine = engine
+        self._boundary = boundary
+        self._rule = rule
+        self._board = current_board
+        self._generation = 0
+        self._interval = 0
+        self._stats = stats
+
+        self._lock = threading.Lock()       # guards board and generation
+        self._step_lock = threading.Lock()  # held while a step is running
+        self._running = threading.Event()
+        self._stopped = False
+        self.counter = RateCounter()
+
+        self.set_rate(generations_per_second)
+
+    # Time and waiting used to pace the generations
+    clock = staticmethod(time.time)
+    sleep = staticmethod(time.sleep)
+
+    def run(self):
+        next_time = self.clock()
+        while not self._stopped:
+            if not self._running.wait(0.1):
+                next_time = self.clock()
+                continue
+
+            with self._step_lock:
+                if not self._running.is_set():
+                    continue
+                if self._stats is not None:
+                    start = self._stats.clock()
+                new_board = self._engine.next_board(self._board,
+                        boundary=self._boundary, rule=self._rule)
+                if self._stats is not None:
+                    self._stats.lap('compute', start)
+                with self._lock:
+                    self._board = new_board
+                    self._generation += 1
+                self.counter.tick()
+
+            # Wait until the next generation is due, if rate limited
+            next_time = max(next_time + self._interval, self.clock() - 1)
+            delay = next_time - self.clock()
+            if delay > 0:
+                self.sleep(delay)
+
+    def set_rate(self, generations_per_second):
+        """ Set the number of generations to compute per second; 0 to
+        compute as fast as possible.
+        """
+        if generations_per_second < 0:
+            raise ValueError
+        self._interval = 1.0 / generations_per_second \
+                if generations_per_second else 0
+
+    def latest(self):
+        """ Return the newest (generation, board).
+        """
+        with self._lock:
+            return self._generation, self._board
+
+    def resume(self, current_board=None, generation=None):
+        """ Start advancing the board, optionally replacing it and its
+        generation first (e.g. after it was edited or stepped back while
+        paused).
+        """
+        with self._lock:
+            if current_board is not None:
+                self._board = current_board
+            if generation is not None:
+                self._generation = generation
+        self._running.set()
+
+    def pause(self):
+        """ Stop advancing the board, waiting for the generation being
+        computed to finish, so that the board is not replaced anymore
+        once this returns.
+        """
+        self._running.clear()
+        with self._step_lock:
+            pass
+
+    def stop(self):
+        """ Stop the thread for good.
+        """
+        self.pause()
+        self._stopped = True
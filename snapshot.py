@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Saves and loads boards as compact binary snapshots.
+
+A snapshot is a 16 byte header followed by the cells, one bit each:
+
+    magic 'GOLS', version (1 byte), flags (1 byte), 2 unused bytes,
+    row count and column count (unsigned 32 bit little-endian ints)
+
+Each row takes (cols+7)//8 bytes, column j being bit j%8 of byte j//8.
+If the FLAG_RLE flag is set, the bytes of all rows are run-length
+compressed as (run length as a LEB128 varint, byte value) pairs.
+
+Uncompressed snapshots are memory-mapped when loading, so that loading a
+region of a huge snapshot only reads the rows and bytes it covers.
+"""
+
+import binascii
+import mmap
+import struct
+
+import bit_board
+
+MAGIC = 'GOLS'
+VERSION = 1
+FLAG_RLE = 1
+
+HEADER = struct.Struct('<4sBBxxII')
+
+
+def _row_to_int(row):
+    """ Pack a row of 0/1 cells into an int, column j as bit j.
+    """
+    return int(''.join('1' if cell else '0' for cell in reversed(row)), 2)
+
+
+def _int_to_row(value, col_count):
+    """ Unpack an int into a row of col_count 0/1 cells.
+    """
+    bits = bin(value)[:1:-1]
+    return [int(bit) for bit in bits[:col_count]] + \
+           [0] * (col_count - len(bits))
+
+
+def _int_to_bytes(value, length):
+    return binascii.unhexlify('%0*x' % (length*2, value))[::-1]
+
+
+def _bytes_to_int(data):
+    return int(binascii.hexlify(data[::-1]) or '0', 16)
+
+
+def _write_varint(fileobj, value):
+    while value >= 0x80:
+        fileobj.write(chr((value & 0x7F) | 0x80))
+        value >>= 7
+    fileobj.write(chr(value))
+
+
+def _read_varint(fileobj):
+    """ Read a varint, or return None at the end of the file.
+    """
+    value, shift = 0, 0
+    while True:
+        data = fileobj.read(1)
+        if not data:
+            if shift:
+                raise ValueError('truncated snapshot')
+            return None
+        value |= (ord(data) & 0x7F) << shift
+        if ord(data) < 0x80:
+            return value
+        shift += 7
+
+
+def save(current_board, path, compress=False):
+    """ Write board (a list of lists, or a bit_board.BitBoard) to path
+    as a snapshot, run-length compressed if compress is True.
+    """
+    if isinstance(current_board, bit_board.BitBoard):
+        rows, col_count = current_board.rows, current_board.col_count
+    else:
+        rows = (_row_to_int(row) for row in current_board)
+        col_count = len(current_board[0])
+    stride = (col_count + 7) // 8
+
+    with open(path, 'wb') as fileobj:
+        fileobj.write(HEADER.pack(MAGIC, VERSION,
+                                  FLAG_RLE if compress else 0,
+                                  len(current_board), col_count))
+        if not compress:
+            for value in rows:
+                fileobj.write(_int_to_bytes(value, stride))
+            return
+
+        # Runs carry on across rows, so empty space compresses well
+        run_byte, run_length = None, 0
+        for value in rows:
+            for byte in _int_to_bytes(value, stride):
+                if byte == run_byte:
+                    run_length += 1
+                    continue
+                if run_length:
+                    _write_varint(fileobj, run_length)
+                    fileobj.write(run_byte)
+                run_byte, run_length = byte, 1
+        if run_length:
+            _write_varint(fileobj, run_length)
+            fileobj.write(run_byte)
+
+
+def _read_header(fileobj):
+    data = fileobj.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError('not a snapshot')
+    magic, version, flags, row_count, col_count = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError('not a snapshot')
+    if version != VERSION:
+        raise ValueError('unsupported snapshot version {0}'.format(version))
+    return row_count, col_count, flags
+
+
+def read_header(path):
+    """ Return (row count, column count, compressed) of a snapshot.
+    """
+    with open(path, 'rb') as fileobj:
+        row_count, col_count, flags = _read_header(fileobj)
+    return row_count, col_count, bool(flags & FLAG_RLE)
+
+
+def _iter_rle_rows(fileobj, stride):
+    """ Yield the bytes of each row of a compressed snapshot, decoding
+    runs only as they are needed.
+    """
+    parts, filled = [], 0
+    run_byte, run_length = None, 0
+    while True:
+        if not run_length:
+            run_length = _read_varint(fileobj)
+            if run_length is None:
+                return
+            run_byte = fileobj.read(1)
+            if not run_byte:
+                raise ValueError('truncated snapshot')
+        take = min(stride - filled, run_length)
+        parts.append(run_byte * take)
+        filled += take
+        run_length -= take
+        if filled == stride:
+            yield ''.join(parts)
+            parts, filled = [], 0
+
+
+def _iter_rows(path, top=0, rows=None, first_byte=0, last_byte=None):
+    """ Yield (row count, column count) of the snapshot, followed by
+    bytes first_byte to last_byte (excluding) of rows top to top+rows,
+    to the end of the rows if None.
+    Uncompressed snapshots are memory-mapped, and only the rows and
+    bytes asked for are read.
+    """
+    with open(path, 'rb') as fileobj:
+        row_count, col_count, flags = _read_header(fileobj)
+        yield row_count, col_count
+
+        stride = (col_count + 7) // 8
+        end = row_count if rows is None else min(row_count, top + rows)
+        if last_byte is None:
+            last_byte = stride
+        if flags & FLAG_RLE:
+            decoded = 0
+            for data in _iter_rle_rows(fileobj, stride):
+                if decoded >= end:
+                    return
+                if decoded >= top:
+                    yield data[first_byte:last_byte]
+                decoded += 1
+            if decoded < end:
+                raise ValueError('truncated snapshot')
+            return
+
+        snapshot_map = mmap.mmap(fileobj.fileno(), 0,
+                                 access=mmap.ACCESS_READ)
+        try:
+            if len(snapshot_map) < HEADER.size + row_count * stride:
+                raise ValueError('truncated snapshot')
+            for i in xrange(top, end):
+                offset = HEADER.size + i * stride
+                yield snapshot_map[offset+first_byte:offset+last_byte]
+        finally:
+            snapshot_map.close()
+
+
+def load(path, top=0, left=0, rows=None, cols=None):
+    """ Load a snapshot as a list of lists board. Only the region with
+    its top left cell at (top, left) and rows x cols in size (up to the
+    edges of the snapshot if None) is materialized.
+    """
+    row_count, col_count, compressed = read_header(path)
+    if rows is None:
+        rows = row_count - top
+    if cols is None:
+        cols = col_count - left
+    if row_count < top + rows or \
+            col_count < left + cols or \
+            top < 0 or \
+            left < 0 or \
+            rows < 0 or \
+            cols < 0:
+        raise IndexError
+
+    row_iter = _iter_rows(path, top, rows, left // 8, (left + cols + 7) // 8)
+    next(row_iter)
+    shift, mask = left % 8, (1 << cols) - 1
+    return [_int_to_row((_bytes_to_int(data) >> shift) & mask, cols)
+            for data in row_iter]
+
+
+def load_bit_board(path):
+    """ Load a whole snapshot as a bit_board.BitBoard.
+    """
+    row_iter = _iter_rows(path)
+    row_count, col_count = next(row_iter)
+    return bit_board.BitBoard([_bytes_to_int(data) for data in row_iter],
+                              col_count)
+
+
+def load_into(target_board, path, top_row=0, left_col=0):
+    """ Takes each live cell in the snapshot and loads to board, setting
+    the top left based on the coordinates entered, as load_construct
+    does for a construct.
+    """
+    row_iter = _iter_rows(path)
+    con_row, con_col = next(row_iter)
+    max_row, max_col = len(target_board), len(target_board[0])
+    if max_row < con_row + top_row or \
+            max_col < con_col + left_col or \
+            top_row < 0 or \
+            left_col < 0:
+        raise IndexError
+
+    for i, data in enumerate(row_iter):
+        value = _bytes_to_int(data)
+        target_row = target_board[i+top_row]
+        j = left_col
+        while value:
+            if value & 1:
+                target_row[j] = 1
+            value >>= 1
+            j += 1
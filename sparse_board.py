@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Sparse version of the board, holding only the set of live cell
+coordinates. Each generation only visits live cells and their neighbors,
+so the cost of a step grows with the population rather than the size
+of the board. The board size is still needed for the edges, which follow
+the boundary modes of board.py: live cells on the edges get ghost copies
+just beyond the board (on the opposite side for board.TORUS, the same
+side for board.MIRROR), which are counted as neighbors like live cells.
+"""
+
+import board
+
+NEIGHBOR_OFFSETS = ((-1, -1), (-1, 0), (-1, 1),
+                    (0, -1),           (0, 1),
+                    (1, -1),  (1, 0),  (1, 1))
+
+
+def to_live_set(dense_board):
+    """ Takes a list of lists board and returns the set of coords of
+    its live cells.
+    """
+    return set(board.get_coords(dense_board))
+
+
+def to_board(live, row_count, col_count):
+    """ Takes a set of live coords and returns a row_count x col_count
+    list of lists board.
+    """
+    dense_board = board.create_board(row_count, col_count)
+    for row, col in live:
+        dense_board[row][col] = 1
+    return dense_board
+
+
+def _ghost_indices(index, count, boundary):
+    """ Returns the indices just beyond the edges (-1 and count) which
+    hold a copy of index, following the boundary mode.
+    """
+    ghosts = []
+    if boundary == board.TORUS:
+        if index == count - 1:
+            ghosts.append(-1)
+        if index == 0:
+            ghosts.append(count)
+    elif boundary == board.MIRROR:
+        if index == 0:
+            ghosts.append(-1)
+        if index == count - 1:
+            ghosts.append(count)
+    elif boundary != board.DEAD:
+        raise ValueError('unknown boundary mode: {0!r}'.format(boundary))
+    return ghosts
+
+
+def ghost_cells(live, row_count, col_count, boundary=board.DEAD):
+    """ Yields the coords beyond the edges of the board holding a copy of
+    a live cell, following the boundary mode. Only live cells on the
+    edges have copies.
+    """
+    if boundary == board.DEAD:
+        return
+    for row, col in live:
+        rows = _ghost_indices(row, row_count, boundary)
+        cols = _ghost_indices(col, col_count, boundary)
+        if not rows and not cols:
+            continue
+        for ghost_row in [row] + rows:
+            for ghost_col in [col] + cols:
+                if (ghost_row, ghost_col) != (row, col):
+                    yield (ghost_row, ghost_col)
+
+
+def neighbor_counts(live, row_count, col_count, boundary=board.DEAD):
+    """ Returns a dict of coord -> number of alive neighbors, for every
+    cell on the board with at least one alive neighbor.
+    """
+    counts = {}
+    for cells in (live, ghost_cells(live, row_count, col_count, boundary)):
+        for row, col in cells:
+            for d_row, d_col in NEIGHBOR_OFFSETS:
+                coord = (row + d_row, col + d_col)
+                counts[coord] = counts.get(coord, 0) + 1
+
+    # Drop the cells that fell outside the board; only cells next to
+    # the edges can produce these, so this stays proportional to live.
+    return dict((coord, count) for coord, count in counts.iteritems()
+                if 0 <= coord[0] < row_count and 0 <= coord[1] < col_count)
+
+
+def next_live(live, row_count, col_count, boundary=board.DEAD,
+              rule=board.CONWAY):
+    """ Takes the set of live coords and returns the set of live coords
+    for the next generation, following the same rules as board.next_board.
+    Rules with births on 0 neighbors would fill the empty parts of the
+    board, which are not visited, so they raise ValueError.
+    """
+    if 0 in rule.birth:
+        raise ValueError('rules with B0 are not supported')
+    counts = neighbor_counts(live, row_count, col_count, boundary)
+    table = rule.table
+    new_live = set(coord for coord, count in counts.iteritems()
+                   if table[(coord in live) * 9 + count])
+    if 0 in rule.survive:
+        new_live.update(coord for coord in live if coord not in counts)
+    return new_live
+
+
+def next_board(dense_board, boundary=board.DEAD, rule=board.CONWAY):
+    """ Drop-in replacement for board.next_board, converting to and from
+    a live set around a single call to next_live.
+    """
+    max_row, max_col = len(dense_board), len(dense_board[0])
+    live = next_live(to_live_set(dense_board), max_row, max_col,
+                     boundary, rule)
+    return to_board(live, max_row, max_col)
@@ -0,0 +1,202 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the benchmark harness
+"""
+
+import json
+import os
+import random
+import shutil
+import StringIO
+import subprocess
+import sys
+import tempfile
+import unittest
+import benchmark
+import block_table
+import board
+
+class TestBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        """ Caching block tables to the temporary directory, and capturing
+        the results main prints
+        """
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.old_cache_dir = block_table.CACHE_DIR
+        block_table.CACHE_DIR = self.tmp_dir
+        self.stdout = sys.stdout
+        sys.stdout = StringIO.StringIO()
+
+
+    def tearDown(self):
+        sys.stdout = self.stdout
+        block_table.CACHE_DIR = self.old_cache_dir
+        shutil.rmtree(self.tmp_dir)
+
+
+    def test_patterns(self):
+        """ Patterns have the requested size, and the ash is still
+        """
+
+        for name, pattern in benchmark.PATTERNS.items():
+            initial = pattern(40, 50, random.Random(0))
+            self.assertEqual((40, 50), (len(initial), len(initial[0])))
+            self.assertTrue(any(map(any, initial)))
+
+        ash = benchmark.ash_pattern(40, 40, random.Random(0))
+        self.assertEqual(ash, board.next_board(ash))
+
+
+    def test_run_case(self):
+        """ Every engine runs a small case and reports its rates
+        """
+
+        for engine in benchmark.ENGINES:
+            try:
+                result = benchmark.run_case(engine, 16, 'soup', 2)
+            except ImportError:
+                continue
+            self.assertEqual((engine, 16, 'soup', 2),
+                    benchmark.case_key(result))
+            self.assertTrue(result['generations_per_second'] > 0)
+            self.assertEqual(result['generations_per_second'] * 256,
+                    result['cells_per_second'])
+
+
+    def test_compare(self):
+        """ Only cases slower than the baseline by more than the
+        tolerance are reported.
+        """
+
+        def results(*rates):
+            return {'results': [{'engine': 'board', 'size': 80,
+                                 'pattern': pattern, 'generations': 10,
+                                 'generations_per_second': rate}
+                                for pattern, rate in rates]}
+
+        baseline = results(('soup', 100.0), ('ash', 100.0))
+        new = results(('soup', 85.0), ('ash', 70.0), ('gliders', 1.0))
+        self.assertEqual([(('board', 80, 'ash', 10), 100.0, 70.0)],
+                benchmark.compare(new, baseline, 0.2))
+
+
+    def test_main(self):
+        """ Writes results to a file and fails on regressions
+        """
+
+        output = os.path.join(self.tmp_dir, 'results.json')
+        baseline = os.path.join(self.tmp_dir, 'baseline.json')
+        benchmark.main(['--engines', 'bit', '--sizes', '16',
+                        '--patterns', 'gliders', '--generations', '1,2',
+                        '--output', output])
+        with open(output) as f:
+            results = json.load(f)
+        self.assertEqual(2, len(results['results']))
+
+        for result in results['results']:
+            result['generations_per_second'] *= 1000
+        with open(baseline, 'w') as f:
+            json.dump(results, f)
+        self.assertRaises(SystemExit, benchmark.main,
+                ['--engines', 'bit', '--sizes', '16',
+                 '--patterns', 'gliders', '--generations', '1,2',
+                 '--output', output, '--baseline', baseline])
+
+
+    def test_missing_engine(self):
+        """ An engine which cannot be imported is skipped for every case,
+        whether or not the cases run in their own process
+        """
+
+        def missing_engine(initial):
+            import no_such_module
+        output = os.path.join(self.tmp_dir, 'results.json')
+        benchmark.ENGINES['missing'] = missing_engine
+        try:
+            for isolate in ([], ['--no-isolate']):
+                sys.stdout = StringIO.StringIO()
+                benchmark.main(['--engines', 'missing,bit', '--sizes', '8,16',
+                                '--patterns', 'soup', '--output', output]
+                               + isolate)
+                self.assertEqual(1, sys.stdout.getvalue().count('skipped'))
+                with open(output) as f:
+                    results = json.load(f)['results']
+                self.assertEqual(['bit', 'bit'],
+                        [result['engine'] for result in results])
+        finally:
+            del benchmark.ENGINES['missing']
+
+
+
+
+class TestStartup(unittest.TestCase):
+
+    def setUp(self):
+        """ Capturing the times main prints
+        """
+
+        self.stdout = sys.stdout
+        sys.stdout = StringIO.StringIO()
+
+
+    def tearDown(self):
+        sys.stdout = self.stdout
+
+
+    def test_measure_startup(self):
+        """ The code is run in a fresh interpreter, from the directory of
+        the benchmark, each time, and a failing run is an error. Whether
+        the default code fits the budget is left to --startup, as the time
+        depends on the machine.
+        """
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'runs')
+            code = 'import benchmark; open({0!r}, "a").write("x")'.format(
+                    path)
+            seconds = benchmark.measure_startup(code, repeat=3)
+            self.assertTrue(0 < seconds)
+            with open(path) as f:
+                self.assertEqual('xxx', f.read())
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        self.assertRaises(subprocess.CalledProcessError,
+                          benchmark.measure_startup,
+                          'import sys; sys.exit(1)', 1)
+
+
+    def test_main_startup(self):
+        """ --startup fails once over the budget
+        """
+
+        budget = benchmark.STARTUP_BUDGET
+        try:
+            benchmark.STARTUP_BUDGET = 1000
+            benchmark.main(['--startup'])
+            benchmark.STARTUP_BUDGET = 0
+            self.assertRaises(SystemExit, benchmark.main, ['--startup'])
+        finally:
+            benchmark.STARTUP_BUDGET = budget
+
+
+    def test_lazy_imports(self):
+        """ Importing main and looking up the engines does not import
+        Tkinter, the gui or NumPy
+        """
+
+        code = ('import sys, board, main; board.available_engines(); '
+                'board.next_board(board.create_board(8, 8)); '
+                'print sorted(set(["Tkinter", "ttk", "gui", "numpy"]) & '
+                'set(sys.modules))')
+        output = subprocess.check_output([sys.executable, '-c', code],
+                cwd=os.path.dirname(os.path.abspath(benchmark.__file__)))
+        self.assertEqual('[]', output.strip())
+
+
+if __name__ == '__main__':
+    unittest.main()
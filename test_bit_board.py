@@ -0,0 +1,177 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the bit-packed board against board.py
+"""
+
+import random
+import unittest
+import board
+import bit_board
+
+class TestBitBoardFunctions(unittest.TestCase):
+
+    def setUp(self):
+        """ Creating a construct for loading, and a board with a glider,
+        beacon and blinker next to the board edge.
+        """
+
+        self.construct1 = [
+                [1, 0, 0],
+                [1, 1, 1],
+                [1, 1, 0],
+                [1, 0, 0],
+                [1, 0, 0],
+                ]
+
+        self.sample_board = [
+                [0, 0, 0, 0, 0, 0, 1, 1, 1],
+                [0, 0, 1, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 1, 0, 0, 0, 0, 0],
+                [0, 1, 1, 1, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 1, 1],
+                [0, 0, 0, 0, 0, 0, 0, 1, 1],
+                [0, 0, 0, 0, 0, 1, 1, 0, 0],
+                [0, 0, 0, 0, 0, 1, 1, 0, 0],
+                ]
+
+        self.random = random.Random(1234)
+
+
+    def tearDown(self):
+        del self.construct1
+        del self.sample_board
+        del self.random
+
+
+    def test_create_board(self):
+        """ A new board has the right size and no live cells
+        """
+
+        new_board = bit_board.create_board(5, 7)
+        self.assertEqual(board.create_board(5, 7),
+                bit_board.to_board(new_board))
+
+
+    def test_round_trip(self):
+        """ Converting to a BitBoard and back gives the original board
+        """
+
+        self.assertEqual(self.sample_board,
+                bit_board.to_board(bit_board.from_board(self.sample_board)))
+
+
+    def test_load_construct(self):
+        """ Loading a construct sets the same cells as board.load_construct,
+        and raises IndexError if it does not fit.
+        """
+
+        expected = board.create_board(9, 9)
+        board.load_construct(expected, self.construct1, 1, 2)
+
+        new_board = bit_board.create_board(9, 9)
+        bit_board.load_construct(new_board, self.construct1, 1, 2)
+        self.assertEqual(expected, bit_board.to_board(new_board))
+        self.assertRaises(IndexError, bit_board.load_construct,
+                new_board, self.construct1, 7, 5)
+
+
+    def test_get_coords(self):
+        """ Same coords, in the same order, as board.get_coords
+        """
+
+        self.assertEqual(list(board.get_coords(self.sample_board)),
+                list(bit_board.get_coords(
+                    bit_board.from_board(self.sample_board))))
+
+
+    def test_next_board_sample(self):
+        """ Same next state as board.next_board on the edge sample
+        """
+
+        self.assertEqual(board.next_board(self.sample_board),
+                bit_board.to_board(bit_board.next_board(
+                    bit_board.from_board(self.sample_board))))
+
+
+    def test_next_board_random(self):
+        """ Same next states as board.next_board over several generations
+        of random boards, including rows wider than 64 cells.
+        """
+
+        for rows, cols in [(1, 1), (1, 7), (6, 1), (13, 29), (20, 150)]:
+            expected = [[int(self.random.random() < 0.4)
+                         for j in xrange(cols)] for i in xrange(rows)]
+            packed = bit_board.from_board(expected)
+            for generation in xrange(5):
+                expected = board.next_board(expected)
+                packed = bit_board.next_board(packed)
+                self.assertEqual(expected, bit_board.to_board(packed))
+
+
+    def test_diff_boards(self):
+        """ Same births and deaths as board.diff_boards
+        """
+
+        next_board = board.next_board(self.sample_board)
+        self.assertEqual(board.diff_boards(self.sample_board, next_board),
+                bit_board.diff_boards(bit_board.from_board(self.sample_board),
+                                      bit_board.from_board(next_board)))
+
+
+    def test_cell_functions(self):
+        """ get_value, set_alive and set_dead behave as in board.py,
+        including IndexError if out of range.
+        """
+
+        packed = bit_board.from_board(self.sample_board)
+        self.assertEqual(1, bit_board.get_value(packed, 0, 8))
+        self.assertEqual(0, bit_board.get_value(packed, 4, 4))
+
+        bit_board.set_alive(packed, 4, 4)
+        bit_board.set_dead(packed, 0, 8)
+        self.assertEqual(1, bit_board.get_value(packed, 4, 4))
+        self.assertEqual(0, bit_board.get_value(packed, 0, 8))
+
+        self.assertRaises(IndexError, bit_board.get_value, packed, 9, 1)
+        self.assertRaises(IndexError, bit_board.set_alive, packed, 5, 11)
+        self.assertRaises(IndexError, bit_board.set_dead, packed, -1, 0)
+
+
+    def test_boundary_modes(self):
+        """ Same next states as board.next_board with each boundary mode
+        """
+
+        for boundary in board.BOUNDARIES:
+            for rows, cols in ((1, 5), (7, 1), (12, 9)):
+                expected = [[int(self.random.random() < 0.4)
+                             for j in xrange(cols)] for i in xrange(rows)]
+                packed = bit_board.from_board(expected)
+                for generation in xrange(5):
+                    expected = board.next_board(expected, boundary)
+                    packed = bit_board.next_board(packed, boundary)
+                    self.assertEqual(expected, bit_board.to_board(packed))
+        self.assertRaises(ValueError, bit_board.next_board,
+                bit_board.from_board(self.sample_board), 'klein')
+
+
+    def test_rules(self):
+        """ Same next states as board.next_board with other rules,
+        including births on 0 neighbors and survival on 8.
+        """
+
+        for notation in ('B36/S23', 'B2/S', 'B3/S012345678', 'B1357/S1357') + ('B0/S8',):
+            rule = board.parse_rule(notation)
+            expected = [[int(self.random.random() < 0.4)
+                         for j in xrange(13)] for i in xrange(10)]
+            packed = bit_board.from_board(expected)
+            for generation in xrange(5):
+                expected = board.next_board(expected, board.TORUS, rule)
+                packed = bit_board.next_board(packed, board.TORUS, rule)
+                self.assertEqual(expected, bit_board.to_board(packed))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the block table board update against board.next_board
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+import block_table
+import board
+
+
+class TestBlockTable(unittest.TestCase):
+
+    def setUp(self):
+        """ Caching tables to a temporary directory, starting with none
+        loaded.
+        """
+
+        self.random = random.Random(1234)
+        self.cache_dir = tempfile.mkdtemp()
+        self.old_cache_dir = block_table.CACHE_DIR
+        block_table.CACHE_DIR = self.cache_dir
+        block_table._tables.clear()
+
+
+    def tearDown(self):
+        block_table.CACHE_DIR = self.old_cache_dir
+        block_table._tables.clear()
+        shutil.rmtree(self.cache_dir)
+        del self.random
+        del self.cache_dir
+
+
+    def random_board(self, rows, cols, density=0.4):
+        return [[int(self.random.random() < density) for j in xrange(cols)]
+                for i in xrange(rows)]
+
+
+    def test_build_table(self):
+        """ A block is still, a blinker turns, and an empty 4x4 block stays
+        empty; cell row, col of a block is bit col*4 + row.
+        """
+
+        def index(cells):
+            return sum(1 << (col*4 + row) for row, col in cells)
+
+        table = block_table.build_table()
+        self.assertEqual(1 << 16, len(table))
+        self.assertEqual(0, table[0])
+        self.assertEqual(15, table[index([(1, 1), (1, 2), (2, 1), (2, 2)])])
+        # Blinker down column 1 turns along row 1: the top center cells
+        self.assertEqual(3, table[index([(0, 1), (1, 1), (2, 1)])])
+
+
+    def test_next_board(self):
+        """ Same next states as board.next_board, for boards of odd and
+        even sizes, with each boundary mode and other rules.
+        """
+
+        rules = [board.CONWAY, board.parse_rule('B36/S23'),
+                 board.parse_rule('B2/S'), board.parse_rule('B3/S012345678')]
+        for rows, cols in ((1, 1), (1, 6), (5, 1), (3, 3), (7, 9),
+                           (8, 8), (10, 13), (33, 31)):
+            current = self.random_board(rows, cols)
+            for boundary in board.BOUNDARIES:
+                for rule in rules:
+                    self.assertEqual(
+                            board.next_board(current, boundary, rule),
+                            block_table.next_board(current, boundary, rule))
+
+        self.assertRaises(ValueError, block_table.next_board,
+                          self.random_board(4, 4), 'sphere')
+
+
+    def test_generations(self):
+        """ Stays the same as board.next_board over many generations.
+        """
+
+        expected = current = self.random_board(30, 41, 0.35)
+        for generation in xrange(30):
+            expected = board.next_board(expected, board.TORUS)
+            current = block_table.next_board(current, board.TORUS)
+        self.assertEqual(expected, current)
+
+
+    def test_cache(self):
+        """ The table is written to its cache file, in a private directory
+        made if needed, and loaded from it.
+        """
+
+        block_table.CACHE_DIR = os.path.join(self.cache_dir, 'cache')
+        path = block_table.cache_path()
+        table = block_table.get_table()
+        self.assertTrue(block_table.get_table() is table)
+        self.assertEqual(0700, os.stat(block_table.CACHE_DIR).st_mode & 0777)
+        self.assertEqual([os.path.basename(path)],
+                         os.listdir(block_table.CACHE_DIR))
+        with open(path, 'rb') as f:
+            self.assertTrue(f.readline().startswith('block_table B3/S23 '))
+            self.assertEqual(table, bytearray(f.read()))
+
+        block_table._tables.clear()
+        build_table = block_table.build_table
+        block_table.build_table = None
+        try:
+            self.assertEqual(table, block_table.get_table())
+        finally:
+            block_table.build_table = build_table
+
+
+    def test_bad_cache(self):
+        """ The table is rebuilt, and the cache file rewritten, if the file
+        is not a whole table of the rule with the checksum in its header.
+        """
+
+        path = block_table.cache_path()
+        table = block_table.get_table()
+        with open(path, 'rb') as f:
+            header = f.readline()
+        highlife = board.parse_rule('B36/S23')
+        block_table.get_table(highlife)
+        with open(block_table.cache_path(highlife), 'rb') as f:
+            other_rule = f.read()
+
+        tampered = bytearray(table)
+        tampered[1234] ^= 1
+        for contents in ('\xff' * (1 << 16), header + '\x00' * 100,
+                         header + str(tampered), other_rule):
+            block_table._tables.clear()
+            with open(path, 'wb') as f:
+                f.write(contents)
+            self.assertEqual(table, block_table.get_table())
+            with open(path, 'rb') as f:
+                self.assertEqual(header + str(table), f.read())
+
+
+    def test_cache_per_rule(self):
+        highlife = board.parse_rule('B36/S23')
+        self.assertNotEqual(block_table.cache_path(),
+                            block_table.cache_path(highlife))
+        self.assertNotEqual(block_table.get_table(),
+                            block_table.get_table(highlife))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,11 @@
 """ Testing board creation, loading and updating
 """
 
+import random
+import shutil
+import tempfile
 import unittest
+import block_table
 import board
 
 class TestBoardFunctions(unittest.TestCase):
@@ -252,6 +256,133 @@ class TestBoardFunctions(unittest.TestCase):
 
         self.assertEqual(sample_next_board, board.next_board(sample_initial_board))
 
+
+    def test_next_board_dead_edges(self):
+        """ With dead edges, next_board gives the same states as counting
+        the neighbors of each cell with sum_neighbors, over random boards
+        of various shapes.
+        """
+
+        def reference_next_board(current_board):
+            max_row, max_col = len(current_board), len(current_board[0])
+            new_board = board.create_board(max_row, max_col)
+            for i in xrange(max_row):
+                for j in xrange(max_col):
+                    alive = board.sum_neighbors(i, j, current_board)
+                    if alive == 3 or (alive == 2 and current_board[i][j]):
+                        new_board[i][j] = 1
+            return new_board
+
+        rand = random.Random(1234)
+        for rows, cols in ((1, 1), (1, 7), (6, 1), (9, 9), (17, 23)):
+            current_board = [[int(rand.random() < 0.4) for j in xrange(cols)]
+                             for i in xrange(rows)]
+            for generation in xrange(5):
+                expected = reference_next_board(current_board)
+                self.assertEqual(expected, board.next_board(current_board))
+                self.assertEqual(expected,
+                        board.next_board(current_board, board.DEAD))
+                current_board = expected
+
+
+    def test_pad_board(self):
+        """ Check the ghost cells of each boundary mode
+        """
+
+        sample_board = [
+                [1, 0, 0],
+                [0, 0, 1],
+                ]
+
+        self.assertEqual([
+                [0, 0, 0, 0, 0],
+                [0, 1, 0, 0, 0],
+                [0, 0, 0, 1, 0],
+                [0, 0, 0, 0, 0],
+                ], board.pad_board(sample_board, board.DEAD))
+        self.assertEqual([
+                [1, 0, 0, 1, 0],
+                [0, 1, 0, 0, 1],
+                [1, 0, 0, 1, 0],
+                [0, 1, 0, 0, 1],
+                ], board.pad_board(sample_board, board.TORUS))
+        self.assertEqual([
+                [1, 1, 0, 0, 0],
+                [1, 1, 0, 0, 0],
+                [0, 0, 0, 1, 1],
+                [0, 0, 0, 1, 1],
+                ], board.pad_board(sample_board, board.MIRROR))
+        self.assertRaises(ValueError, board.pad_board, sample_board, 'klein')
+
+
+    def test_next_board_torus(self):
+        """ On a torus, a glider leaving one edge comes back on the
+        opposite one, and is back where it started after 4 generations
+        per cell of the board side.
+        """
+
+        glider = [
+                [0, 1, 0],
+                [0, 0, 1],
+                [1, 1, 1],
+                ]
+        initial = board.create_board(8, 8)
+        board.load_construct(initial, glider, 5, 5)
+
+        current_board = initial
+        for generation in xrange(32):
+            current_board = board.next_board(current_board, board.TORUS)
+            self.assertEqual(5, sum(map(sum, current_board)))
+        self.assertEqual(initial, current_board)
+
+
+    def test_next_board_mirror(self):
+        """ With mirrored edges, a pair of cells on an edge forms a block
+        with its own reflection, and so stays alive, while it dies with
+        dead edges.
+        """
+
+        sample_initial_board = [
+                [0, 1, 1, 0, 0],
+                [0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0],
+                ]
+
+        self.assertEqual(sample_initial_board,
+                board.next_board(sample_initial_board, board.MIRROR))
+        self.assertEqual(board.create_board(3, 5),
+                board.next_board(sample_initial_board, board.DEAD))
+
+
+    def test_diff_boards(self):
+        """ Check diff_boards lists the cells that were born and died
+        between a blinker and its next state.
+        """
+
+        sample_old_board = [
+                [0, 0, 0, 0, 0],
+                [0, 0, 1, 0, 0],
+                [0, 0, 1, 0, 0],
+                [0, 0, 1, 0, 0],
+                [0, 0, 0, 0, 0],
+                ]
+
+        sample_new_board = [
+                [0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0],
+                [0, 1, 1, 1, 0],
+                [0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0],
+                ]
+
+        births = [(2, 1), (2, 3)]
+        deaths = [(1, 2), (3, 2)]
+
+        self.assertEqual((births, deaths),
+                board.diff_boards(sample_old_board, sample_new_board))
+        self.assertEqual(([], []),
+                board.diff_boards(sample_old_board, sample_old_board))
+
     def test_get_value(self):
         """ Check the get_value function returns the correct value
         if available, and IndexError if out of range.
@@ -346,6 +477,163 @@ class TestBoardFunctions(unittest.TestCase):
         self.assertRaises(IndexError, board.set_dead, sample_board1, 9, 8)
 
 
+    def test_parse_rule(self):
+        """ Check rules are parsed from B/S and S/B notation into their
+        transition tables, and invalid rules raise ValueError.
+        """
+
+        highlife = board.parse_rule('b36/s23')
+        self.assertEqual('B36/S23', highlife.notation)
+        self.assertEqual(frozenset([3, 6]), highlife.birth)
+        self.assertEqual(frozenset([2, 3]), highlife.survive)
+        self.assertEqual((0, 0, 0, 1, 0, 0, 1, 0, 0,
+                          0, 0, 1, 1, 0, 0, 0, 0, 0), highlife.table)
+
+        self.assertEqual(board.CONWAY, board.parse_rule('23/3'))
+        self.assertEqual(board.CONWAY, board.parse_rule('S23/B3'))
+        self.assertEqual(frozenset(), board.parse_rule('B2/S').survive)
+        for notation in ('B3S23', 'B9/S23', 'Bx/S23', 'B3/S23/C2'):
+            self.assertRaises(ValueError, board.parse_rule, notation)
+
+
+    def test_next_board_rules(self):
+        """ Check next_board follows the rule: a blinker has the same next
+        state with HighLife as with Life, while with Seeds every live cell
+        dies and cells with exactly 2 live neighbors are born.
+        """
+
+        sample_initial_board = [
+                [0, 0, 0, 0, 0],
+                [0, 0, 1, 0, 0],
+                [0, 0, 1, 0, 0],
+                [0, 0, 1, 0, 0],
+                [0, 0, 0, 0, 0],
+                ]
+
+        sample_seeds_board = [
+                [0, 0, 0, 0, 0],
+                [0, 1, 0, 1, 0],
+                [0, 0, 0, 0, 0],
+                [0, 1, 0, 1, 0],
+                [0, 0, 0, 0, 0],
+                ]
+
+        self.assertEqual(board.next_board(sample_initial_board),
+                board.next_board(sample_initial_board,
+                                 rule=board.parse_rule('B36/S23')))
+        self.assertEqual(sample_seeds_board,
+                board.next_board(sample_initial_board,
+                                 rule=board.parse_rule('B2/S')))
+
+
+    def test_generations(self):
+        """ Check generations yields the same states as next_board, with
+        their populations and diffs, reusing two boards in turn.
+        """
+
+        rand = random.Random(1234)
+        initial = [[int(rand.random() < 0.4) for j in xrange(12)]
+                   for i in xrange(10)]
+        original = [row[:] for row in initial]
+        stream = board.generations(initial, boundary=board.TORUS)
+
+        previous, expected = None, initial
+        seen = []
+        for generation in xrange(8):
+            current = next(stream)
+            self.assertEqual(generation, current.generation)
+            self.assertEqual(expected, current.board)
+            self.assertEqual(sum(map(sum, expected)), current.population)
+            if previous is not None:
+                self.assertEqual(board.diff_boards(previous, expected),
+                                 (current.births, current.deaths))
+            seen.append(current.board)
+            previous, expected = expected, board.next_board(expected,
+                                                            board.TORUS)
+
+        self.assertEqual(original, initial)
+        self.assertTrue(seen[2] is seen[4] and seen[3] is seen[5])
+        self.assertFalse(seen[0] is initial)
+
+
+    def test_generations_every(self):
+        """ Check generations skips to every k-th generation, with the
+        diffs since the last one yielded, with the built in stepping and
+        with engines.
+        """
+
+        import bit_board
+        import count_board
+        import sparse_board
+
+        rand = random.Random(1234)
+        initial = [[int(rand.random() < 0.4) for j in xrange(12)]
+                   for i in xrange(10)]
+        expected = [initial]
+        for generation in xrange(9):
+            expected.append(board.next_board(expected[-1]))
+
+        for engine, start, to_board in (
+                (None, initial, lambda b: b),
+                (sparse_board, initial, lambda b: b),
+                (bit_board, bit_board.from_board(initial),
+                 bit_board.to_board),
+                (count_board, count_board.from_board(initial),
+                 count_board.to_board)):
+            stream = board.generations(start, engine, every=3)
+            for generation in (0, 3, 6, 9):
+                current = next(stream)
+                self.assertEqual(generation, current.generation)
+                self.assertEqual(expected[generation],
+                                 to_board(current.board))
+                self.assertEqual(sum(map(sum, expected[generation])),
+                                 current.population)
+                if generation:
+                    self.assertEqual(board.diff_boards(
+                            expected[generation-3], expected[generation]),
+                            (current.births, current.deaths))
+
+        self.assertRaises(ValueError, next, board.generations(initial,
+                                                              every=0))
+
+
+
+    def test_engine_registry(self):
+        """ Check engines are found without being imported, are the same
+        as next_board, and that the fastest one available comes first.
+        """
+
+        names = board.available_engines()
+        self.assertTrue('board' in names and 'sparse' in names)
+        self.assertEqual(names, [name for name in board.FASTEST
+                                 if name in names])
+        self.assertTrue(board.get_engine('board') is board)
+        self.assertTrue(board.get_engine() is
+                        board.get_engine(names[0]))
+
+        rand = random.Random(1234)
+        initial = [[int(rand.random() < 0.4) for j in xrange(12)]
+                   for i in xrange(10)]
+        cache_dir, block_table.CACHE_DIR = block_table.CACHE_DIR, \
+                                           tempfile.mkdtemp()
+        try:
+            for name in names:
+                engine = board.get_engine(name)
+                self.assertEqual(board.next_board(initial),
+                                 engine.next_board(initial))
+        finally:
+            shutil.rmtree(block_table.CACHE_DIR)
+            block_table.CACHE_DIR = cache_dir
+
+        self.assertRaises(ValueError, board.engine_available, 'missing')
+        board.ENGINES['missing'] = ('no_such_module', ())
+        try:
+            self.assertFalse(board.engine_available('missing'))
+            self.assertRaises(ImportError, board.get_engine, 'missing')
+        finally:
+            del board.ENGINES['missing']
+            del board._available['missing']
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,223 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the soup census: object splitting and classification, and
+merging of results
+"""
+
+import json
+import os
+import shutil
+import StringIO
+import sys
+import tempfile
+import unittest
+import board
+import census
+import plane
+
+
+def parse(text, top=0, left=0):
+    return [(i + top, j + left) for i, row in enumerate(text.split('/'))
+            for j, cell in enumerate(row) if cell == 'O']
+
+
+class TestClassify(unittest.TestCase):
+
+    def test_canonical(self):
+        """ Every rotation and reflection of an object gives the same
+        canonical form.
+        """
+
+        loaf = parse(census.KNOWN_OBJECTS['loaf'])
+        expected = census.canonical(loaf)
+        for transform in census.TRANSFORMS:
+            moved = [transform(row, col) for row, col in loaf]
+            self.assertEqual(census.canonical(moved), expected)
+        self.assertNotEqual(census.canonical(parse('OO./O.O/.O.')),
+                            census.canonical(parse('OO./O.O/.OO')))
+
+
+    def test_still_life(self):
+        self.assertEqual(census.classify(parse('OO/OO', 5, -7)),
+                         ('still', 1, 'still:1:OO/OO'))
+
+
+    def test_oscillator(self):
+        """ Both phases of a blinker give the same code.
+        """
+
+        self.assertEqual(census.classify(parse('OOO')),
+                         ('oscillator', 2, 'oscillator:2:OOO'))
+        self.assertEqual(census.classify(parse('O/O/O')),
+                         census.classify(parse('OOO')))
+
+
+    def test_spaceship(self):
+        """ Every phase and orientation of a glider gives the same code.
+        """
+
+        glider = parse('.O./..O/OOO')
+        kind, period, code = census.classify(glider)
+        self.assertEqual((kind, period), ('spaceship', 4))
+
+        current = plane.from_coords(glider)
+        for generation in xrange(4):
+            current = plane.next_plane(current)
+            coords = list(plane.get_coords(current))
+            self.assertEqual(census.classify(coords)[2], code)
+            flipped = [(-row, col) for row, col in coords]
+            self.assertEqual(census.classify(flipped)[2], code)
+
+
+    def test_unknown(self):
+        """ Objects not repeating within max_period generations, e.g.
+        a pattern still evolving, or dying out.
+        """
+
+        r_pentomino = parse('.OO/OO./.O.')
+        self.assertEqual(census.classify(r_pentomino)[0], 'unknown')
+        self.assertEqual(census.classify(parse('O.O'))[:2], ('unknown', 0))
+
+
+    def test_other_rule(self):
+        """ Under HighLife, the replicator pattern does not repeat but a
+        block still does.
+        """
+
+        highlife = board.parse_rule('B36/S23')
+        self.assertEqual(census.classify(parse('OO/OO'), rule=highlife)[0],
+                         'still')
+
+
+    def test_object_names(self):
+        names = census.object_names()
+        self.assertEqual(len(names), len(census.KNOWN_OBJECTS))
+        self.assertEqual(names['still:1:OO/OO'], 'block')
+        self.assertEqual(names['oscillator:2:OOO'], 'blinker')
+
+
+
+class TestSplitObjects(unittest.TestCase):
+
+    def test_components(self):
+        coords = parse('OO.../OO.O./.....//O') + [(10, 10)]
+        groups = sorted(sorted(group) for group in census.components(coords))
+        self.assertEqual(groups, [[(0, 0), (0, 1), (1, 0), (1, 1)],
+                                  [(1, 3)], [(4, 0)], [(10, 10)]])
+
+
+    def test_split_objects(self):
+        """ A block and a blinker three cells apart are split, while the
+        phases of a beacon, whose cells do not all touch, are not.
+        """
+
+        current = plane.from_coords(parse('OO...O/OO...O/.....O') +
+                                    parse('OO../O.../...O/..OO', 10, 10))
+        objects = census.split_objects(current)
+        codes = sorted(census.classify(group)[2] for group in objects)
+        self.assertEqual(codes, ['oscillator:2:OO../OO../..OO/..OO',
+                                 'oscillator:2:OOO', 'still:1:OO/OO'])
+
+
+
+class TestCensus(unittest.TestCase):
+
+    def setUp(self):
+        """ Capturing the tables main prints
+        """
+
+        self.directory = tempfile.mkdtemp()
+        self.stdout = sys.stdout
+        sys.stdout = StringIO.StringIO()
+
+
+    def tearDown(self):
+        sys.stdout = self.stdout
+        shutil.rmtree(self.directory)
+        del self.directory
+
+
+    def test_make_soup(self):
+        soup = census.make_soup(3, 8, 0.25)
+        self.assertEqual(soup, census.make_soup(3, 8, 0.25))
+        self.assertNotEqual(soup, census.make_soup(4, 8, 0.25))
+        self.assertEqual((len(soup), len(soup[0])), (8, 8))
+
+
+    def test_run_soup(self):
+        """ The objects counted make up the stable soup.
+        """
+
+        counts, generations, stabilized = census.run_soup(3)
+        self.assertTrue(stabilized)
+        self.assertTrue(0 < generations < 5000)
+        self.assertTrue(all(code.split(':')[0] != 'unknown'
+                            for code in counts))
+
+
+    def test_unstabilized(self):
+        counts, generations, stabilized = census.run_soup(
+                3, max_generations=20)
+        self.assertEqual((counts, generations, stabilized), ({}, 20, False))
+
+
+    def test_census(self):
+        """ Same counts across a pool as soup by soup.
+        """
+
+        seeds = [3, 7, 18]
+        result = census.census(seeds, jobs=2)
+        expected = {}
+        for seed in seeds:
+            for code, count in census.run_soup(seed)[0].iteritems():
+                expected[code] = expected.get(code, 0) + count
+        self.assertEqual(result['counts'], expected)
+        self.assertEqual(result['soups'], 3)
+        self.assertEqual(result['seeds'], [[3, 4], [7, 8], [18, 19]])
+        self.assertEqual(result['unstabilized'], [])
+
+
+    def test_merge(self):
+        first = census.census([3], jobs=1)
+        second = census.census([4, 7], jobs=1)
+        merged = census.merge(first, second)
+        self.assertEqual(merged['soups'], 3)
+        self.assertEqual(merged['seeds'], [[3, 5], [7, 8]])
+        self.assertEqual(merged['counts'],
+                         census.census([3, 4, 7], jobs=1)['counts'])
+
+        other = census.census([3], rule=board.parse_rule('B36/S23'), jobs=1)
+        self.assertRaises(ValueError, census.merge, first, other)
+
+
+    def test_merge_overlap(self):
+        """ Censuses sharing any seed are not merged, as their soups
+        would be counted twice.
+        """
+
+        first = census.census([3, 4], jobs=1)
+        self.assertRaises(ValueError, census.merge, first, first)
+        self.assertRaises(ValueError, census.merge, first,
+                          census.census([4, 7], jobs=1))
+
+
+    def test_main(self):
+        """ A second run merged into the results file of the first.
+        """
+
+        path = os.path.join(self.directory, 'census.json')
+        args = ['--soups', '1', '--seed', '3', '--jobs', '1',
+                '--output', path]
+        census.main(args)
+        census.main(args[:3] + ['4', '--jobs', '1', '--output', path,
+                                '--merge', path])
+        with open(path) as f:
+            result = json.load(f)
+        self.assertEqual(result['soups'], 2)
+        self.assertEqual(result['seeds'], [[3, 5]])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the incremental neighbor-count board against board.next_board
+"""
+
+import random
+import unittest
+import board
+import count_board
+
+class TestCountBoard(unittest.TestCase):
+
+    def setUp(self):
+        """ Creating a board with a glider, beacon and blinker next to
+        the board edge.
+        """
+
+        self.sample_board = [
+                [0, 0, 0, 0, 0, 0, 1, 1, 1],
+                [0, 0, 1, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 1, 0, 0, 0, 0, 0],
+                [0, 1, 1, 1, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 1, 1],
+                [0, 0, 0, 0, 0, 0, 0, 1, 1],
+                [0, 0, 0, 0, 0, 1, 1, 0, 0],
+                [0, 0, 0, 0, 0, 1, 1, 0, 0],
+                ]
+
+        self.random = random.Random(1234)
+
+
+    def tearDown(self):
+        del self.sample_board
+        del self.random
+
+
+    def random_board(self, rows, cols):
+        return [[int(self.random.random() < 0.35) for j in xrange(cols)]
+                for i in xrange(rows)]
+
+
+    def assertCounts(self, packed, boundary):
+        """ Counts kept match the neighbors counted from scratch
+        """
+
+        padded = board.pad_board(count_board.to_board(packed), boundary)
+        for row in xrange(packed.row_count):
+            for col in xrange(packed.col_count):
+                expected = sum(padded[i][j]
+                               for i in xrange(row, row+3)
+                               for j in xrange(col, col+3)) - \
+                           padded[row+1][col+1]
+                self.assertEqual(expected, packed.count(row, col))
+
+
+    def test_round_trip(self):
+        """ Converting to a CountBoard and back gives the original board
+        """
+
+        packed = count_board.from_board(self.sample_board)
+        self.assertEqual(self.sample_board, count_board.to_board(packed))
+        self.assertEqual(list(board.get_coords(self.sample_board)),
+                list(count_board.get_coords(packed)))
+        self.assertCounts(packed, board.DEAD)
+
+
+    def test_step_boundary_modes(self):
+        """ Same next states, births and deaths as board.next_board with
+        each boundary mode, over several generations of random boards.
+        """
+
+        for boundary in board.BOUNDARIES:
+            for rows, cols in ((1, 5), (7, 1), (12, 9)):
+                expected = self.random_board(rows, cols)
+                packed = count_board.from_board(expected, boundary)
+                for generation in xrange(6):
+                    new_board = board.next_board(expected, boundary)
+                    self.assertEqual(board.diff_boards(expected, new_board),
+                            count_board.step_board(packed, boundary))
+                    self.assertEqual(new_board, count_board.to_board(packed))
+                    expected = new_board
+                self.assertCounts(packed, boundary)
+
+
+    def test_step_rules(self):
+        """ Same next states as board.next_board with other rules,
+        including births on 0 neighbors.
+        """
+
+        for notation in ('B36/S23', 'B2/S', 'B0/S8', 'B3/S012345678'):
+            rule = board.parse_rule(notation)
+            expected = self.random_board(10, 13)
+            packed = count_board.from_board(expected)
+            for generation in xrange(5):
+                expected = board.next_board(expected, rule=rule)
+                count_board.step_board(packed, rule=rule)
+                self.assertEqual(expected, count_board.to_board(packed))
+
+
+    def test_toggle_between_steps(self):
+        """ Editing cells between steps, as when clicking on the canvas,
+        keeps the counts and the next states right.
+        """
+
+        expected = self.random_board(10, 10)
+        packed = count_board.from_board(expected, board.TORUS)
+        for generation in xrange(10):
+            row, col = self.random.randrange(10), self.random.randrange(10)
+            if count_board.get_value(packed, row, col):
+                count_board.set_dead(packed, row, col)
+                board.set_dead(expected, row, col)
+            else:
+                count_board.set_alive(packed, row, col)
+                board.set_alive(expected, row, col)
+            self.assertCounts(packed, board.TORUS)
+
+            expected = board.next_board(expected, board.TORUS)
+            count_board.step_board(packed, board.TORUS)
+            self.assertEqual(expected, count_board.to_board(packed))
+
+
+    def test_next_board(self):
+        """ next_board leaves the current board as it was, and the
+        boundary mode can change between steps.
+        """
+
+        packed = count_board.from_board(self.sample_board)
+        new_board = count_board.next_board(packed, board.MIRROR)
+        self.assertEqual(self.sample_board, count_board.to_board(packed))
+        self.assertEqual(board.next_board(self.sample_board, board.MIRROR),
+                count_board.to_board(new_board))
+        self.assertCounts(new_board, board.MIRROR)
+        self.assertEqual(board.diff_boards(self.sample_board,
+                                           count_board.to_board(new_board)),
+                count_board.diff_boards(packed, new_board))
+
+
+    def test_only_touched_cells(self):
+        """ Once a blinker is alone on the board, each step only looks
+        at the cells around it.
+        """
+
+        packed = count_board.create_board(50, 50)
+        count_board.load_construct(packed, [[1, 1, 1]], 20, 20)
+        count_board.step_board(packed)
+        self.assertEqual(50 * 50, packed.cells_evaluated)
+        self.assertTrue(len(packed._touched) <= 25)
+        births, deaths = count_board.step_board(packed)
+        self.assertEqual(([(20, 20), (20, 22)], [(19, 21), (21, 21)]),
+                         (births, deaths))
+        self.assertTrue(0 < packed.cells_evaluated <= 25)
+        self.assertEqual(packed.cells_evaluated,
+                         packed.copy().cells_evaluated)
+        self.assertRaises(IndexError, count_board.load_construct, packed,
+                [[1, 1, 1]], 0, 48)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing detection of extinct, still and oscillating boards
+"""
+
+import random
+import unittest
+import board
+import cycle
+
+class TestCycleDetector(unittest.TestCase):
+
+    def setUp(self):
+        """ Creating constructs for loading
+        """
+
+        self.blinker = [
+                [1, 1, 1],
+                ]
+
+        self.block = [
+                [1, 1],
+                [1, 1],
+                ]
+
+        self.glider = [
+                [0, 1, 0],
+                [0, 0, 1],
+                [1, 1, 1],
+                ]
+
+
+    def tearDown(self):
+        del self.blinker
+        del self.block
+        del self.glider
+
+
+    def run_until_cycle(self, current_board, generations=100, history=256):
+        detector = cycle.CycleDetector(current_board, history)
+        for generation in xrange(generations):
+            if detector.cycle:
+                break
+            new_board = board.next_board(current_board)
+            detector.update(*board.diff_boards(current_board, new_board))
+            current_board = new_board
+        return detector, current_board
+
+
+    def test_incremental_hash(self):
+        """ The hash updated from births and deaths is the same as the
+        hash of the whole board.
+        """
+
+        rand = random.Random(1234)
+        current_board = [[int(rand.random() < 0.3) for j in xrange(20)]
+                         for i in xrange(20)]
+        detector = cycle.CycleDetector(current_board)
+        for generation in xrange(10):
+            new_board = board.next_board(current_board)
+            detector.update(*board.diff_boards(current_board, new_board))
+            current_board = new_board
+            self.assertEqual(
+                    cycle.board_hash(board.get_coords(current_board)),
+                    detector.hash)
+            self.assertEqual(sum(map(sum, current_board)),
+                             detector.population)
+
+
+    def test_extinct(self):
+        """ An empty board is extinct right away, a lone cell after one
+        generation.
+        """
+
+        detector = cycle.CycleDetector(board.create_board(5, 5))
+        self.assertEqual(('extinct', 1, 0), detector.cycle)
+
+        current_board = board.create_board(5, 5)
+        board.set_alive(current_board, 2, 2)
+        detector, final = self.run_until_cycle(current_board)
+        self.assertEqual(('extinct', 1, 1), detector.cycle)
+
+
+    def test_still(self):
+        """ A block is still from the start
+        """
+
+        current_board = board.create_board(6, 6)
+        board.load_construct(current_board, self.block, 2, 2)
+        detector, final = self.run_until_cycle(current_board)
+        self.assertEqual(('still', 1, 0), detector.cycle)
+        self.assertEqual(1, detector.generation)
+
+
+    def test_oscillator(self):
+        """ A blinker repeats every 2 generations, and the generations
+        needed to reach any later generation are less than that.
+        """
+
+        current_board = board.create_board(5, 5)
+        board.load_construct(current_board, self.blinker, 2, 1)
+        detector, final = self.run_until_cycle(current_board)
+        self.assertEqual(('oscillator', 2, 0), detector.cycle)
+        self.assertEqual(0, detector.remaining(1000))
+        self.assertEqual(1, detector.remaining(1001))
+
+
+    def test_history(self):
+        """ A glider turns into a block in a corner, which is still;
+        with too short a history a longer cycle would be missed.
+        """
+
+        current_board = board.create_board(8, 8)
+        board.load_construct(current_board, self.glider, 0, 0)
+        detector, final = self.run_until_cycle(current_board, history=1)
+        self.assertEqual('still', detector.cycle.kind)
+        self.assertEqual(final, board.next_board(final))
+
+        current_board = board.create_board(5, 5)
+        board.load_construct(current_board, self.blinker, 2, 1)
+        detector, final = self.run_until_cycle(current_board, 10, history=1)
+        self.assertEqual(None, detector.cycle)
+        self.assertRaises(ValueError, detector.remaining, 100)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
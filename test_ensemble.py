@@ -0,0 +1,120 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the batched ensemble against board.next_board
+"""
+
+import random
+import unittest
+import board
+
+try:
+    import ensemble
+except ImportError:
+    ensemble = None
+
+
+@unittest.skipIf(ensemble is None, "numpy is not installed")
+class TestEnsemble(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(1234)
+
+
+    def tearDown(self):
+        del self.random
+
+
+    def random_board(self, rows, cols, density=0.35):
+        return [[int(self.random.random() < density) for j in xrange(cols)]
+                for i in xrange(rows)]
+
+
+    def test_next_batch(self):
+        """ Same next states as board.next_board on each board, with each
+        boundary mode and another rule.
+        """
+
+        import numpy
+        boards = [self.random_board(9, 13) for i in xrange(6)]
+        for boundary in board.BOUNDARIES:
+            for rule in (board.CONWAY, board.parse_rule('B36/S23')):
+                batch = numpy.array(boards, dtype=numpy.uint8)
+                expected = boards
+                for generation in xrange(4):
+                    batch = ensemble.next_batch(batch, boundary, rule)
+                    expected = [board.next_board(b, boundary, rule)
+                                for b in expected]
+                    self.assertEqual(expected, batch.tolist())
+
+
+    def test_outcomes(self):
+        """ Known patterns end as expected: a lone cell dies out, a block
+        is still, a blinker oscillates, and a glider on a torus repeats
+        only after 32 generations.
+        """
+
+        def with_construct(construct, rows=8, cols=8):
+            new_board = board.create_board(rows, cols)
+            board.load_construct(new_board, construct, 2, 2)
+            return new_board
+
+        boards = [with_construct([[1]]),
+                  with_construct([[1, 1], [1, 1]]),
+                  with_construct([[1, 1, 1]]),
+                  with_construct([[0, 1, 0], [0, 0, 1], [1, 1, 1]]),
+                  board.create_board(8, 8)]
+        outcomes = ensemble.run_boards(boards, 100, board.TORUS,
+                                       max_period=4)
+        self.assertEqual([0, 1, 2, 3, 4],
+                         [outcome.index for outcome in outcomes])
+        self.assertEqual([('extinct', 1, 1), ('still', 1, 0),
+                          ('oscillator', 2, 0), None, ('extinct', 1, 0)],
+                         [outcome.cycle and tuple(outcome.cycle)
+                          for outcome in outcomes])
+        self.assertEqual([1, 1, 2, 100, 0],
+                         [outcome.generation for outcome in outcomes])
+        self.assertEqual([1, 0], outcomes[0].populations)
+        self.assertEqual([5] * 101, outcomes[3].populations)
+
+        glider = ensemble.run_boards(boards[3:4], 100, board.TORUS,
+                                     max_period=32)[0]
+        self.assertEqual(('oscillator', 32, 0), tuple(glider.cycle))
+        self.assertEqual(boards[3], glider.board)
+
+
+    def test_matches_next_board(self):
+        """ Final boards and populations of random soups match stepping
+        each one with board.next_board, and finished boards are taken
+        out of the batch.
+        """
+
+        boards = [self.random_board(12, 12, self.random.random())
+                  for i in xrange(40)]
+        runs = ensemble.Ensemble(boards)
+        for generation in xrange(60):
+            runs.step()
+        self.assertTrue(len(runs) < 40)
+        self.assertEqual(40, len(runs.outcomes) + len(runs))
+        outcomes = runs.run(0)
+
+        for initial, outcome in zip(boards, outcomes):
+            expected = initial
+            populations = [sum(map(sum, expected))]
+            for generation in xrange(outcome.generation):
+                expected = board.next_board(expected)
+                populations.append(sum(map(sum, expected)))
+            self.assertEqual(expected, outcome.board)
+            self.assertEqual(populations, outcome.populations)
+
+            if outcome.cycle is not None and \
+                    outcome.cycle.kind != 'extinct':
+                repeated = expected
+                for generation in xrange(outcome.cycle.period):
+                    repeated = board.next_board(repeated)
+                self.assertEqual(expected, repeated)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the HashLife engine against board.next_board
+"""
+
+import random
+import unittest
+import board
+import hashlife
+
+class TestHashLifeFunctions(unittest.TestCase):
+
+    def setUp(self):
+        """ Creating a glider for loading, and a board with a glider,
+        beacon and blinker next to the board edge.
+        """
+
+        self.glider = [
+                [0, 1, 0],
+                [0, 0, 1],
+                [1, 1, 1],
+                ]
+
+        self.sample_board = [
+                [0, 0, 0, 0, 0, 0, 1, 1, 1],
+                [0, 0, 1, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 1, 0, 0, 0, 0, 0],
+                [0, 1, 1, 1, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 1, 1],
+                [0, 0, 0, 0, 0, 0, 0, 1, 1],
+                [0, 0, 0, 0, 0, 1, 1, 0, 0],
+                [0, 0, 0, 0, 0, 1, 1, 0, 0],
+                ]
+
+        self.random = random.Random(1234)
+
+
+    def tearDown(self):
+        del self.glider
+        del self.sample_board
+        del self.random
+
+
+    def run_next_board(self, current_board, generations):
+        for generation in xrange(generations):
+            current_board = board.next_board(current_board)
+        return current_board
+
+
+    def test_advance_zero(self):
+        """ Advancing by 0 generations returns an equal board
+        """
+
+        self.assertEqual(self.sample_board,
+                hashlife.advance(self.sample_board, 0))
+
+
+    def test_next_board_sample(self):
+        """ Same next state as board.next_board on the edge sample
+        """
+
+        self.assertEqual(board.next_board(self.sample_board),
+                hashlife.next_board(self.sample_board))
+
+
+    def test_advance_bounded(self):
+        """ Bounded advance matches repeated board.next_board on random
+        boards, for generation counts that are not powers of 2.
+        """
+
+        for rows, cols in [(9, 9), (5, 17), (30, 30)]:
+            initial = [[int(self.random.random() < 0.35)
+                        for j in xrange(cols)] for i in xrange(rows)]
+            for generations in (1, 3, 10, 37):
+                self.assertEqual(self.run_next_board(initial, generations),
+                        hashlife.advance(initial, generations))
+
+
+    def test_advance_glider_to_edge(self):
+        """ A glider that runs into the dead edge turns into a block,
+        as with board.next_board.
+        """
+
+        initial = board.create_board(24, 24)
+        board.load_construct(initial, self.glider, 2, 2)
+        self.assertEqual(self.run_next_board(initial, 100),
+                hashlife.advance(initial, 100))
+
+
+    def test_advance_from_edge(self):
+        """ While cells touch the edge, the board is stepped one
+        generation at a time with board.next_board, and jumps are taken
+        again once a glider has moved away from the edge.
+        """
+
+        initial = board.create_board(80, 80)
+        board.load_construct(initial, self.glider, 0, 0)
+        expected = self.run_next_board(initial, 150)
+
+        calls = []
+        next_board = board.next_board
+        def counted_next_board(*args, **kwargs):
+            calls.append(args)
+            return next_board(*args, **kwargs)
+        board.next_board = counted_next_board
+        try:
+            self.assertEqual(expected, hashlife.advance(initial, 150))
+        finally:
+            board.next_board = next_board
+        self.assertTrue(0 < len(calls) < 100)
+
+
+    def test_advance_unbounded(self):
+        """ On the unbounded plane a glider moves one cell diagonally
+        every 4 generations, even far past the size of the board.
+        """
+
+        initial = board.create_board(20, 20)
+        board.load_construct(initial, self.glider, 2, 2)
+
+        expected = board.create_board(20, 20)
+        board.load_construct(expected, self.glider, 10, 10)
+        self.assertEqual(expected,
+                hashlife.advance(initial, 32, bounded=False))
+        self.assertEqual(board.create_board(20, 20),
+                hashlife.advance(initial, 4096, bounded=False))
+
+
+    def test_small_cache(self):
+        """ Evicting results from a small cache does not change results
+        """
+
+        engine = hashlife.HashLife(cache_size=50)
+        initial = [[int(self.random.random() < 0.35)
+                    for j in xrange(16)] for i in xrange(16)]
+        self.assertEqual(self.run_next_board(initial, 21),
+                hashlife.advance(initial, 21, engine=engine))
+        self.assertTrue(len(engine._results) <= 50)
+
+
+    def test_canonical_nodes(self):
+        """ Equal squares are represented by the same node
+        """
+
+        engine = hashlife.HashLife()
+        coords = list(board.get_coords(self.glider))
+        self.assertTrue(engine.from_coords(coords, 3) is
+                engine.from_coords(coords, 3))
+        self.assertTrue(engine.zero(4) is
+                engine.from_coords([], 4))
+
+
+    def test_boundary_modes(self):
+        """ Only dead edges are supported
+        """
+
+        self.assertEqual(board.next_board(self.sample_board, board.DEAD),
+                hashlife.next_board(self.sample_board, board.DEAD))
+        for boundary in (board.TORUS, board.MIRROR):
+            self.assertRaises(ValueError, hashlife.next_board,
+                    self.sample_board, boundary)
+
+
+    def test_rules(self):
+        """ Same states as board.next_board with other rules, each with
+        its own HashLife, and ValueError for births on 0 neighbors.
+        """
+
+        for notation in ('B36/S23', 'B2/S', 'B3/S012345678'):
+            rule = board.parse_rule(notation)
+            initial = [[int(self.random.random() < 0.35) for j in xrange(20)]
+                       for i in xrange(16)]
+            expected = initial
+            for generation in xrange(9):
+                expected = board.next_board(expected, rule=rule)
+            self.assertEqual(expected,
+                    hashlife.advance(initial, 9, rule=rule))
+        self.assertRaises(ValueError, hashlife.HashLife,
+                rule=board.parse_rule('B0/S8'))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
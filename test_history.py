@@ -0,0 +1,136 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the generation history
+"""
+
+import random
+import unittest
+import bit_board
+import board
+import history
+
+class TestHistory(unittest.TestCase):
+
+    def setUp(self):
+        """ Creating the first 30 generations of a random board
+        """
+
+        rand = random.Random(1234)
+        current_board = [[int(rand.random() < 0.3) for j in xrange(20)]
+                         for i in xrange(15)]
+        self.boards = [current_board]
+        for generation in xrange(30):
+            current_board = board.next_board(current_board)
+            self.boards.append(current_board)
+
+
+    def tearDown(self):
+        del self.boards
+
+
+    def record_all(self, game_history, boards, first=0):
+        game_history.record(first, boards[0])
+        for generation in xrange(1, len(boards)):
+            births, deaths = board.diff_boards(boards[generation-1],
+                                               boards[generation])
+            game_history.record(first + generation, boards[generation],
+                                births, deaths)
+
+
+    def test_seek(self):
+        """ Every generation recorded can be rebuilt
+        """
+
+        game_history = history.History(keyframe_interval=8)
+        self.record_all(game_history, self.boards)
+        self.assertEqual((0, 30), (game_history.first(),
+                                   game_history.last()))
+        self.assertEqual(31, len(game_history))
+        for generation, expected in enumerate(self.boards):
+            self.assertEqual(expected, game_history.seek(generation))
+        self.assertRaises(IndexError, game_history.seek, 31)
+        self.assertRaises(IndexError, history.History().seek, 0)
+
+
+    def test_memory_budget(self):
+        """ Oldest segments are dropped once over the budget, and the
+        newest generations can still be rebuilt.
+        """
+
+        game_history = history.History(keyframe_interval=5, max_bytes=4000)
+        self.record_all(game_history, self.boards, first=100)
+        self.assertTrue(game_history.first() > 100)
+        self.assertEqual(130, game_history.last())
+        self.assertEqual(0, (game_history.first() - 100) % 5)
+        self.assertTrue(game_history._size <= 4000)
+        for generation in xrange(game_history.first(), 131):
+            self.assertEqual(self.boards[generation-100],
+                    game_history.seek(generation))
+
+
+    def test_record_after_rewind(self):
+        """ Recording a generation again drops the later ones, and a
+        board edited while paused is kept as a keyframe.
+        """
+
+        game_history = history.History(keyframe_interval=8)
+        self.record_all(game_history, self.boards[:20])
+
+        edited = game_history.seek(10)
+        board.set_alive(edited, 0, 0)
+        board.set_alive(edited, 0, 1)
+        game_history.record(10, edited)
+        self.assertEqual(10, game_history.last())
+        self.assertEqual(edited, game_history.seek(10))
+        self.assertEqual(self.boards[9], game_history.seek(9))
+
+        new_board = board.next_board(edited)
+        births, deaths = board.diff_boards(edited, new_board)
+        game_history.record(11, new_board, births, deaths)
+        self.assertEqual(new_board, game_history.seek(11))
+
+
+    def test_bit_board_engine(self):
+        """ Works on engines mirroring board.py
+        """
+
+        game_history = history.History(keyframe_interval=4,
+                                        engine=bit_board)
+        packed = [bit_board.from_board(b) for b in self.boards[:10]]
+        game_history.record(0, packed[0])
+        for generation in xrange(1, 10):
+            game_history.record(generation, packed[generation],
+                    *bit_board.diff_boards(packed[generation-1],
+                                           packed[generation]))
+        self.assertEqual(packed[6], game_history.seek(6))
+
+
+
+    def test_gap(self):
+        """ Generations skipped when recording (as in threaded mode) are
+        not kept, and the nearest kept ones are found instead.
+        """
+
+        game_history = history.History()
+        game_history.record(0, self.boards[0])
+        game_history.record(5, self.boards[5], [], [])
+        self.record_all(game_history, self.boards[9:12], first=9)
+
+        self.assertEqual(self.boards[0], game_history.seek(0))
+        self.assertEqual(self.boards[5], game_history.seek(5))
+        self.assertEqual(self.boards[11], game_history.seek(11))
+        for generation in (1, 2, 3, 4, 6, 7, 8, 12):
+            self.assertRaises(IndexError, game_history.seek, generation)
+
+        self.assertEqual([None, 0, 0, 5, 5, 10, 11],
+                         [game_history.floor(generation)
+                          for generation in (-1, 0, 4, 5, 8, 10, 40)])
+        self.assertEqual([0, 0, 5, 5, 5, 9, 11],
+                         [game_history.nearest(generation)
+                          for generation in (-3, 2, 3, 6, 7, 8, 40)])
+        self.assertEqual(None, history.History().nearest(3))
+
+
+if __name__ == '__main__':
+    unittest.main()
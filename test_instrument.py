@@ -0,0 +1,105 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the instrumentation of the simulation loop
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import board
+import instrument
+import simulation
+
+class TestStats(unittest.TestCase):
+
+    def setUp(self):
+        self.stats = instrument.Stats(window=10)
+
+
+    def tearDown(self):
+        del self.stats
+
+
+    def test_rolling_window(self):
+        """ Only the last window steps are kept, while counters keep
+        counting since the start.
+        """
+
+        for i in xrange(15):
+            self.stats.phases['compute'].append(i * 0.001)
+            self.stats.latencies.append(i * 0.001)
+            self.stats.count('steps')
+        self.assertEqual(10, len(self.stats.latencies))
+        self.assertAlmostEqual(0.0095, self.stats.mean('compute'))
+        self.assertAlmostEqual(0.005, self.stats.percentile(0))
+        self.assertAlmostEqual(0.014, self.stats.percentile(100))
+        self.assertEqual(15, self.stats.counters['steps'])
+        self.assertEqual(0.0, self.stats.mean('render'))
+
+
+    def test_lap(self):
+        """ Laps record the time since the previous lap
+        """
+
+        start = self.stats.clock()
+        lap = self.stats.lap('compute', start)
+        self.assertTrue(lap >= start)
+        self.stats.lap('diff', lap)
+        self.stats.step(start)
+        self.assertEqual(1, len(self.stats.phases['compute']))
+        self.assertEqual(1, len(self.stats.phases['diff']))
+        self.assertEqual(1, self.stats.counters['steps'])
+
+
+    def test_histogram(self):
+        """ Step latencies are counted in their buckets
+        """
+
+        self.stats.latencies.extend([0.00005, 0.0015, 0.0015, 2.0])
+        histogram = dict(self.stats.histogram())
+        self.assertEqual(1, histogram[0.1])
+        self.assertEqual(2, histogram[2])
+        self.assertEqual(1, histogram[None])
+        self.assertEqual(4, sum(histogram.values()))
+
+
+    def test_dump(self):
+        """ Stats are written as JSON
+        """
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'stats.json')
+            self.stats.latencies.append(0.003)
+            self.stats.count('cells_evaluated', 6400)
+            self.stats.dump(path)
+            with open(path) as f:
+                dumped = json.load(f)
+        finally:
+            shutil.rmtree(tmp_dir)
+        self.assertEqual(6400, dumped['counters']['cells_evaluated'])
+        self.assertAlmostEqual(0.003, dumped['latency_seconds']['p50'])
+        self.assertEqual(set(instrument.PHASES),
+                         set(dumped['mean_seconds']))
+
+
+    def test_simulation(self):
+        """ The simulation thread records the time of each step
+        """
+
+        thread = simulation.Simulation(board.create_board(10, 10),
+                                       stats=self.stats)
+        thread.start()
+        thread.resume()
+        time.sleep(0.05)
+        thread.stop()
+        self.assertTrue(len(self.stats.phases['compute']) > 0)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
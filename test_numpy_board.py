@@ -0,0 +1,129 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the NumPy board update against board.next_board
+"""
+
+import random
+import unittest
+import board
+
+try:
+    import numpy
+    import numpy_board
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestNumpyBoardFunctions(unittest.TestCase):
+
+    def setUp(self):
+        """ Creating a board with a glider, beacon and blinker next to
+        the board edge.
+        """
+
+        self.sample_board = [
+                [0, 0, 0, 0, 0, 0, 1, 1, 1],
+                [0, 0, 1, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 1, 0, 0, 0, 0, 0],
+                [0, 1, 1, 1, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 1, 1],
+                [0, 0, 0, 0, 0, 0, 0, 1, 1],
+                [0, 0, 0, 0, 0, 1, 1, 0, 0],
+                [0, 0, 0, 0, 0, 1, 1, 0, 0],
+                ]
+
+        self.random = random.Random(1234)
+
+
+    def tearDown(self):
+        del self.sample_board
+        del self.random
+
+
+    def random_board(self, rows, cols, density=0.3):
+        return [[int(self.random.random() < density) for j in xrange(cols)]
+                for i in xrange(rows)]
+
+
+    def test_round_trip(self):
+        """ Converting to an array and back gives the original board
+        """
+
+        array = numpy_board.to_array(self.sample_board)
+        self.assertEqual((9, 9), array.shape)
+        self.assertEqual(self.sample_board, numpy_board.to_board(array))
+
+
+    def test_neighbor_counts(self):
+        """ Check neighbor_counts agrees with board.sum_neighbors
+        for every cell.
+        """
+
+        counts = numpy_board.neighbor_counts(
+                numpy_board.to_array(self.sample_board))
+        for row in xrange(9):
+            for col in xrange(9):
+                self.assertEqual(
+                        board.sum_neighbors(row, col, self.sample_board),
+                        counts[row, col])
+
+
+    def test_next_board_sample(self):
+        """ Same next state as board.next_board on the edge sample
+        """
+
+        self.assertEqual(board.next_board(self.sample_board),
+                numpy_board.next_board(self.sample_board))
+
+
+    def test_next_board_random(self):
+        """ Same next states as board.next_board over several generations
+        of random boards, including non-square and single row/col boards.
+        """
+
+        for rows, cols in [(1, 1), (1, 7), (6, 1), (13, 29), (40, 40)]:
+            expected = self.random_board(rows, cols)
+            array = numpy_board.to_array(expected)
+            for generation in xrange(5):
+                expected = board.next_board(expected)
+                array = numpy_board.next_array(array)
+                self.assertEqual(expected, numpy_board.to_board(array))
+
+
+    def test_boundary_modes(self):
+        """ Same next states as board.next_board with each boundary mode
+        """
+
+        for boundary in board.BOUNDARIES:
+            for rows, cols in ((1, 5), (7, 1), (12, 9)):
+                expected = self.random_board(rows, cols)
+                array = numpy_board.to_array(expected)
+                for generation in xrange(5):
+                    expected = board.next_board(expected, boundary)
+                    array = numpy_board.next_array(array, boundary)
+                    self.assertEqual(expected, numpy_board.to_board(array))
+        self.assertRaises(ValueError, numpy_board.next_board,
+                self.sample_board, 'klein')
+
+
+    def test_rules(self):
+        """ Same next states as board.next_board with other rules,
+        including births on 0 neighbors.
+        """
+
+        for notation in ('B36/S23', 'B2/S', 'B3/S012345678', 'B1357/S1357') + ('B0/S8',):
+            rule = board.parse_rule(notation)
+            expected = self.random_board(10, 13)
+            array = numpy_board.to_array(expected)
+            for generation in xrange(5):
+                expected = board.next_board(expected, rule=rule)
+                array = numpy_board.next_array(array, rule=rule)
+                self.assertEqual(expected, numpy_board.to_board(array))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the parallel board against board.next_board
+"""
+
+import random
+import unittest
+import board
+import parallel_board
+
+class TestParallelBoard(unittest.TestCase):
+
+    def setUp(self):
+        """ Creating a board with a glider, beacon and blinker next to
+        the board edge.
+        """
+
+        self.sample_board = [
+                [0, 0, 0, 0, 0, 0, 1, 1, 1],
+                [0, 0, 1, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 1, 0, 0, 0, 0, 0],
+                [0, 1, 1, 1, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 1, 1],
+                [0, 0, 0, 0, 0, 0, 0, 1, 1],
+                [0, 0, 0, 0, 0, 1, 1, 0, 0],
+                [0, 0, 0, 0, 0, 1, 1, 0, 0],
+                ]
+
+        self.random = random.Random(1234)
+
+
+    def tearDown(self):
+        del self.sample_board
+        del self.random
+
+
+    def test_next_board_sample(self):
+        """ Same next state as board.next_board on the edge sample
+        """
+
+        self.assertEqual(board.next_board(self.sample_board),
+                parallel_board.next_board(self.sample_board, workers=2))
+
+
+    def test_step_random(self):
+        """ Same next states as board.next_board over several generations,
+        with more strips than rows and strips of uneven height.
+        """
+
+        for rows, cols, strips in [(1, 5, 4), (3, 7, 8), (37, 23, 5)]:
+            expected = [[int(self.random.random() < 0.3)
+                         for j in xrange(cols)] for i in xrange(rows)]
+            with parallel_board.ParallelBoard(expected, workers=2,
+                                              strips=strips) as parallel:
+                self.assertEqual(expected, parallel.to_board())
+                for generation in xrange(5):
+                    expected = board.next_board(expected)
+                    parallel.step()
+                    self.assertEqual(expected, parallel.to_board())
+
+
+    def test_load(self):
+        """ Loading a new board replaces the whole state
+        """
+
+        with parallel_board.ParallelBoard(self.sample_board,
+                                          workers=2) as parallel:
+            parallel.step()
+            parallel.load(self.sample_board)
+            self.assertEqual(self.sample_board, parallel.to_board())
+
+            empty = board.create_board(len(self.sample_board),
+                                       len(self.sample_board[0]))
+            parallel.load(empty)
+            self.assertEqual(empty, parallel.to_board())
+
+
+    def test_boundary_modes(self):
+        """ Same next states as board.next_board with each boundary mode
+        """
+
+        for boundary in board.BOUNDARIES:
+            expected = [[int(self.random.random() < 0.3)
+                         for j in xrange(11)] for i in xrange(13)]
+            with parallel_board.ParallelBoard(expected, workers=2,
+                    boundary=boundary) as parallel:
+                for generation in xrange(5):
+                    expected = board.next_board(expected, boundary)
+                    parallel.step()
+                    self.assertEqual(expected, parallel.to_board())
+        self.assertRaises(ValueError, parallel_board.ParallelBoard,
+                self.sample_board, 1, None, 'klein')
+
+
+    def test_rules(self):
+        """ Same next states as board.next_board with HighLife
+        """
+
+        rule = board.parse_rule('B36/S23')
+        self.assertEqual(board.next_board(self.sample_board, rule=rule),
+                parallel_board.next_board(self.sample_board, workers=2,
+                                          rule=rule))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
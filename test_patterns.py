@@ -0,0 +1,169 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the RLE, Life 1.06 and plaintext pattern readers
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import board
+import patterns
+
+class TestPatternFunctions(unittest.TestCase):
+
+    def setUp(self):
+        """ Creating the same glider in each format, and a construct
+        for comparison.
+        """
+
+        self.glider = [
+                [0, 1, 0],
+                [0, 0, 1],
+                [1, 1, 1],
+                ]
+
+        self.glider_rle = [
+                '#N Glider\n',
+                '#C A comment\n',
+                'x = 3, y = 3, rule = B3/S23\n',
+                'bob$2bo$3o!\n',
+                ]
+
+        self.glider_life106 = [
+                '#Life 1.06\n',
+                '0 -1\n',
+                '1 0\n',
+                '-1 1\n',
+                '0 1\n',
+                '1 1\n',
+                ]
+
+        self.glider_cells = [
+                '!Name: Glider\n',
+                '.O\n',
+                '..O\n',
+                'OOO\n',
+                '\n',
+                ]
+
+        self.tmp_dir = tempfile.mkdtemp()
+
+
+    def tearDown(self):
+        del self.glider
+        del self.glider_rle
+        del self.glider_life106
+        del self.glider_cells
+        shutil.rmtree(self.tmp_dir)
+
+
+    def test_read_rle(self):
+        """ Size and rule come from the header, and coords are decoded
+        lazily.
+        """
+
+        pattern = patterns.read_rle(self.glider_rle)
+        self.assertEqual((3, 3, 'B3/S23'),
+                (pattern.rows, pattern.cols, pattern.rule))
+        self.assertFalse(isinstance(pattern.coords, list))
+        self.assertEqual(list(board.get_coords(self.glider)),
+                list(pattern.coords))
+
+
+    def test_read_rle_runs(self):
+        """ Multi-line data, runs of row ends and a missing count before
+        a tag are all handled.
+        """
+
+        pattern = patterns.read_rle(['x = 4, y = 4\n', '2o2$\n',
+                                     'b3o!\n', 'ignored after the end\n'])
+        self.assertEqual([(0, 0), (0, 1), (2, 1), (2, 2), (2, 3)],
+                list(pattern.coords))
+        self.assertEqual(None, pattern.rule)
+        self.assertRaises(ValueError, patterns.read_rle, ['#C only\n'])
+        self.assertRaises(ValueError, patterns.read_rle, ['x = 3, 3\n'])
+        self.assertRaises(ValueError, patterns.read_rle, ['x = 3\n', 'o!'])
+
+
+    def test_read_rle_rule(self):
+        """ The rule is the rest of the header line, commas included
+        """
+
+        pattern = patterns.read_rle(['x = 3, y = 2, rule = B3/S23:T20,20\n',
+                                     '3o$obo!\n'])
+        self.assertEqual((2, 3, 'B3/S23:T20,20'),
+                (pattern.rows, pattern.cols, pattern.rule))
+        self.assertEqual([(0, 0), (0, 1), (0, 2), (1, 0), (1, 2)],
+                list(pattern.coords))
+        pattern = patterns.read_rle(['x=1,y=1,RULE=b36/s23\n', 'o!\n'])
+        self.assertEqual('b36/s23', pattern.rule)
+
+
+    def test_read_life106(self):
+        """ Coords are shifted so the top left corner is at (0, 0)
+        """
+
+        pattern = patterns.read_life106(self.glider_life106)
+        self.assertEqual((3, 3), (pattern.rows, pattern.cols))
+        self.assertEqual(sorted(board.get_coords(self.glider)),
+                sorted(pattern.coords))
+
+
+    def test_read_cells(self):
+        """ Comments and trailing blank lines do not count as rows
+        """
+
+        pattern = patterns.read_cells(self.glider_cells)
+        self.assertEqual((3, 3), (pattern.rows, pattern.cols))
+        self.assertEqual(self.glider, patterns.to_construct(pattern))
+
+
+    def test_load_pattern(self):
+        """ Loading a pattern matches load_construct, including the
+        IndexError when the pattern does not fit.
+        """
+
+        expected = board.create_board(9, 9)
+        board.load_construct(expected, self.glider, 4, 2)
+
+        for reader, lines in ((patterns.read_rle, self.glider_rle),
+                              (patterns.read_life106, self.glider_life106),
+                              (patterns.read_cells, self.glider_cells)):
+            target = board.create_board(9, 9)
+            patterns.load_pattern(target, reader(lines), 4, 2)
+            self.assertEqual(expected, target)
+            self.assertRaises(IndexError, patterns.load_pattern,
+                    target, reader(lines), 7, 5)
+
+
+    def test_load_pattern_outside_size(self):
+        """ RLE cells beyond the size in the header are an error
+        """
+
+        pattern = patterns.read_rle(['x = 2, y = 1\n', '3o!\n'])
+        self.assertRaises(ValueError, patterns.load_pattern,
+                board.create_board(5, 5), pattern)
+
+
+    def test_read_pattern(self):
+        """ Files are read in the format given by their extension
+        """
+
+        for name, lines in (('glider.rle', self.glider_rle),
+                            ('glider.lif', self.glider_life106),
+                            ('glider.cells', self.glider_cells)):
+            path = os.path.join(self.tmp_dir, name)
+            with open(path, 'w') as f:
+                f.writelines(lines)
+            self.assertEqual(self.glider,
+                    patterns.to_construct(patterns.read_pattern(path)))
+
+        self.assertRaises(ValueError, patterns.read_pattern,
+                os.path.join(self.tmp_dir, 'glider.txt'))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the unbounded chunked plane
+"""
+
+import random
+import unittest
+import board
+import history
+import plane
+
+class TestPlane(unittest.TestCase):
+
+    def setUp(self):
+        """ Creating a glider
+        """
+
+        self.glider = [
+                [0, 1, 0],
+                [0, 0, 1],
+                [1, 1, 1],
+                ]
+
+        self.random = random.Random(1234)
+
+
+    def tearDown(self):
+        del self.glider
+        del self.random
+
+
+    def test_cells(self):
+        """ Cells can be set anywhere, and empty chunks are freed
+        """
+
+        current = plane.create_board(80, 80, chunk_size=8)
+        plane.set_alive(current, -1, -1)
+        plane.set_alive(current, 1000000, -3)
+        self.assertEqual(1, plane.get_value(current, -1, -1))
+        self.assertEqual(0, plane.get_value(current, -1, -2))
+        self.assertEqual(0, plane.get_value(current, 5, 5))
+        self.assertEqual(set([(-1, -1), (125000, -1)]), set(current.chunks))
+        self.assertEqual([(-1, -1), (1000000, -3)],
+                         list(plane.get_coords(current)))
+        self.assertEqual((-1, -3, 1000000, -1), plane.bounds(current))
+
+        plane.set_dead(current, 1000000, -3)
+        plane.set_dead(current, 7, 7)
+        self.assertEqual([(-1, -1)], current.chunks.keys())
+        self.assertEqual(1, plane.population(current))
+
+
+    def test_next_plane_window(self):
+        """ Same next states as board.next_board on a board big enough
+        that its edges are never reached, across chunk edges and into
+        negative coords.
+        """
+
+        rows, cols = 30, 34
+        expected = [[int(self.random.random() < 0.35) for j in xrange(cols)]
+                    for i in xrange(rows)]
+        padded = board.create_board(rows + 60, cols + 60)
+        board.load_construct(padded, expected, 30, 30)
+
+        current = plane.create_board(rows, cols, chunk_size=8)
+        plane.load_construct(current, expected, -13, -21)
+        for generation in xrange(12):
+            padded = board.next_board(padded)
+            new_plane = plane.next_plane(current)
+            births, deaths = plane.diff_boards(current, new_plane)
+            self.assertEqual(plane.population(current) + len(births) -
+                             len(deaths), plane.population(new_plane))
+            current = new_plane
+            self.assertEqual(padded,
+                    plane.to_board(current, -43, -51, rows + 60, cols + 60))
+
+
+    def test_glider_travels(self):
+        """ A glider keeps going forever, only using the chunks around it
+        """
+
+        current = plane.create_board(80, 80)
+        plane.load_construct(current, self.glider)
+        for generation in xrange(400):
+            current = plane.next_board(current)
+            self.assertTrue(len(current.chunks) <= 4)
+        self.assertEqual(5, plane.population(current))
+        self.assertEqual((100, 100, 102, 102), plane.bounds(current))
+        self.assertEqual(self.glider, plane.to_board(current, 100, 100, 3, 3))
+
+
+    def test_rules(self):
+        """ Other rules work, except with births on 0 neighbors, and
+        edges other than none raise ValueError.
+        """
+
+        current = plane.from_coords([(0, 0), (0, 1), (0, 2)])
+        seeds = plane.next_board(current, rule=board.parse_rule('B2/S'))
+        self.assertEqual([(-1, 0), (-1, 2), (1, 0), (1, 2)],
+                         sorted(plane.get_coords(seeds)))
+        self.assertRaises(ValueError, plane.next_plane, current,
+                board.parse_rule('B0/S8'))
+        self.assertRaises(ValueError, plane.next_board, current,
+                board.TORUS)
+
+
+    def test_history(self):
+        """ History can keep and rebuild planes with negative coords
+        """
+
+        game_history = history.History(keyframe_interval=4, engine=plane)
+        current = plane.create_board(80, 80)
+        plane.load_construct(current, self.glider, -5, -7)
+        planes = [current]
+        game_history.record(0, current)
+        for generation in xrange(1, 10):
+            new_plane = plane.next_board(current)
+            game_history.record(generation, new_plane,
+                    *plane.diff_boards(current, new_plane))
+            planes.append(new_plane)
+            current = new_plane
+        for generation in (0, 3, 4, 9):
+            self.assertEqual(planes[generation],
+                             game_history.seek(generation))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
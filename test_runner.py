@@ -0,0 +1,242 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the headless runner
+"""
+
+import os
+import shutil
+import StringIO
+import subprocess
+import sys
+import tempfile
+import unittest
+import block_table
+import board
+import patterns
+import runner
+
+class TestRunnerFunctions(unittest.TestCase):
+
+    def setUp(self):
+        """ Creating plaintext patterns for a blinker and a glider, and
+        capturing the summaries main prints
+        """
+
+        self.blinker_lines = [
+                '!Name: Blinker\n',
+                'OOO\n',
+                ]
+
+        self.glider_lines = [
+                '!Name: Glider\n',
+                '.O\n',
+                '..O\n',
+                'OOO\n',
+                ]
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.old_cache_dir = block_table.CACHE_DIR
+        block_table.CACHE_DIR = self.tmp_dir
+        self.stdout = sys.stdout
+        sys.stdout = StringIO.StringIO()
+
+
+    def tearDown(self):
+        sys.stdout = self.stdout
+        del self.blinker_lines
+        del self.glider_lines
+        block_table.CACHE_DIR = self.old_cache_dir
+        shutil.rmtree(self.tmp_dir)
+
+
+    def read_cells(self, lines):
+        return patterns.to_construct(patterns.read_cells(lines))
+
+
+    def test_read_cells(self):
+        """ Comments are skipped and short rows padded with dead cells
+        """
+
+        glider = [
+                [0, 1, 0],
+                [0, 0, 1],
+                [1, 1, 1],
+                ]
+
+        self.assertEqual(glider, self.read_cells(self.glider_lines))
+        self.assertRaises(ValueError, self.read_cells, ['!Empty\n'])
+
+
+    def test_write_cells(self):
+        """ Writing a board and reading it back gives the same board
+        """
+
+        sample_board = board.create_board(4, 5)
+        board.load_construct(sample_board,
+                self.read_cells(self.glider_lines), 1, 1)
+
+        fileobj = StringIO.StringIO()
+        runner.write_cells(sample_board, fileobj)
+        fileobj.seek(0)
+        self.assertEqual(sample_board, self.read_cells(fileobj))
+
+
+    def test_run_board(self):
+        """ Runs for the full number of generations without a stop
+        condition, recording each generation's population.
+        """
+
+        sample_board = board.create_board(5, 5)
+        board.load_construct(sample_board, [[1, 1, 1]], 2, 1)
+        final, populations, reason = runner.run_board(sample_board, 3)
+
+        expected = sample_board
+        for i in xrange(3):
+            expected = board.next_board(expected)
+        self.assertEqual(expected, final)
+        self.assertEqual([3, 3, 3, 3], populations)
+        self.assertEqual('generations', reason)
+
+
+    def test_run_board_stop(self):
+        """ Stops once a glider has turned into a block at the edge, and
+        once a lone cell has died out.
+        """
+
+        sample_board = board.create_board(8, 8)
+        board.load_construct(sample_board,
+                self.read_cells(self.glider_lines), 0, 0)
+        final, populations, reason = runner.run_board(sample_board, 100,
+                                                      stop='still')
+        self.assertEqual('still', reason)
+        self.assertTrue(len(populations) < 100)
+        self.assertEqual(4, populations[-1])
+        self.assertEqual(final, board.next_board(final))
+
+        sample_board = board.create_board(8, 8)
+        board.set_alive(sample_board, 3, 3)
+        final, populations, reason = runner.run_board(sample_board, 100,
+                                                      stop='extinct')
+        self.assertEqual(([1, 0], 'extinct'), (populations, reason))
+        self.assertRaises(ValueError, runner.run_board, sample_board, 1,
+                board, 'never')
+
+
+    def test_run_board_torus(self):
+        """ On a torus the glider never reaches an edge, and comes back
+        to where it started after 32 generations on an 8x8 board.
+        """
+
+        sample_board = board.create_board(8, 8)
+        board.load_construct(sample_board,
+                self.read_cells(self.glider_lines), 0, 0)
+        final, populations, reason = runner.run_board(sample_board, 100,
+                stop='cycle', boundary=board.TORUS)
+        self.assertEqual('oscillator', reason)
+        self.assertEqual(sample_board, final)
+        self.assertEqual([5] * 33, populations)
+
+
+    def test_run_board_cycle(self):
+        """ Stops once a blinker repeats itself, or fast forwards to the
+        last generation with the populations filled in.
+        """
+
+        sample_board = board.create_board(6, 6)
+        board.load_construct(sample_board, [[1, 1, 1]], 2, 1)
+        board.set_alive(sample_board, 5, 5)
+        final, populations, reason = runner.run_board(sample_board, 100,
+                                                      stop='cycle')
+        self.assertEqual(([4, 3, 3, 3], 'oscillator'), (populations, reason))
+
+        final, populations, reason = runner.run_board(sample_board, 1001,
+                                                      fast_forward=True)
+        expected, expected_populations, _ = runner.run_board(sample_board,
+                                                             1001)
+        self.assertEqual(expected, final)
+        self.assertEqual(expected_populations, populations)
+        self.assertEqual('oscillator', reason)
+
+
+    def test_main_directory(self):
+        """ Runs every pattern in a directory and writes the final state
+        and populations of each.
+        """
+
+        pattern_dir = os.path.join(self.tmp_dir, 'patterns')
+        output_dir = os.path.join(self.tmp_dir, 'out')
+        os.mkdir(pattern_dir)
+        for name, lines in (('blinker', self.blinker_lines),
+                            ('glider', self.glider_lines)):
+            with open(os.path.join(pattern_dir, name + '.cells'), 'w') as f:
+                f.writelines(lines)
+
+        runner.main([pattern_dir, '--rows', '10', '--cols', '10',
+                     '--generations', '4', '--jobs', '2',
+                     '--output-dir', output_dir])
+
+        with open(os.path.join(output_dir, 'blinker.final.cells')) as f:
+            final = self.read_cells(f)
+        expected = board.create_board(10, 10)
+        board.load_construct(expected, [[1, 1, 1]], 4, 3)
+        self.assertEqual(expected, final)
+
+        with open(os.path.join(output_dir, 'glider.population.csv')) as f:
+            self.assertEqual(['generation,population', '0,5', '1,5',
+                              '2,5', '3,5', '4,5'], f.read().split())
+
+
+    def test_main_bad_file(self):
+        """ A pattern which cannot be read, or does not fit the board, is
+        reported in its summary line, and the other patterns still run.
+        """
+
+        pattern_dir = os.path.join(self.tmp_dir, 'patterns')
+        output_dir = os.path.join(self.tmp_dir, 'out')
+        os.mkdir(pattern_dir)
+        for name, text in (('blinker.cells', 'OOO\n'),
+                           ('broken.rle', 'x = 3\n3o!\n'),
+                           ('wide.cells', 'O' * 20 + '\n')):
+            with open(os.path.join(pattern_dir, name), 'w') as f:
+                f.write(text)
+
+        runner.main([pattern_dir, '--rows', '10', '--cols', '10',
+                     '--generations', '4', '--jobs', '2',
+                     '--output-dir', output_dir])
+        lines = sys.stdout.getvalue().splitlines()
+
+        self.assertEqual(['blinker\t4\t3\tgenerations', 'broken', 'wide'],
+                [line if line.startswith('blinker') else line.split('\t')[0]
+                 for line in lines])
+        self.assertTrue(all('\terror: ' in line for line in lines[1:]))
+        self.assertTrue(os.path.exists(
+                os.path.join(output_dir, 'blinker.final.cells')))
+
+
+    def test_no_gui_import(self):
+        """ Importing the runner does not import Tkinter or the gui
+        """
+
+        code = ('import sys, runner; '
+                'print "Tkinter" in sys.modules or "gui" in sys.modules')
+        output = subprocess.check_output([sys.executable, '-c', code],
+                cwd=os.path.dirname(os.path.abspath(runner.__file__)))
+        self.assertEqual('False', output.strip())
+
+
+
+    def test_fastest_engine(self):
+        """ The fastest engine available gives the same run as board
+        """
+
+        initial = self.read_cells(['.O.', '..O', 'OOO'])
+        start = board.create_board(8, 8)
+        board.load_construct(start, initial, 1, 1)
+        expected = runner.run_board(start, 6)
+        self.assertEqual(expected,
+                         runner.run_board(start, 6, board.get_engine()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the background simulation thread
+"""
+
+import time
+import unittest
+import board
+import simulation
+
+class TestSimulation(unittest.TestCase):
+
+    def setUp(self):
+        """ Creating a board with a blinker
+        """
+
+        self.sample_board = board.create_board(5, 5)
+        board.load_construct(self.sample_board, [[1, 1, 1]], 2, 1)
+        self.sim = simulation.Simulation(self.sample_board)
+        self.sim.start()
+
+
+    def tearDown(self):
+        self.sim.stop()
+        self.sim.join()
+        del self.sample_board
+        del self.sim
+
+
+    def wait_for_generation(self, generation, timeout=5):
+        end = time.time() + timeout
+        while self.sim.latest()[0] < generation and time.time() < end:
+            time.sleep(0.001)
+
+
+    def test_paused_until_resumed(self):
+        """ Nothing is computed before resume is called
+        """
+
+        time.sleep(0.05)
+        self.assertEqual((0, self.sample_board), self.sim.latest())
+
+
+    def test_latest_matches_next_board(self):
+        """ The newest board is the board.next_board result for its
+        generation, and does not change once paused.
+        """
+
+        self.sim.resume()
+        self.wait_for_generation(10)
+        self.sim.pause()
+
+        generation, latest = self.sim.latest()
+        self.assertTrue(generation >= 10)
+        expected = self.sample_board
+        for i in xrange(generation):
+            expected = board.next_board(expected)
+        self.assertEqual(expected, latest)
+
+        time.sleep(0.05)
+        self.assertEqual(generation, self.sim.latest()[0])
+
+
+    def test_resume_with_edited_board(self):
+        """ A board passed to resume replaces the current one
+        """
+
+        empty = board.create_board(5, 5)
+        self.sim.resume(empty)
+        self.wait_for_generation(3)
+        self.sim.pause()
+        self.assertEqual(empty, self.sim.latest()[1])
+
+
+    def test_rate_limit(self):
+        """ At 50 generations per second, the simulation waits 0.02s
+        after each generation. The clock only moves while waiting, so
+        the result does not depend on the speed of the machine.
+        """
+
+        now = [0.0]
+        def sleep(seconds):
+            now[0] += seconds
+        sim = simulation.Simulation(self.sample_board,
+                                    generations_per_second=50)
+        sim.clock = lambda: now[0]
+        sim.sleep = sleep
+        sim.start()
+        try:
+            sim.resume()
+            end = time.time() + 5
+            while sim.latest()[0] < 20 and time.time() < end:
+                time.sleep(0.001)
+            sim.pause()
+        finally:
+            sim.stop()
+            sim.join()
+
+        generation = sim.latest()[0]
+        self.assertTrue(generation >= 20)
+        self.assertAlmostEqual(generation * 0.02, now[0], delta=0.021)
+        self.assertRaises(ValueError, self.sim.set_rate, -1)
+
+
+    def test_rate_counter(self):
+        """ The counter reports events within its window only
+        """
+
+        now = [100.0]
+        counter = simulation.RateCounter(window=0.5)
+        counter.clock = lambda: now[0]
+        for i in xrange(5):
+            counter.tick()
+            now[0] += 0.1
+        self.assertEqual(10, counter.rate())
+        now[0] += 0.25
+        self.assertEqual(4, counter.rate())
+        now[0] += 1
+        self.assertEqual(0, counter.rate())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing saving and loading of binary board snapshots
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+import bit_board
+import board
+import snapshot
+
+class TestSnapshotFunctions(unittest.TestCase):
+
+    def setUp(self):
+        """ Creating a random board wider than a few bytes, and a
+        directory for the snapshot files.
+        """
+
+        rand = random.Random(1234)
+        self.sample_board = [[int(rand.random() < 0.3) for j in xrange(37)]
+                             for i in xrange(23)]
+
+        self.construct1 = [
+                [1, 0, 0],
+                [1, 1, 1],
+                [1, 1, 0],
+                [1, 0, 0],
+                [1, 0, 0],
+                ]
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'board.gols')
+
+
+    def tearDown(self):
+        del self.sample_board
+        del self.construct1
+        shutil.rmtree(self.tmp_dir)
+
+
+    def test_round_trip(self):
+        """ Saving and loading gives the same board, with or without
+        compression.
+        """
+
+        for compress in (False, True):
+            snapshot.save(self.sample_board, self.path, compress)
+            self.assertEqual((23, 37, compress),
+                    snapshot.read_header(self.path))
+            self.assertEqual(self.sample_board, snapshot.load(self.path))
+
+
+    def test_file_size(self):
+        """ Cells take one bit each, and an empty board compresses to
+        a few bytes.
+        """
+
+        snapshot.save(self.sample_board, self.path)
+        self.assertEqual(16 + 23 * 5, os.path.getsize(self.path))
+
+        snapshot.save(board.create_board(1000, 1000), self.path, True)
+        self.assertTrue(os.path.getsize(self.path) < 32)
+        self.assertEqual(board.create_board(1000, 1000),
+                snapshot.load(self.path))
+
+
+    def test_load_region(self):
+        """ Loading a region gives the same cells as slicing the board,
+        for regions not aligned to bytes, and raises IndexError for
+        regions outside the snapshot.
+        """
+
+        for compress in (False, True):
+            snapshot.save(self.sample_board, self.path, compress)
+            for top, left, rows, cols in [(0, 0, 1, 1), (3, 5, 10, 17),
+                                          (22, 9, 1, 28), (5, 0, 0, 37)]:
+                expected = [row[left:left+cols]
+                            for row in self.sample_board[top:top+rows]]
+                self.assertEqual(expected,
+                        snapshot.load(self.path, top, left, rows, cols))
+            self.assertRaises(IndexError, snapshot.load, self.path,
+                    20, 0, 4, 1)
+            self.assertRaises(IndexError, snapshot.load, self.path,
+                    0, 30, 1, 8)
+
+
+    def test_load_into(self):
+        """ Loading into a board matches load_construct, including the
+        IndexError when the snapshot does not fit.
+        """
+
+        snapshot.save(self.construct1, self.path, True)
+        expected = board.create_board(9, 9)
+        board.load_construct(expected, self.construct1, 1, 2)
+
+        target = board.create_board(9, 9)
+        snapshot.load_into(target, self.path, 1, 2)
+        self.assertEqual(expected, target)
+        self.assertRaises(IndexError, snapshot.load_into,
+                target, self.path, 7, 5)
+
+
+    def test_bit_board(self):
+        """ BitBoards are saved and loaded with the same format
+        """
+
+        packed = bit_board.from_board(self.sample_board)
+        snapshot.save(packed, self.path)
+        self.assertEqual(self.sample_board, snapshot.load(self.path))
+        self.assertEqual(packed, snapshot.load_bit_board(self.path))
+
+
+    def test_bad_header(self):
+        """ Files that are not snapshots, or of another version, are
+        rejected with a ValueError.
+        """
+
+        with open(self.path, 'wb') as f:
+            f.write('not a snapshot at all')
+        self.assertRaises(ValueError, snapshot.load, self.path)
+
+        with open(self.path, 'wb') as f:
+            f.write(snapshot.HEADER.pack('GOLS', 99, 0, 1, 1) + '\x00')
+        self.assertRaises(ValueError, snapshot.read_header, self.path)
+
+
+
+    def test_truncated(self):
+        """ Snapshots cut short are rejected with a ValueError, whether
+        compressed or not, and wherever they are cut.
+        """
+
+        for compress in (False, True):
+            snapshot.save(self.sample_board, self.path, compress=compress)
+            with open(self.path, 'rb') as f:
+                data = f.read()
+            for size in xrange(snapshot.HEADER.size, len(data)):
+                with open(self.path, 'wb') as f:
+                    f.write(data[:size])
+                self.assertRaises(ValueError, snapshot.load, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the sparse live-set board against board.next_board
+"""
+
+import random
+import unittest
+import board
+import sparse_board
+
+class TestSparseBoardFunctions(unittest.TestCase):
+
+    def setUp(self):
+        """ Creating a board with a glider, beacon and blinker next to
+        the board edge.
+        """
+
+        self.sample_board = [
+                [0, 0, 0, 0, 0, 0, 1, 1, 1],
+                [0, 0, 1, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 1, 0, 0, 0, 0, 0],
+                [0, 1, 1, 1, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0, 0, 0, 1, 1],
+                [0, 0, 0, 0, 0, 0, 0, 1, 1],
+                [0, 0, 0, 0, 0, 1, 1, 0, 0],
+                [0, 0, 0, 0, 0, 1, 1, 0, 0],
+                ]
+
+        self.random = random.Random(1234)
+
+
+    def tearDown(self):
+        del self.sample_board
+        del self.random
+
+
+    def test_round_trip(self):
+        """ Converting to a live set and back gives the original board
+        """
+
+        live = sparse_board.to_live_set(self.sample_board)
+        self.assertEqual(set(board.get_coords(self.sample_board)), live)
+        self.assertEqual(self.sample_board,
+                sparse_board.to_board(live, 9, 9))
+
+
+    def test_next_board_sample(self):
+        """ Same next state as board.next_board on the edge sample
+        """
+
+        self.assertEqual(board.next_board(self.sample_board),
+                sparse_board.next_board(self.sample_board))
+
+
+    def test_next_live_random(self):
+        """ Same next states as board.next_board over several generations
+        of random boards.
+        """
+
+        for rows, cols in [(1, 1), (1, 7), (6, 1), (13, 29), (30, 30)]:
+            expected = [[int(self.random.random() < 0.3)
+                         for j in xrange(cols)] for i in xrange(rows)]
+            live = sparse_board.to_live_set(expected)
+            for generation in xrange(5):
+                expected = board.next_board(expected)
+                live = sparse_board.next_live(live, rows, cols)
+                self.assertEqual(expected,
+                        sparse_board.to_board(live, rows, cols))
+
+
+    def test_next_live_empty(self):
+        """ An empty live set stays empty
+        """
+
+        self.assertEqual(set(), sparse_board.next_live(set(), 5, 5))
+
+
+    def test_boundary_modes(self):
+        """ Same next states as board.next_board with each boundary mode
+        """
+
+        for boundary in board.BOUNDARIES:
+            for rows, cols in ((1, 5), (7, 1), (12, 9)):
+                expected = [[int(self.random.random() < 0.4)
+                             for j in xrange(cols)] for i in xrange(rows)]
+                live = sparse_board.to_live_set(expected)
+                for generation in xrange(5):
+                    expected = board.next_board(expected, boundary)
+                    live = sparse_board.next_live(live, rows, cols, boundary)
+                    self.assertEqual(expected,
+                            sparse_board.to_board(live, rows, cols))
+        self.assertRaises(ValueError, sparse_board.next_board,
+                self.sample_board, 'klein')
+
+
+    def test_rules(self):
+        """ Same next states as board.next_board with other rules, and
+        ValueError for rules with births on 0 neighbors.
+        """
+
+        for notation in ('B36/S23', 'B2/S', 'B3/S012345678', 'B1357/S1357'):
+            rule = board.parse_rule(notation)
+            expected = [[int(self.random.random() < 0.4)
+                         for j in xrange(13)] for i in xrange(10)]
+            live = sparse_board.to_live_set(expected)
+            for generation in xrange(5):
+                expected = board.next_board(expected, rule=rule)
+                live = sparse_board.next_live(live, 10, 13, rule=rule)
+                self.assertEqual(expected,
+                        sparse_board.to_board(live, 10, 13))
+        self.assertRaises(ValueError, sparse_board.next_board,
+                self.sample_board, rule=board.parse_rule('B0/S8'))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+#!usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Testing the tiled board against board.next_board
+"""
+
+import random
+import unittest
+import board
+import tiled_board
+
+class TestTiledBoard(unittest.TestCase):
+
+    def setUp(self):
+        """ Creating a blinker and a glider for loading
+        """
+
+        self.blinker = [
+                [1, 1, 1],
+                ]
+
+        self.glider = [
+                [0, 1, 0],
+                [0, 0, 1],
+                [1, 1, 1],
+                ]
+
+        self.random = random.Random(1234)
+
+
+    def tearDown(self):
+        del self.blinker
+        del self.glider
+        del self.random
+
+
+    def test_step_random(self):
+        """ Same next states as board.next_board over several generations
+        of random boards, with tiles that do not divide the board evenly.
+        """
+
+        for rows, cols, tile_size in [(1, 1, 4), (6, 1, 4), (13, 29, 4),
+                                      (30, 30, 8), (17, 17, 32)]:
+            expected = [[int(self.random.random() < 0.3)
+                         for j in xrange(cols)] for i in xrange(rows)]
+            tiled = tiled_board.TiledBoard(expected, tile_size)
+            for generation in xrange(12):
+                expected = board.next_board(expected)
+                tiled.step()
+                self.assertEqual(expected, tiled.to_board())
+
+
+    def test_skips_stable_tiles(self):
+        """ Once the first step is done, only the tiles around a blinker
+        in the corner are recomputed, and a glider crossing tiles wakes
+        up the tiles it moves into.
+        """
+
+        initial = board.create_board(64, 64)
+        board.load_construct(initial, self.blinker, 1, 1)
+        board.load_construct(initial, self.glider, 20, 20)
+        tiled = tiled_board.TiledBoard(initial, 8)
+
+        tiled.step()
+        self.assertEqual(64, tiled.stats['active_tiles'])
+
+        expected = initial
+        for generation in xrange(40):
+            expected = board.next_board(expected)
+            if generation:
+                tiled.step()
+                self.assertTrue(tiled.stats['active_tiles'] <= 4 + 16)
+            self.assertEqual(expected, tiled.to_board())
+
+
+    def test_cells_evaluated(self):
+        """ Partial tiles on the edges count only the cells they hold
+        """
+
+        tiled = tiled_board.TiledBoard(board.create_board(20, 20))
+        tiled.step()
+        self.assertEqual((4, 400), (tiled.stats['active_tiles'],
+                                   tiled.stats['cells_evaluated']))
+
+        initial = board.create_board(40, 40)
+        board.load_construct(initial, self.blinker, 36, 36)
+        tiled = tiled_board.TiledBoard(initial)
+        tiled.step()
+        tiled.step()
+        self.assertEqual((4, 16*16 + 2*16*8 + 8*8),
+                         (tiled.stats['active_tiles'],
+                          tiled.stats['cells_evaluated']))
+
+
+    def test_set_cells_between_steps(self):
+        """ Cells set between steps wake up the tiles around them
+        """
+
+        initial = board.create_board(32, 32)
+        tiled = tiled_board.TiledBoard(initial, 8)
+        tiled.step()
+        tiled.step()
+        self.assertEqual(0, tiled.stats['active_tiles'])
+
+        for row, col in [(15, 23), (15, 24), (15, 25)]:
+            tiled.set_alive(row, col)
+            board.set_alive(initial, row, col)
+        tiled.set_dead(15, 25)
+        board.set_dead(initial, 15, 25)
+        tiled.set_alive(16, 24)
+        board.set_alive(initial, 16, 24)
+
+        for generation in xrange(5):
+            initial = board.next_board(initial)
+            tiled.step()
+            self.assertEqual(initial, tiled.to_board())
+        self.assertEqual(list(board.get_coords(initial)),
+                list(tiled.get_coords()))
+        self.assertRaises(IndexError, tiled.set_alive, 32, 0)
+
+
+    def test_next_board(self):
+        """ Single step function gives the same state as board.next_board
+        """
+
+        initial = [[int(self.random.random() < 0.3)
+                    for j in xrange(20)] for i in xrange(20)]
+        self.assertEqual(board.next_board(initial),
+                tiled_board.next_board(initial, 6))
+
+
+    def test_boundary_modes(self):
+        """ Same next states as board.next_board with each boundary mode,
+        including changes crossing the edges between tiles on opposite
+        sides of a torus.
+        """
+
+        for boundary in board.BOUNDARIES:
+            for rows, cols in ((1, 5), (7, 1), (20, 23)):
+                expected = [[int(self.random.random() < 0.3)
+                             for j in xrange(cols)] for i in xrange(rows)]
+                tiled = tiled_board.TiledBoard(expected, 6, boundary)
+                for generation in xrange(12):
+                    expected = board.next_board(expected, boundary)
+                    tiled.step()
+                    self.assertEqual(expected, tiled.to_board())
+
+
+    def test_rules(self):
+        """ Same next states as board.next_board with other rules,
+        including births on 0 neighbors.
+        """
+
+        for notation in ('B36/S23', 'B2/S', 'B3/S012345678', 'B1357/S1357') + ('B0/S8',):
+            rule = board.parse_rule(notation)
+            expected = [[int(self.random.random() < 0.3)
+                         for j in xrange(23)] for i in xrange(20)]
+            tiled = tiled_board.TiledBoard(expected, 6, rule=rule)
+            for generation in xrange(6):
+                expected = board.next_board(expected, rule=rule)
+                tiled.step()
+                self.assertEqual(expected, tiled.to_board())
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Tiled version of the board, which only recomputes the parts of the
+board that can change.
+
+The board is split into square tiles of tile_size x tile_size cells. A
+tile can only change in the next generation if it, or one of its 8
+surrounding tiles, changed in the last one; all other tiles are skipped.
+Two buffers are kept and swapped every generation, so a step does not
+allocate a new board. Buffers have a border of ghost cells, refreshed
+before each step following the boundary mode (see board.py); with
+board.TORUS, tiles on opposite edges count as neighbors.
+"""
+
+import itertools
+
+import board
+
+
+class TiledBoard(object):
+    """ Board state split into tiles, keeping track of the tiles that
+    changed in the last generation and of statistics on the last step.
+    """
+    def __init__(self, initial_board, tile_size=16, boundary=board.DEAD,
+                 rule=board.CONWAY):
+        self._rows, self._cols = len(initial_board), len(initial_board[0])
+        self._boundary = boundary
+        self._table = rule.table
+        self._tile_size = tile_size
+        self._tile_rows = (self._rows + tile_size - 1) // tile_size
+        self._tile_cols = (self._cols + tile_size - 1) // tile_size
+
+        # Buffers have a border of ghost cells, so that the neighbors of
+        # the cells on the edges can be added up without checking bounds.
+        self._front = board.pad_board(initial_board, boundary)
+        self._back = [row[:] for row in self._front]
+
+        # The back buffer holds the previous generation; as there is none
+        # yet, every tile has to be computed on the first step.
+        self._dirty = set(itertools.product(xrange(self._tile_rows),
+                                            xrange(self._tile_cols)))
+        self.generation = 0
+        self.stats = {
+                'total_tiles': self._tile_rows * self._tile_cols,
+                'active_tiles': 0,
+                'changed_tiles': 0,
+                'cells_evaluated': 0,
+                }
+
+    # Private methods
+
+    def _active_tiles(self):
+        """ Return the set of tiles in the 3x3 neighborhood of any tile
+        which changed in the last generation.
+        """
+        active = set()
+        if self._boundary == board.TORUS:
+            for tile_row, tile_col in self._dirty:
+                for i in xrange(tile_row-1, tile_row+2):
+                    for j in xrange(tile_col-1, tile_col+2):
+                        active.add((i % self._tile_rows, j % self._tile_cols))
+            return active
+
+        for tile_row, tile_col in self._dirty:
+            for i in xrange(max(0, tile_row-1),
+                            min(tile_row+2, self._tile_rows)):
+                for j in xrange(max(0, tile_col-1),
+                                min(tile_col+2, self._tile_cols)):
+                    active.add((i, j))
+        return active
+
+    def _step_tile(self, tile_row, tile_col):
+        """ Write the next generation of a tile into the back buffer, and
+        return whether any cell of the tile changed.
+        """
+        front, back, table = self._front, self._back, self._table
+        top, left = tile_row * self._tile_size, tile_col * self._tile_size
+        cols = xrange(left+1, min(left+self._tile_size, self._cols)+1)
+
+        changed = False
+        for row in xrange(top+1, min(top+self._tile_size, self._rows)+1):
+            above, current, below = front[row-1], front[row], front[row+1]
+            new_row = back[row]
+            for col in cols:
+                new_row[col] = table[current[col] * 9 +
+                                     above[col-1] + above[col] +
+                                     above[col+1] + current[col-1] +
+                                     current[col+1] + below[col-1] +
+                                     below[col] + below[col+1]]
+                if new_row[col] != current[col]:
+                    changed = True
+        return changed
+
+    def _tile_cells(self, tile_row, tile_col):
+        """ Number of cells in a tile, fewer than tile_size**2 for the
+        tiles on the bottom and right edges if the board is not a whole
+        number of tiles.
+        """
+        top, left = tile_row * self._tile_size, tile_col * self._tile_size
+        return ((min(top+self._tile_size, self._rows) - top) *
+                (min(left+self._tile_size, self._cols) - left))
+
+    def _mark_dirty(self, row, col):
+        self._dirty.add((row // self._tile_size, col // self._tile_size))
+
+    # Public methods
+
+    def step(self):
+        """ Advance the board by one generation, only computing the tiles
+        that can have changed.
+        """
+        if self._boundary != board.DEAD:
+            board.fill_border(self._front, self._boundary)
+        active = self._active_tiles()
+        dirty = set()
+        for tile in active:
+            if self._step_tile(*tile):
+                dirty.add(tile)
+
+        self._front, self._back = self._back, self._front
+        self._dirty = dirty
+        self.generation += 1
+
+        self.stats['active_tiles'] = len(active)
+        self.stats['changed_tiles'] = len(dirty)
+        self.stats['cells_evaluated'] = sum(self._tile_cells(*tile)
+                                            for tile in active)
+
+    def to_board(self):
+        """ Return the current state as a list of lists board.
+        """
+        return [row[1:-1] for row in self._front[1:-1]]
+
+    def get_coords(self):
+        """ Yield the coord of each live cell
+        """
+        for i, row in enumerate(self._front[1:-1]):
+            for j, cell in enumerate(row[1:-1]):
+                if cell:
+                    yield (i, j)
+
+    def get_value(self, row, col):
+        """ Get value of cell
+        """
+        self._check_inputs(row, col)
+        return self._front[row+1][col+1]
+
+    def set_alive(self, row, col):
+        """ Set value of cell to alive
+        """
+        self._check_inputs(row, col)
+        self._front[row+1][col+1] = 1
+        self._mark_dirty(row, col)
+
+    def set_dead(self, row, col):
+        """ Set value of cell to dead
+        """
+        self._check_inputs(row, col)
+        self._front[row+1][col+1] = 0
+        self._mark_dirty(row, col)
+
+    def _check_inputs(self, row, col):
+        if self._rows <= row or \
+                self._cols <= col or \
+                row < 0 or \
+                col < 0:
+                    raise IndexError
+
+
+def next_board(current_board, tile_size=16, boundary=board.DEAD,
+               rule=board.CONWAY):
+    """ Drop-in replacement for board.next_board. A single step has to
+    compute every tile, so this is only useful for testing; keep a
+    TiledBoard across generations to skip unchanged tiles.
+    """
+    tiled = TiledBoard(current_board, tile_size, boundary, rule)
+    tiled.step()
+    return tiled.to_board()